@@ -0,0 +1,129 @@
+"""
+bench_markers.py
+
+Micro-benchmark of the single-pass marker scanner against the regex cascade it
+replaced in ``doc_parser.extract_question_answer`` and the per-paragraph
+``.lower()`` checks of ``extract_qa_from_cell``.
+
+Cell texts are harvested from the DOCX files given on the command line (or every
+DOCX in ``input/``); without any, a built-in sample of typical cells is used.
+
+    python -m benchmarks.bench_markers [--repeat 5] [file.docx ...]
+"""
+
+import argparse
+import re
+import timeit
+from pathlib import Path
+
+from src.doc_parser import _qa_from_lines, clean, extract_question_answer
+from src.docx_stream import iter_table_cells
+from src.style_index import DEFAULT_STYLE
+
+SAMPLE_CELLS = [
+    ["CHALLENGES CONCEPT CHECK"],
+    ["CONCEPT CHECK", "ASK participants: What are the three stages of the process?",
+     "ANSWER: Plan, execute and review."],
+    ["DISPLAY the question below on the PowerPoint Presentation.",
+     "MULTIPLE CHOICE QUESTIONS", "ASK participants: Which form is used for a hand-over? "
+     "answer: The shift hand-over checklist."],
+    ["Facilitator note: allow five minutes for the group discussion before moving on "
+     "to the next slide and remind participants of the safety briefing."],
+    ["ASK participants: Why do we record near misses?"],
+    ["Answer: So that trends can be identified before an incident occurs."],
+]
+
+
+def legacy_extract_question_answer(cell_text):
+    """The regex cascade previously used by extract_question_answer."""
+    question_type = None
+    question = None
+    answer = None
+    if "CHALLENGES CONCEPT CHECK" in cell_text.upper():
+        question_type = "Challenges Concept Check Question"
+    match = re.search(r"(ASK participants:.*?)(ANSWER:.*)", cell_text, re.IGNORECASE | re.DOTALL)
+    if match:
+        question = match.group(1).replace("ASK participants:", "").strip()
+        answer = match.group(2).replace("ANSWER:", "").strip()
+    else:
+        answer_match = re.search(r"ANSWER:(.*)", cell_text, re.IGNORECASE | re.DOTALL)
+        if answer_match:
+            answer = answer_match.group(1).strip()
+        question_match = re.search(r"ASK participants:(.*)", cell_text, re.IGNORECASE | re.DOTALL)
+        if question_match:
+            question = question_match.group(1).strip()
+    return question, answer, question_type
+
+
+def legacy_qa_from_lines(lines):
+    """The per-paragraph .lower() checks previously used by extract_qa_from_cell."""
+    qas = []
+    last_concept_check = None
+    for idx, (style, text) in enumerate(lines):
+        if "concept check" in text.lower() and style.key in ["normal", "body text"]:
+            last_concept_check = "CONCEPT CHECK"
+        if "ask participants:" in text.lower():
+            question = text
+            answer = ""
+            if "answer:" in text.lower():
+                parts = text.split("answer:", 1)
+                question = parts[0].strip()
+                answer = parts[1].strip() if len(parts) > 1 else ""
+            elif idx + 1 < len(lines):
+                next_text = lines[idx + 1][1]
+                if next_text.lower().startswith("answer:"):
+                    answer = next_text[7:].strip()
+            qas.append((last_concept_check, question, answer))
+    return qas
+
+
+def harvest_cells(paths):
+    """Return the cleaned paragraph texts of every table cell in the given files."""
+    cells = []
+    for path in paths:
+        for cell in iter_table_cells(path):
+            cells.append([clean(para.text) for para in cell.paragraphs])
+    return cells
+
+
+def main():
+    """Run the benchmark and print per-cell timings for both implementations."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("files", nargs="*", help="DOCX files to harvest cell texts from.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions.")
+    args = parser.parse_args()
+
+    paths = args.files or sorted((Path(__file__).resolve().parent.parent / "input").glob("*.docx"))
+    cells = harvest_cells(paths) if paths else SAMPLE_CELLS * 500
+    cell_texts = ["\n".join(cell) for cell in cells]
+    cell_lines = [[(DEFAULT_STYLE, text) for text in cell] for cell in cells]
+    print(f"Corpus: {len(cells)} cells, {sum(map(len, cell_texts))} characters")
+
+    mismatches = sum(
+        extract_question_answer(text) != legacy_extract_question_answer(text)
+        for text in cell_texts
+    ) + sum(_qa_from_lines(lines) != legacy_qa_from_lines(lines) for lines in cell_lines)
+    print(f"Result mismatches: {mismatches}")
+
+    cases = [
+        ("extract_question_answer", legacy_extract_question_answer, extract_question_answer,
+         cell_texts),
+        ("cell Q&A extraction", legacy_qa_from_lines, _qa_from_lines, cell_lines),
+    ]
+    for label, legacy, current, corpus in cases:
+        legacy_time = min(timeit.repeat(
+            lambda fn=legacy, data=corpus: [fn(item) for item in data],
+            number=1, repeat=args.repeat))
+        current_time = min(timeit.repeat(
+            lambda fn=current, data=corpus: [fn(item) for item in data],
+            number=1, repeat=args.repeat))
+        per_cell = 1e6 / len(corpus)
+        print(
+            f"{label:<26} legacy {legacy_time * per_cell:7.2f} us/cell | "
+            f"scanner {current_time * per_cell:7.2f} us/cell | "
+            f"speed-up x{legacy_time / current_time:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+bench_preprocess.py
+
+Benchmark of ``cleaner.preprocess_data``: the previous implementation (one
+process-pool task per row dict), the vectorized in-process path and the chunked
+parallel path, over growing synthetic frames. The row count at which the chunked
+path starts to beat the vectorized one is the crossover to use for
+``cleaner.PARALLEL_THRESHOLD`` on that machine.
+
+    python -m benchmarks.bench_preprocess [--sizes 1000 10000 100000] [--workers N]
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.cleaner import preprocess_data
+
+# The legacy per-row path is only timed up to this many rows
+LEGACY_MAX_ROWS = 20_000
+
+QUESTIONS = [
+    "ASK participants: What are the three stages of the process?",
+    "DISPLAY the question below on the PowerPoint Presentation. Which form is used?",
+    "MULTIPLE CHOICE QUESTIONS  ask participants:  Why do we record near misses? ",
+    "  Describe the hand-over procedure.  ",
+]
+ANSWERS = ["  Plan, execute and review. ", "The shift checklist.", " So trends are seen.", None]
+
+
+def legacy_clean_question_text(text):
+    """The sequential substitutions previously used by clean_question_text."""
+    patterns = [
+        r"ASK participants:\s*",
+        r"DISPLAY the question below on the PowerPoint Presentation\.\s*",
+        r"MULTIPLE CHOICE QUESTIONS\s*"
+    ]
+    for pattern in patterns:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def legacy_clean_row(row):
+    """The per-row cleaning previously run in worker processes."""
+    row["Questions"] = legacy_clean_question_text(str(row["Questions"]).strip())
+    row["Answer"] = str(row["Answer"]).strip()
+    return row
+
+
+def legacy_preprocess_data(df):
+    """The previous preprocess_data: one pool task per row dict."""
+    records = df.to_dict(orient="records")
+    with ProcessPoolExecutor() as executor:
+        cleaned_records = list(executor.map(legacy_clean_row, records))
+    return pd.DataFrame(cleaned_records)
+
+
+def build_frame(rows):
+    """Return a parser-shaped frame with ``rows`` rows."""
+    return pd.DataFrame({
+        "QuestionType": ["CONCEPT CHECK"] * rows,
+        "Questions": [QUESTIONS[idx % len(QUESTIONS)] + f" #{idx}" for idx in range(rows)],
+        "Answer": [ANSWERS[idx % len(ANSWERS)] for idx in range(rows)],
+        "Marks": ["/1"] * rows,
+    })
+
+
+def timed(func, *args, **kwargs):
+    """Return (seconds, result) of one call."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Run the benchmark and print a timing table and the observed crossover."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+",
+        default=[1_000, 10_000, 100_000, 300_000, 1_000_000],
+        help="Frame sizes (rows) to time."
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes.")
+    args = parser.parse_args()
+
+    print(f"Workers: {args.workers}")
+    print(f"{'rows':>10} {'legacy':>10} {'vectorized':>11} {'chunked':>10}")
+    crossover = None
+    for rows in args.sizes:
+        df = build_frame(rows)
+        vector_time, expected = timed(preprocess_data, df, parallel_threshold=rows)
+        chunk_time, chunked = timed(
+            preprocess_data, df, parallel_threshold=0, workers=args.workers
+        )
+        assert chunked.equals(expected), "chunked result differs from vectorized"
+        legacy_cell = "-"
+        if rows <= LEGACY_MAX_ROWS:
+            legacy_time, legacy = timed(legacy_preprocess_data, df)
+            assert legacy.astype(str).equals(expected.astype(str)), "legacy result differs"
+            legacy_cell = f"{legacy_time:.3f}s"
+        print(f"{rows:>10} {legacy_cell:>10} {vector_time:>10.3f}s {chunk_time:>9.3f}s")
+        if crossover is None and chunk_time < vector_time:
+            crossover = rows
+
+    if crossover is None:
+        print("Chunked parallelism did not beat the vectorized path at any size tested.")
+    else:
+        print(f"Chunked parallelism wins from about {crossover} rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+bench_suite.py
+
+End-to-end benchmark suite over synthetic assessment documents (see
+``benchmarks.corpus``). For each document size in the sweep it times
+``parse_document`` (both engines), ``clean_data``, ``preprocess_data``,
+``summarize_assessment_breakdown``, ``export_to_word`` and ``export_to_excel``,
+and reports throughput (questions per second) and peak traced memory.
+
+Timings are the best of ``--repeat`` runs; peak memory comes from one extra run
+under ``tracemalloc`` (Python allocations, including pandas/numpy buffers), so
+tracing does not slow the timed runs. Results can be saved as a baseline and
+later runs compared with it: a stage is flagged when it is both ``--tolerance``
+slower (or larger) and above a small absolute noise floor. The exit status is 1
+when anything regressed, so the suite can gate CI.
+
+    python -m benchmarks.bench_suite [--sizes 1000 5000 20000] [--media-kb 0]
+        [--baseline benchmarks/baseline.json] [--save-baseline PATH] [--json PATH]
+
+The stored ``benchmarks/baseline.json`` was recorded on a single-core Linux VM;
+re-record it (``--save-baseline``) on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.assessment_summary import summarize_assessment_breakdown
+from src.cleaner import clean_data, preprocess_data
+from src.doc_parser import parse_document
+from src.exporter import export_to_excel, export_to_word
+
+from .corpus import CorpusSpec, build_document
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SIZES = (1_000, 5_000, 20_000)
+DEFAULT_TOLERANCE = 0.5
+# Differences below these are treated as noise
+MIN_SECONDS = 0.05
+MIN_PEAK_MIB = 1.0
+
+
+def stages(workdir: Path):
+    """
+    Return (name, function) pairs; each function takes the shared state dict
+    (``path``, ``raw`` and ``cleaned`` frames) and returns its result.
+    """
+    return [
+        ("parse_document[docx]", lambda state: parse_document(state["path"], engine="docx")),
+        ("parse_document[stream]", lambda state: parse_document(state["path"], engine="stream")),
+        ("clean_data", lambda state: clean_data(state["raw"])),
+        ("preprocess_data", lambda state: preprocess_data(state["raw"])),
+        ("summarize_assessment_breakdown",
+         lambda state: summarize_assessment_breakdown(state["raw"])),
+        ("export_to_word", lambda state: export_to_word(state["cleaned"], workdir / "out.docx")),
+        ("export_to_excel",
+         lambda state: export_to_excel(state["cleaned"], workdir / "out.xlsx")),
+    ]
+
+
+def measure(func, state, repeat: int):
+    """Return (best seconds, peak MiB, result) of a stage."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(state)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1024 * 1024), result
+
+
+def run_suite(sizes, spec: CorpusSpec, repeat: int):
+    """
+    Generate one document per size and benchmark every stage on it.
+
+    Returns:
+        list: One dict per (size, stage) with questions, seconds, throughput and peak_mib.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for size in sizes:
+            sized = spec.scaled_to(size)
+            state = {"path": workdir / f"corpus_{size}.docx"}
+            questions = build_document(sized, state["path"])
+            for name, func in stages(workdir):
+                seconds, peak_mib, result = measure(func, state, repeat)
+                if name == "parse_document[docx]":
+                    state["raw"] = result
+                elif name == "clean_data":
+                    state["cleaned"] = result
+                results.append({
+                    "size": size,
+                    "questions": questions,
+                    "stage": name,
+                    "seconds": round(seconds, 4),
+                    "questions_per_s": round(questions / seconds) if seconds else None,
+                    "peak_mib": round(peak_mib, 2),
+                })
+                print(
+                    f"{size:>8} {name:<32} {seconds:>9.3f}s "
+                    f"{questions / seconds if seconds else 0:>12,.0f}/s {peak_mib:>9.1f} MiB"
+                )
+    return results
+
+
+def compare(results, baseline, tolerance: float):
+    """
+    Return descriptions of the stages slower or larger than the baseline allows.
+    """
+    previous = {(entry["size"], entry["stage"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        base = previous.get((entry["size"], entry["stage"]))
+        if base is None:
+            continue
+        checks = (("seconds", MIN_SECONDS, "s"), ("peak_mib", MIN_PEAK_MIB, " MiB"))
+        for key, floor, unit in checks:
+            now, then = entry[key], base[key]
+            if now > then * (1 + tolerance) and now - then > floor:
+                regressions.append(
+                    f"{entry['stage']} @ {entry['size']}: {key} {then}{unit} -> {now}{unit} "
+                    f"(+{(now / then - 1) * 100 if then else float('inf'):.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    """Run the sweep, print the table and compare with or save a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Approximate questions per synthetic document.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage (best kept).")
+    parser.add_argument("--media-kb", type=int, default=0,
+                        help="Size of the image embedded under each chapter.")
+    parser.add_argument("--vertical-merges", type=int, default=CorpusSpec.vertical_merges,
+                        help="Vertically merged Q&A cells per table.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE,
+                        help="Baseline JSON to compare with (skipped if missing).")
+    parser.add_argument("--save-baseline", type=Path, default=None, metavar="PATH",
+                        help="Write this run's results as a baseline.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write results here.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown or memory growth before flagging.")
+    args = parser.parse_args(argv)
+
+    # The summary and parser log every row count; keep the table readable
+    logging.disable(logging.INFO)
+    spec = CorpusSpec(media_kb=args.media_kb, vertical_merges=args.vertical_merges)
+    print(f"{'size':>8} {'stage':<32} {'time':>10} {'throughput':>14} {'peak':>13}")
+    results = run_suite(args.sizes, spec, args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "spec": dict(vars(spec)),
+        "results": results,
+    }
+    for path in (args.json, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+            print(f"Wrote {path}")
+
+    if args.save_baseline is None and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  REGRESSION {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+bench_word_export.py
+
+Benchmark of ``exporter.export_to_word`` (bulk table XML) against the previous
+implementation (``iterrows`` plus ``add_row`` and ``cell.text`` per cell). Both
+documents are also compared part by part to confirm they are identical.
+
+    python -m benchmarks.bench_word_export [--rows 2000 20000] [--legacy-max 20000]
+"""
+
+import argparse
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+from docx import Document
+
+from src.exporter import export_to_word
+from src.records import COLUMNS
+
+
+def legacy_export_to_word(df, output_path):
+    """The previous export_to_word."""
+    doc = Document()
+    table = doc.add_table(rows=1, cols=len(df.columns))
+    hdr_cells = table.rows[0].cells
+    for i, col in enumerate(df.columns):
+        hdr_cells[i].text = str(col)
+    for _, row in df.iterrows():
+        row_cells = table.add_row().cells
+        for i, item in enumerate(row):
+            row_cells[i].text = str(item)
+    doc.save(str(output_path))
+
+
+def build_frame(rows):
+    """Return a parser-shaped frame (ten columns) with ``rows`` rows."""
+    return pd.DataFrame({
+        "QuestionType": ["CONCEPT CHECK" if idx % 3 else "Unknown" for idx in range(rows)],
+        "Questions": [f"ASK participants: What is step {idx} of the procedure?"
+                      for idx in range(rows)],
+        "Answer": [f"Step {idx} is to check the equipment." for idx in range(rows)],
+        "Marks": ["/1"] * rows,
+        "Chapter": [f"Chapter {idx // 1000}" for idx in range(rows)],
+        "ChapterStyle": ["heading 1"] * rows,
+        "Process": [f"Process {idx // 100}" for idx in range(rows)],
+        "ProcessStyle": ["heading 2"] * rows,
+        "Subsection": [f"Subsection {idx // 20}" for idx in range(rows)],
+        "SubsectionStyle": ["heading 3"] * rows,
+    }, columns=list(COLUMNS))
+
+
+def docx_parts(path):
+    """Return the parts of a DOCX package by name."""
+    with zipfile.ZipFile(path) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def timed(func, *args):
+    """Return the seconds taken by one call."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print rows/second for both exporters."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[2_000, 20_000],
+                        help="Frame sizes (rows) to export.")
+    parser.add_argument("--legacy-max", type=int, default=20_000,
+                        help="Largest frame to export with the previous implementation.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'legacy rows/s':>14} {'bulk rows/s':>12} {'speed-up':>9}  identical")
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path, bulk_path = Path(tmp) / "legacy.docx", Path(tmp) / "bulk.docx"
+        for rows in args.rows:
+            df = build_frame(rows)
+            bulk_time = timed(export_to_word, df, bulk_path)
+            if rows > args.legacy_max:
+                print(f"{rows:>8} {'-':>14} {rows / bulk_time:>12,.0f} {'-':>9}  -")
+                continue
+            legacy_time = timed(legacy_export_to_word, df, legacy_path)
+            identical = docx_parts(legacy_path) == docx_parts(bulk_path)
+            print(
+                f"{rows:>8} {rows / legacy_time:>14,.0f} {rows / bulk_time:>12,.0f} "
+                f"{legacy_time / bulk_time:>8.1f}x  {identical}"
+            )
+
+
+if __name__ == "__main__":
+    main()
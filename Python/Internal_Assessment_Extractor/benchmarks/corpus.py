@@ -0,0 +1,181 @@
+"""
+corpus.py
+
+Synthetic assessment documents for benchmarks and tests.
+
+A CorpusSpec controls the heading depth (chapters, processes per chapter and
+subsections per process), the tables per subsection, their Q&A rows and columns,
+merged cells (a full-width "CHALLENGES CONCEPT CHECK" banner and vertically
+merged Q&A cells) and the size of an image embedded under each chapter. Tables
+are written as row XML in bulk, so large documents are generated quickly.
+
+    python -m benchmarks.corpus out.docx [--questions 10000] [--media-kb 256]
+"""
+
+import argparse
+import io
+import random
+import struct
+import zlib
+from dataclasses import dataclass, replace
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Inches
+
+WORDS = (
+    "safety inspection hazard control supervisor permit lifting sling crane load "
+    "procedure checklist isolation valve pressure record review shift handover "
+    "equipment maintenance incident report training assessment quality standard "
+    "operator signal barrier zone emergency evacuation first aid ventilation"
+).split()
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of one synthetic assessment document."""
+    chapters: int = 4
+    processes: int = 3
+    subsections: int = 2
+    tables: int = 2
+    qa_rows: int = 6
+    cols: int = 3
+    banner: bool = True
+    vertical_merges: int = 1
+    media_kb: int = 0
+    seed: int = 0
+
+    @property
+    def questions(self) -> int:
+        """Number of distinct questions the parser should extract."""
+        per_table = self.qa_rows * self.cols - min(self.vertical_merges, self.qa_rows // 2)
+        return self.chapters * self.processes * self.subsections * self.tables * per_table
+
+    def scaled_to(self, questions: int) -> "CorpusSpec":
+        """Return a spec with the same shape and about ``questions`` questions,
+        scaling the number of tables per subsection."""
+        sections = self.chapters * self.processes * self.subsections
+        per_table = self.questions // (sections * self.tables)
+        return replace(self, tables=max(1, round(questions / (per_table * sections))))
+
+
+def noise_png(size_kb: int, seed: int = 0) -> bytes:
+    """Return a grayscale PNG of random pixels, about ``size_kb`` KiB (incompressible)."""
+    width = 256
+    height = max(1, size_kb * 1024 // width)
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(width) for _ in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+
+def _paragraphs_xml(lines) -> str:
+    return "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in lines
+    )
+
+
+def _question_cell(rng, label) -> str:
+    """Return the paragraphs of one Q&A cell; the label keeps questions unique."""
+    words = " ".join(rng.choices(WORDS, k=rng.randint(6, 14)))
+    answer = " ".join(rng.choices(WORDS, k=rng.randint(3, 10)))
+    if rng.random() < 0.5:
+        return _paragraphs_xml(
+            ["CONCEPT CHECK", f"ASK participants: {label} {words}?", f"ANSWER: {answer}."]
+        )
+    return _paragraphs_xml([f"ASK participants: {label} {words}? ANSWER: {answer}."])
+
+
+def _table_rows_xml(spec: CorpusSpec, rng, prefix: str) -> str:
+    """Return the ``<w:tr>`` elements of one table."""
+    rows = []
+    if spec.banner:
+        rows.append(
+            f'<w:tr><w:tc><w:tcPr><w:gridSpan w:val="{spec.cols}"/></w:tcPr>'
+            f"{_paragraphs_xml(['CHALLENGES CONCEPT CHECK'])}</w:tc></w:tr>"
+        )
+    merges = min(spec.vertical_merges, spec.qa_rows // 2)
+    for row in range(spec.qa_rows):
+        cells = []
+        for col in range(spec.cols):
+            props = ""
+            if col == 0 and row < 2 * merges:
+                if row % 2:
+                    # Continuation of the cell above: no content of its own
+                    cells.append('<w:tc><w:tcPr><w:vMerge/></w:tcPr><w:p/></w:tc>')
+                    continue
+                props = '<w:tcPr><w:vMerge w:val="restart"/></w:tcPr>'
+            label = f"Q{prefix}.{row}.{col}"
+            cells.append(f"<w:tc>{props}{_question_cell(rng, label)}</w:tc>")
+        rows.append(f"<w:tr>{''.join(cells)}</w:tr>")
+    return "".join(rows)
+
+
+def build_document(spec: CorpusSpec, path) -> int:
+    """
+    Write a synthetic assessment document.
+
+    Args:
+        spec (CorpusSpec): The document's shape.
+        path (str or Path): Where to save the DOCX file.
+
+    Returns:
+        int: The number of distinct questions written (``spec.questions``).
+    """
+    rng = random.Random(spec.seed)
+    doc = Document()
+    image = noise_png(spec.media_kb, spec.seed) if spec.media_kb else None
+    for chapter in range(1, spec.chapters + 1):
+        doc.add_heading(f"Chapter {chapter}", level=1)
+        if image is not None:
+            doc.add_picture(io.BytesIO(image), width=Inches(2))
+        for process in range(1, spec.processes + 1):
+            doc.add_heading(f"Process {chapter}.{process}", level=2)
+            for subsection in range(1, spec.subsections + 1):
+                doc.add_heading(f"Subsection {chapter}.{process}.{subsection}", level=3)
+                doc.add_paragraph("Facilitator notes for this subsection.")
+                for table_idx in range(spec.tables):
+                    table = doc.add_table(rows=0, cols=spec.cols)
+                    prefix = f"{chapter}.{process}.{subsection}.{table_idx}"
+                    rows_xml = _table_rows_xml(spec, rng, prefix)
+                    fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{rows_xml}</w:tbl>")
+                    table._tbl.extend(list(fragment))  # pylint: disable=protected-access
+    doc.save(str(path))
+    return spec.questions
+
+
+def main():
+    """Write one synthetic document from command-line options."""
+    parser = argparse.ArgumentParser(description="Write a synthetic assessment DOCX.")
+    parser.add_argument("output", type=Path, help="DOCX file to write.")
+    parser.add_argument("--questions", type=int, default=None,
+                        help="Scale the number of tables to about this many questions.")
+    defaults = CorpusSpec()
+    for name in ("chapters", "processes", "subsections", "tables", "qa_rows", "cols",
+                 "vertical_merges", "media_kb", "seed"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int,
+                            default=getattr(defaults, name))
+    parser.add_argument("--no-banner", action="store_true", help="Omit the merged banner row.")
+    args = parser.parse_args()
+    spec = CorpusSpec(
+        args.chapters, args.processes, args.subsections, args.tables, args.qa_rows,
+        args.cols, not args.no_banner, args.vertical_merges, args.media_kb, args.seed,
+    )
+    if args.questions:
+        spec = spec.scaled_to(args.questions)
+    build_document(spec, args.output)
+    print(f"Wrote {args.output}: {spec.questions} questions ({spec})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,113 +1,237 @@
 """
 assessment_summary.py
 
-Provides functions for logging a detailed breakdown of parsed assessment data.
+Provides functions for building and logging a detailed breakdown of parsed assessment data.
+
+The breakdown is computed from a single grouped aggregation over (Chapter, Process,
+Subsection, QuestionType) into an AssessmentSummary, which can be logged,
+serialized with ``to_dict`` or compared with another summary.
 """
 
 import logging
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-def log_chapter_summary(df: pd.DataFrame, chapters, question_types):
+GROUP_COLUMNS = ['Chapter', 'Process', 'Subsection', 'QuestionType']
+
+
+@dataclass
+class SubsectionSummary:
+    """Question and answer counts of one subsection."""
+    name: str
+    questions: int = 0
+    answers: int = 0
+
+
+@dataclass
+class ProcessSummary:
+    """Counts of one process and its subsections."""
+    name: str
+    questions: int = 0
+    answers: int = 0
+    subsections: List[SubsectionSummary] = field(default_factory=list)
+
+
+@dataclass
+class ChapterSummary:
+    """Processes of one chapter and its count per question type."""
+    name: str
+    processes: List[ProcessSummary] = field(default_factory=list)
+    question_types: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class AssessmentSummary:
+    """Breakdown of a parsed assessment frame; chapters, processes, subsections
+    and question types are in order of first appearance."""
+    total_chapters: int = 0
+    total_processes: int = 0
+    total_subsections: int = 0
+    question_types: List[str] = field(default_factory=list)
+    total_questions: int = 0
+    total_answers: int = 0
+    unique_questions: int = 0
+    unique_answers: int = 0
+    chapters: List[ChapterSummary] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Return the summary as plain dicts and lists (JSON-serializable)."""
+        return asdict(self)
+
+    def log(self, log: logging.Logger = logger) -> None:
+        """Log the breakdown."""
+        log.info("Summary breakdown:")
+        log.info("Total chapters: %d", self.total_chapters)
+        log.info("Total processes: %d", self.total_processes)
+        log.info("Total subsections: %d", self.total_subsections)
+        log.info("Total question types: %d", len(self.question_types))
+        log.info("Total questions: %d", self.total_questions)
+        log.info("Total answers: %d", self.total_answers)
+
+        for chapter in self.chapters:
+            log_chapter_summary(chapter, log)
+
+        log.info("Total unique questions: %d", self.unique_questions)
+        log.info("Total unique answers: %d", self.unique_answers)
+        log.info("Summary complete.")
+
+
+def log_chapter_summary(chapter: ChapterSummary, log: logging.Logger = logger):
     """
-    Log summary information for each chapter, including the number of processes,
+    Log summary information for a chapter, including the number of processes,
     and delegate to process summary logging.
     """
-    for chapter in chapters:
-        chapter_df = df[df['Chapter'] == chapter]
-        chapter_processes = chapter_df['Process'].dropna().unique()
-        logger.info(
-            "Chapter: '%s' | Processes: %d",
-            chapter,
-            len(chapter_processes)
-        )
-        log_process_summary(chapter_df, chapter_processes, question_types)
+    log.info(
+        "Chapter: '%s' | Processes: %d",
+        chapter.name,
+        len(chapter.processes)
+    )
+    for process in chapter.processes:
+        log_process_summary(process, log)
+    log_question_type_summary(chapter, log)
+
 
-def log_process_summary(chapter_df: pd.DataFrame, chapter_processes, question_types):
+def log_process_summary(process: ProcessSummary, log: logging.Logger = logger):
     """
-    Log summary information for each process within a chapter, including the number of subsections,
-    and delegate to subsection and question type summary logging.
+    Log summary information for a process, including the number of subsections,
+    and delegate to subsection summary logging.
     """
-    for process in chapter_processes:
-        process_df = chapter_df[chapter_df['Process'] == process]
-        process_subsections = process_df['Subsection'].dropna().unique()
-        logger.info(
-            "  Process: '%s' | Subsections: %d",
-            process,
-            len(process_subsections)
-        )
-        log_subsection_summary(process_df, process_subsections)
-        process_counts = (
-            process_df[process_df['Questions'] != ''].shape[0],
-            process_df[process_df['Answer'] != ''].shape[0]
-        )
-        logger.info(
-            "  Process Total: Questions: %d | Answers: %d",
-            process_counts[0],
-            process_counts[1]
-        )
-    log_question_type_summary(chapter_df, question_types)
+    log.info(
+        "  Process: '%s' | Subsections: %d",
+        process.name,
+        len(process.subsections)
+    )
+    for subsection in process.subsections:
+        log_subsection_summary(subsection, log)
+    log.info(
+        "  Process Total: Questions: %d | Answers: %d",
+        process.questions,
+        process.answers
+    )
+
 
-def log_subsection_summary(process_df: pd.DataFrame, process_subsections):
+def log_subsection_summary(subsection: SubsectionSummary, log: logging.Logger = logger):
     """
-    Log summary information for each subsection within a process, 
-    including the number of questions and answers.
+    Log summary information for a subsection, including the number of questions and answers.
     """
-    for subsection in process_subsections:
-        subsection_df = process_df[process_df['Subsection'] == subsection]
-        q_count = subsection_df[subsection_df['Questions'] != ''].shape[0]
-        a_count = subsection_df[subsection_df['Answer'] != ''].shape[0]
-        logger.info(
-            "    Subsection: '%s' | Questions: %d | Answers: %d",
-            subsection,
-            q_count,
-            a_count
-        )
+    log.info(
+        "    Subsection: '%s' | Questions: %d | Answers: %d",
+        subsection.name,
+        subsection.questions,
+        subsection.answers
+    )
+
 
-def log_question_type_summary(chapter_df: pd.DataFrame, question_types):
+def log_question_type_summary(chapter: ChapterSummary, log: logging.Logger = logger):
     """
-    Log summary information for each question type within a chapter, 
-    including the count of each type.
+    Log the count of each question type within a chapter.
     """
-    for qtype in question_types:
-        qtype_count = chapter_df[chapter_df['QuestionType'] == qtype].shape[0]
-        logger.info(
+    for qtype, qtype_count in chapter.question_types.items():
+        log.info(
             "  QuestionType: '%s' | Count: %d",
             qtype,
             qtype_count
         )
 
-def summarize_assessment_breakdown(df: pd.DataFrame):
+
+def _group_counts(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Logs a summary breakdown of chapters, processes, subsections, 
-    question types, questions, and answers.
+    Return one row per distinct (Chapter, Process, Subsection, QuestionType), in
+    order of first appearance, with its row count and non-empty question and
+    answer counts. Missing keys form groups of their own.
     """
-    chapters = df['Chapter'].dropna().unique()
-    processes = (
-        df[['Chapter', 'Process']]
-        .drop_duplicates()
-        .dropna(subset=['Process'])
+    keys = {column: df[column] for column in GROUP_COLUMNS}
+    counts = pd.DataFrame({
+        **keys,
+        'first': np.arange(len(df)),
+        'questions': (df['Questions'] != '').to_numpy(),
+        'answers': (df['Answer'] != '').to_numpy(),
+    })
+    grouped = counts.groupby(GROUP_COLUMNS, dropna=False, observed=True, sort=False).agg(
+        first=('first', 'min'), rows=('first', 'size'),
+        questions=('questions', 'sum'), answers=('answers', 'sum')
     )
-    subsections = (
-        df[['Chapter', 'Process', 'Subsection']]
-        .drop_duplicates()
-        .dropna(subset=['Subsection'])
+    return grouped.sort_values('first').reset_index()
+
+
+def build_assessment_summary(df: pd.DataFrame) -> AssessmentSummary:
+    """
+    Compute the breakdown of chapters, processes, subsections, question types,
+    questions and answers from one grouped aggregation.
+
+    Args:
+        df (pd.DataFrame): Frame with Chapter, Process, Subsection, QuestionType,
+            Questions and Answer columns.
+
+    Returns:
+        AssessmentSummary: The structured breakdown.
+    """
+    groups = _group_counts(df)
+    question_types = list(groups['QuestionType'].dropna().unique())
+    summary = AssessmentSummary(
+        total_chapters=groups['Chapter'].nunique(),
+        total_processes=len(
+            groups[['Chapter', 'Process']].drop_duplicates().dropna(subset=['Process'])
+        ),
+        total_subsections=len(
+            groups[['Chapter', 'Process', 'Subsection']].drop_duplicates()
+            .dropna(subset=['Subsection'])
+        ),
+        question_types=question_types,
+        total_questions=int(groups['questions'].sum()),
+        total_answers=int(groups['answers'].sum()),
+        unique_questions=df['Questions'].nunique(),
+        unique_answers=df['Answer'].nunique(),
     )
-    question_types = df['QuestionType'].dropna().unique()
-    questions = df[df['Questions'] != '']
-    answers = df[df['Answer'] != '']
-
-    logger.info("Summary breakdown:")
-    logger.info("Total chapters: %d", len(chapters))
-    logger.info("Total processes: %d", len(processes))
-    logger.info("Total subsections: %d", len(subsections))
-    logger.info("Total question types: %d", len(question_types))
-    logger.info("Total questions: %d", len(questions))
-    logger.info("Total answers: %d", len(answers))
-
-    log_chapter_summary(df, chapters, question_types)
-
-    logger.info("Total unique questions: %d", df['Questions'].nunique())
-    logger.info("Total unique answers: %d", df['Answer'].nunique())
-    logger.info("Summary complete.")
+
+    chapters: Dict[object, ChapterSummary] = {}
+    processes: Dict[tuple, ProcessSummary] = {}
+    subsections: Dict[tuple, SubsectionSummary] = {}
+    for row in groups.itertuples(index=False):
+        if pd.isna(row.Chapter):
+            continue
+        chapter = chapters.get(row.Chapter)
+        if chapter is None:
+            chapter = ChapterSummary(row.Chapter, question_types=dict.fromkeys(question_types, 0))
+            chapters[row.Chapter] = chapter
+        if not pd.isna(row.QuestionType):
+            chapter.question_types[row.QuestionType] += int(row.rows)
+        if pd.isna(row.Process):
+            continue
+        process = processes.get((row.Chapter, row.Process))
+        if process is None:
+            process = ProcessSummary(row.Process)
+            processes[(row.Chapter, row.Process)] = process
+            chapter.processes.append(process)
+        process.questions += int(row.questions)
+        process.answers += int(row.answers)
+        if pd.isna(row.Subsection):
+            continue
+        key = (row.Chapter, row.Process, row.Subsection)
+        subsection = subsections.get(key)
+        if subsection is None:
+            subsection = SubsectionSummary(row.Subsection)
+            subsections[key] = subsection
+            process.subsections.append(subsection)
+        subsection.questions += int(row.questions)
+        subsection.answers += int(row.answers)
+    summary.chapters = list(chapters.values())
+    return summary
+
+
+def summarize_assessment_breakdown(df: pd.DataFrame) -> AssessmentSummary:
+    """
+    Logs a summary breakdown of chapters, processes, subsections,
+    question types, questions, and answers.
+
+    Returns:
+        AssessmentSummary: The breakdown that was logged.
+    """
+    summary = build_assessment_summary(df)
+    summary.log()
+    return summary
@@ -1,9 +1,13 @@
 """Cleaner module for data cleaning utilities."""
 
 import re
-from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+import numpy as np
 import pandas as pd
 
+from .workers import get_pool
+
 def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean DataFrame column names by stripping whitespace and converting to lowercase.
@@ -16,13 +20,37 @@ def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     """
     return df.drop_duplicates()
 
+def _normalize_uniques(uniques) -> pd.Index:
+    """
+    Strip and collapse whitespace in each distinct value, as strings.
+    """
+    return pd.Index(uniques).astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+
 def clean_text_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
     """
     Clean a specific text column in the DataFrame by removing extra spaces 
     and normalizing whitespace.
-    """
-    df[column] = df[column].astype(str).apply(
-        lambda x: re.sub(r'\s+', ' ', x.strip())
+
+    The column is factorized so that each distinct value is cleaned once and the
+    results are mapped back by code; the cost grows with the number of distinct
+    values rather than rows. Missing values stay missing. Categorical columns
+    stay categorical, with their categories cleaned (and merged where cleaning
+    makes two of them equal).
+    """
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        cleaned = _normalize_uniques(series.cat.categories)
+        # Cleaning can make categories equal, so factorize them again
+        category_codes, categories = pd.factorize(cleaned)
+        new_codes = np.where(codes < 0, -1, category_codes[codes])
+        df[column] = pd.Categorical.from_codes(new_codes, categories)
+        return df
+
+    codes, uniques = pd.factorize(series)
+    cleaned = _normalize_uniques(uniques)
+    df[column] = pd.Series(
+        cleaned.take(codes, allow_fill=True, fill_value=np.nan), index=df.index
     )
     return df
 
@@ -32,7 +60,7 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = clean_column_names(df)
     df = remove_duplicates(df)
-    for col in df.select_dtypes(include='object').columns:
+    for col in df.select_dtypes(include=['object', 'string', 'category']).columns:
         df = clean_text_column(df, col)
     return df
 
@@ -40,46 +68,77 @@ def parallel_clean_data(dfs):
     """
     Clean multiple DataFrames in parallel.
     """
-    with ProcessPoolExecutor() as executor:
-        cleaned = list(executor.map(clean_data, dfs))
-    return cleaned
+    return get_pool().map(clean_data, dfs, chunksize=1)
+
+# Instructional phrases removed from question text, as one compiled alternation
+INSTRUCTION_PATTERN = re.compile(
+    r"(?:ASK participants:"
+    r"|DISPLAY the question below on the PowerPoint Presentation\."
+    r"|MULTIPLE CHOICE QUESTIONS)\s*",
+    re.IGNORECASE,
+)
+# Row count above which preprocess_data splits the frame across processes
+PARALLEL_THRESHOLD = 500_000
 
 def clean_question_text(text: str) -> str:
     """
     Remove instructional phrases and extra whitespace from question text.
     """
-    patterns = [
-        r"ASK participants:\s*",
-        r"DISPLAY the question below on the PowerPoint Presentation\.\s*",
-        r"MULTIPLE CHOICE QUESTIONS\s*"
-    ]
-    for pattern in patterns:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-    return text.strip()
+    return INSTRUCTION_PATTERN.sub("", text).strip()
 
-def _clean_row(row):
+def _as_text(series: pd.Series) -> pd.Series:
     """
-    Clean the 'Questions' and 'Answer' fields in a row dictionary.
+    Return the series as strings, converting values with str() (so missing
+    values become 'None' / 'nan') unless it already holds only strings.
     """
-    row["Questions"] = clean_question_text(str(row["Questions"]).strip())
-    row["Answer"] = str(row["Answer"]).strip()
-    return row
+    if pd.api.types.is_string_dtype(series) and not series.hasnans:
+        return series
+    return series.map(str)
 
-def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
+def _preprocess_frame(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Cleans and preprocesses the DataFrame by stripping whitespace and cleaning question text using
-    multiprocessing.
+    Strip the 'Questions' and 'Answer' columns and remove instructional phrases
+    from the questions using vectorized string operations.
+    """
+    df = df.copy()
+    df["Questions"] = (
+        _as_text(df["Questions"]).str.strip()
+        .str.replace(INSTRUCTION_PATTERN, "", regex=True).str.strip()
+    )
+    df["Answer"] = _as_text(df["Answer"]).str.strip()
+    return df
+
+def preprocess_data(df: pd.DataFrame, parallel_threshold: int = PARALLEL_THRESHOLD,
+                    workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Cleans and preprocesses the DataFrame by stripping whitespace and cleaning question text.
+
+    Frames up to ``parallel_threshold`` rows are processed with vectorized string
+    operations in this process; larger frames are split into one chunk per
+    worker process.
+
+    Args:
+        df (pd.DataFrame): Frame with 'Questions' and 'Answer' columns.
+        parallel_threshold (int): Row count above which chunks run in parallel.
+        workers (int, optional): Number of chunks (default: the shared pool's workers).
+
+    Returns:
+        pd.DataFrame: The preprocessed frame with a fresh RangeIndex.
     """
     required_columns = ["Questions", "Answer"]
     for column in required_columns:
         if column not in df.columns:
             raise KeyError(f"Missing required column: {column}")
 
-    # Convert DataFrame to list of dicts for multiprocessing
-    records = df.to_dict(orient="records")
-    with ProcessPoolExecutor() as executor:
-        cleaned_records = list(executor.map(_clean_row, records))
-    return pd.DataFrame(cleaned_records)
+    df = df.reset_index(drop=True)
+    if len(df) <= parallel_threshold:
+        return _preprocess_frame(df)
+
+    pool = get_pool()
+    chunk_size = -(-len(df) // (workers or pool.max_workers))
+    chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+    cleaned_chunks = pool.map(_preprocess_frame, chunks, chunksize=1)
+    return pd.concat(cleaned_chunks, ignore_index=True)
 
 def validate_columns(df: pd.DataFrame, required_columns: list) -> None:
     """
@@ -102,8 +161,5 @@ def clean_and_validate_data_parallel(dfs: list, required_columns: list) -> list:
     Clean and validate multiple DataFrames in parallel, ensuring all required columns 
     are present and cleaned.
     """
-    with ProcessPoolExecutor() as executor:
-        cleaned_dfs = list(
-            executor.map(lambda df: clean_and_validate_data(df, required_columns), dfs)
-        )
-    return cleaned_dfs
+    worker = partial(clean_and_validate_data, required_columns=required_columns)
+    return get_pool().map(worker, dfs, chunksize=1)
@@ -0,0 +1,230 @@
+"""
+dedup.py
+
+Corpus-wide question deduplication index that gives every question a canonical id.
+
+Question text is normalized (case-folded, punctuation dropped, whitespace
+collapsed) and looked up first by an exact hash. A new text is then compared
+with earlier questions through MinHash signatures of its character shingles,
+bucketed with locality-sensitive hashing (LSH): only questions sharing a band
+bucket are compared, so a lookup does not scan the corpus. A match above the
+similarity threshold reuses that question's id; otherwise the text becomes a
+new canonical question. Ids are derived from the canonical text's hash, so an
+exact duplicate gets the same id whichever index or process saw it first.
+
+The index grows as documents are processed and is saved as a single ``.npz``
+file (signatures, exact hashes and settings); buckets are rebuilt on load.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 1
+NUM_PERM = 128
+BANDS = 32
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.75
+_SEED = 20240501
+_PRIME = (1 << 61) - 1
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(text) -> str:
+    """Return the text used to compare questions: case-folded, without punctuation
+    and with whitespace collapsed."""
+    text = _PUNCTUATION.sub(" ", str(text).casefold())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def text_hash(normalized: str) -> int:
+    """Return the 64-bit exact-match hash of a normalized text."""
+    return int.from_bytes(
+        hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def question_id(key: int) -> str:
+    """Return the canonical id string for a canonical text hash."""
+    return f"q{key:016x}"
+
+
+class DedupIndex:
+    """
+    Exact + MinHash-LSH index of canonical questions.
+
+    Args:
+        path (str or Path, optional): Index file; loaded if it exists, used by save().
+        threshold (float): Estimated Jaccard similarity of shingle sets at which
+            two questions are the same.
+        num_perm (int): MinHash signature length (ignored when loading a file).
+        bands (int): LSH bands; must divide ``num_perm``.
+        shingle_size (int): Characters per shingle.
+    """
+
+    def __init__(self, path=None, threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = NUM_PERM, bands: int = BANDS,
+                 shingle_size: int = SHINGLE_SIZE):
+        self.path = Path(path) if path is not None else None
+        self.threshold = threshold
+        self._configure(num_perm, bands, shingle_size)
+        self._keys: List[int] = []
+        self._exact: Dict[int, int] = {}
+        self.exact_hits = 0
+        self.near_hits = 0
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def _configure(self, num_perm: int, bands: int, shingle_size: int) -> None:
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(_SEED)
+        # Multipliers up to 2**61 so a * h wraps and each row is a real permutation
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        # One signature per canonical question; rows past len(self) are spare capacity
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signature(self, normalized: str) -> np.ndarray:
+        """Return the MinHash signature of a normalized text's character shingles."""
+        size = self.shingle_size
+        shingles = {normalized[i:i + size] for i in range(max(len(normalized) - size + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return (permuted.min(axis=1) & 0xFFFFFFFF).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray):
+        return [band.tobytes() for band in signature.reshape(self.bands, -1)]
+
+    def _insert(self, key: int, signature: np.ndarray) -> int:
+        row = len(self._keys)
+        if row == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[row] = signature
+        self._keys.append(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(row)
+        return row
+
+    def _nearest(self, signature: np.ndarray) -> Optional[int]:
+        """Return the row of the most similar indexed question above the threshold."""
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        if not candidates:
+            return None
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = np.count_nonzero(self._signatures[rows] == signature, axis=1)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold * self.num_perm:
+            return None
+        return int(rows[best])
+
+    def lookup(self, text) -> Optional[str]:
+        """Return the canonical id of a question already in the index, or None."""
+        normalized = normalize_question(text)
+        if not normalized:
+            return None
+        row = self._exact.get(text_hash(normalized))
+        if row is None:
+            row = self._nearest(self.signature(normalized))
+        return None if row is None else question_id(self._keys[row])
+
+    def add(self, text) -> Optional[str]:
+        """
+        Return the canonical id of a question, adding it to the index if it is new.
+        Empty questions have no id.
+        """
+        normalized = normalize_question(text)
+        if not normalized:
+            return None
+        key = text_hash(normalized)
+        row = self._exact.get(key)
+        if row is not None:
+            self.exact_hits += 1
+            return question_id(self._keys[row])
+        signature = self.signature(normalized)
+        row = self._nearest(signature)
+        if row is not None:
+            self.near_hits += 1
+        else:
+            row = self._insert(key, signature)
+        # Later copies of this exact wording skip the similarity search
+        self._exact[key] = row
+        return question_id(self._keys[row])
+
+    def assign_ids(self, df: pd.DataFrame, column: str = "questions",
+                   id_column: str = "question_id") -> pd.DataFrame:
+        """
+        Add a canonical id column for ``column`` of a frame, growing the index.
+        Each distinct text is looked up once; missing questions get no id.
+
+        Returns:
+            pd.DataFrame: ``df`` with ``id_column`` set.
+        """
+        codes, uniques = pd.factorize(df[column])
+        ids = np.array([self.add(text) for text in uniques] + [None], dtype=object)
+        df[id_column] = ids[codes]
+        return df
+
+    def save(self, path=None) -> None:
+        """Write the index atomically to ``path`` (default: the path it was opened with)."""
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path given for saving the dedup index")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        signatures = self._signatures[:len(self)]
+        exact_keys = np.fromiter(self._exact, dtype=np.uint64, count=len(self._exact))
+        exact_rows = np.fromiter(self._exact.values(), dtype=np.int64, count=len(self._exact))
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(
+                    handle,
+                    settings=np.array(
+                        [INDEX_FORMAT, self.num_perm, self.bands, self.shingle_size]
+                    ),
+                    keys=np.array(self._keys, dtype=np.uint64),
+                    signatures=signatures,
+                    exact_keys=exact_keys,
+                    exact_rows=exact_rows,
+                )
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        logger.info("Saved dedup index: %d canonical questions to %s", len(self), path)
+
+    def load(self) -> None:
+        """Read the index from its path, replacing the current contents."""
+        with np.load(self.path) as data:
+            fmt, num_perm, bands, shingle_size = (int(v) for v in data["settings"])
+            if fmt != INDEX_FORMAT:
+                raise ValueError(f"Unsupported dedup index format {fmt} in {self.path}")
+            self._configure(num_perm, bands, shingle_size)
+            self._keys = []
+            for key, signature in zip(data["keys"].tolist(), data["signatures"]):
+                self._insert(key, signature)
+            self._exact = dict(zip(data["exact_keys"].tolist(), data["exact_rows"].tolist()))
+        logger.info("Loaded dedup index: %d canonical questions from %s", len(self), self.path)
@@ -6,14 +6,25 @@ for internal assessment extraction, using both numbering patterns and heading st
 """
 
 import logging
-import re
-import multiprocessing
 import sys
 from docx import Document
-import pandas as pd
+from .docx_stream import (
+    StreamParagraph, iter_body_paragraphs, iter_table_cells, load_style_index
+)
+from .markers import DEFAULT_SCANNER
+from .records import QuestionRecord, QuestionTable
+from .style_index import StyleIndex, classify_style_name
+from .tables import iter_unique_cells
+from .workers import get_pool
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Parsing engines: "docx" loads the full python-docx object model, "stream" reads
+# word/document.xml incrementally with constant memory. Both yield identical rows.
+ENGINES = ("docx", "stream")
+# Rows per frame yielded by iter_question_frames
+DEFAULT_CHUNK_SIZE = 10_000
+
 
 def clean(text):
     """
@@ -22,129 +33,265 @@ def clean(text):
     return ' '.join(text.strip().split()) if text else ''
 
 
-def extract_structure(para, current):
+_HEADING_FIELDS = {
+    1: ("chapter", "chapter_style"),
+    2: ("process", "process_style"),
+    3: ("subsection", "subsection_style"),
+}
+
+
+def paragraph_style(para, style_index=None):
     """
-    Update the current structure dictionary based on paragraph style and text.
+    Return the StyleInfo of a python-docx or streamed paragraph. With a
+    StyleIndex this is a dictionary lookup on the paragraph's style id; without
+    one the python-docx style object is resolved.
+    """
+    if isinstance(para, StreamParagraph):
+        return (style_index or StyleIndex()).lookup(para.style_id)
+    if style_index is None:
+        return classify_style_name(para.style.name)
+    return style_index.lookup(para._p.style)  # pylint: disable=protected-access
+
+
+def _apply_heading(style, text, current):
     """
-    style = para.style.name.lower()
-    text = clean(para.text)
-    if style.startswith("heading 1") and text:
-        current['chapter'] = text
-        current['chapter_style'] = style
-    elif style.startswith("heading 2") and text:
-        current['process'] = text
-        current['process_style'] = style
-    elif style.startswith("heading 3") and text:
-        current['subsection'] = text
-        current['subsection_style'] = style
+    Record a heading paragraph's text and style in the current structure.
+    """
+    if style.heading_level and text:
+        field, style_field = _HEADING_FIELDS[style.heading_level]
+        current[field] = text
+        current[style_field] = style.key
     return current
 
 
-def extract_question_answer(cell_text):
+def extract_structure(para, current, style_index=None):
+    """
+    Update the current structure dictionary based on paragraph style and text.
+    """
+    return _apply_heading(paragraph_style(para, style_index), clean(para.text), current)
+
+
+def extract_question_answer(cell_text, scanner=DEFAULT_SCANNER):
     """
     Extract question, answer, and question type from a cell containing both.
+
+    All markers are located with one pass of ``scanner``; pass a MarkerScanner
+    with a different vocabulary to recognise other marker wording.
     """
     question_type = None
     question = None
     answer = None
+    ask = first_answer = answer_after_ask = None
+    for hit in scanner.scan(cell_text):
+        if hit.name == "challenges_concept_check":
+            question_type = "Challenges Concept Check Question"
+        elif hit.name == "ask" and ask is None:
+            ask = hit
+        elif hit.name == "answer":
+            first_answer = first_answer or hit
+            if ask is not None and answer_after_ask is None:
+                answer_after_ask = hit
 
-    # Identify question type
-    if "CHALLENGES CONCEPT CHECK" in cell_text.upper():
-        question_type = "Challenges Concept Check Question"
-
-    # Extract question and answer using regex
-    match = re.search(
-        r"(ASK participants:.*?)(ANSWER:.*)",
-        cell_text,
-        re.IGNORECASE | re.DOTALL
-    )
-    if match:
-        question = match.group(1).replace("ASK participants:", "").strip()
-        answer = match.group(2).replace("ANSWER:", "").strip()
+    # Question runs from the first ASK marker to the first ANSWER marker after it
+    if answer_after_ask:
+        question = cell_text[ask.start:answer_after_ask.start]
+        question = question.replace(scanner.markers["ask"], "").strip()
+        answer = cell_text[answer_after_ask.start:]
+        answer = answer.replace(scanner.markers["answer"], "").strip()
     else:
-        # Fallback: try to find just the answer
-        answer_match = re.search(r"ANSWER:(.*)", cell_text, re.IGNORECASE | re.DOTALL)
-        if answer_match:
-            answer = answer_match.group(1).strip()
-        # Try to find just the question
-        question_match = re.search(r"ASK participants:(.*)", cell_text, re.IGNORECASE | re.DOTALL)
-        if question_match:
-            question = question_match.group(1).strip()
+        # Fallback: the answer and/or question alone
+        if first_answer:
+            answer = cell_text[first_answer.end:].strip()
+        if ask:
+            question = cell_text[ask.end:].strip()
 
     return question, answer, question_type
 
 
-def extract_qa_from_cell(cell):
+def _read_lines(paragraphs, style_index):
     """
-    Extract all Q&A pairs from a table cell.
+    Classify each paragraph once, returning (StyleInfo, cleaned text) pairs.
+    """
+    return [(paragraph_style(para, style_index), clean(para.text)) for para in paragraphs]
+
+
+def _qa_from_lines(lines, scanner=DEFAULT_SCANNER):
+    """
+    Extract all Q&A pairs from the classified paragraphs of one table cell.
+
+    Paragraphs are short, so each is lower-cased once and tested for the
+    scanner's marker literals directly; this is cheaper than a regex pass per
+    paragraph.
     """
+    ask_marker, answer_marker, concept_marker = scanner.qa_literals
     qas = []
     last_concept_check = None
-    paragraphs = cell.paragraphs
-    for idx, para in enumerate(paragraphs):
-        style = para.style.name.lower()
-        text = clean(para.text)
-        if "concept check" in text.lower() and style in ["normal", "body text"]:
+    for idx, (style, text) in enumerate(lines):
+        lowered = text.lower()
+        if concept_marker in lowered and style.body_text:
             last_concept_check = "CONCEPT CHECK"
-        if "ask participants:" in text.lower():
+        if ask_marker in lowered:
             question = text
             answer = ""
             # Try to find answer in the same or next paragraph
-            if "answer:" in text.lower():
-                parts = text.split("answer:", 1)
+            if answer_marker in lowered:
+                parts = text.split(answer_marker, 1)
                 question = parts[0].strip()
                 answer = parts[1].strip() if len(parts) > 1 else ""
-            elif idx + 1 < len(paragraphs):
-                next_text = clean(paragraphs[idx + 1].text)
-                if next_text.lower().startswith("answer:"):
-                    answer = next_text[7:].strip()
+            elif idx + 1 < len(lines):
+                next_text = lines[idx + 1][1]
+                if next_text.lower().startswith(answer_marker):
+                    answer = next_text[len(answer_marker):].strip()
             qas.append((last_concept_check, question, answer))
     return qas
 
 
-def parse_document(path):
+def extract_qa_from_cell(cell, style_index=None):
     """
-    Parse a DOCX document and extract structured Q&A data as a DataFrame.
+    Extract all Q&A pairs from a table cell.
+    """
+    return _qa_from_lines(_read_lines(cell.paragraphs, style_index))
+
+
+def _open_document(path, engine):
+    """
+    Return the body paragraphs, the physical table cells (each merged cell once,
+    in reading order) and the style index of a DOCX document for the selected engine.
     """
-    doc = Document(path)
+    if engine == "docx":
+        doc = Document(path)
+        cells = (entry.cell for table in doc.tables for entry in iter_unique_cells(table))
+        return doc.paragraphs, cells, StyleIndex.from_document(doc)
+    if engine == "stream":
+        return iter_body_paragraphs(path), iter_table_cells(path), load_style_index(path)
+    raise ValueError(
+        f"Unknown parsing engine '{engine}'. Expected one of: {', '.join(ENGINES)}"
+    )
+
+
+def iter_questions(path, engine="docx", stats=None):
+    """
+    Yield the unique questions of a DOCX document one at a time, as they are found.
+
+    Rows are never collected, so a caller can stop early (breaking out of the
+    loop closes the document) or pass them straight to a writer. Headings from
+    the body paragraphs are read first, as ``parse_document`` always has; the
+    cells' own headings update the context as the tables are walked.
+
+    Args:
+        path (str or Path): The DOCX file to parse.
+        engine (str): "docx" (python-docx object model) or "stream" (incremental
+            lxml reader with flat memory use). Both yield the same records.
+        stats (dict, optional): Incremented with the parse counters of the part
+            of the document read: paragraphs (body), cells, cell_paragraphs,
+            qa_found, duplicates_dropped and questions.
+
+    Yields:
+        records.QuestionRecord: The question, its answer and type, and the
+        chapter/process/subsection headings (and styles) in effect.
+    """
+    paragraphs, cells, style_index = _open_document(path, engine)
     current = {
         "chapter": "", "chapter_style": "",
         "process": "", "process_style": "",
         "subsection": "", "subsection_style": ""
     }
-    data = []
     seen_questions = set()  # Track unique questions
 
-    for para in doc.paragraphs:
-        current = extract_structure(para, current)
-
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                # Update structure if headings are in table cells
-                for para in cell.paragraphs:
-                    current = extract_structure(para, current)
-                # Extract all Q&A pairs from this cell
-                qas = extract_qa_from_cell(cell)
-                for qtype, question, answer in qas:
-                    # Only add if question is not already seen
-                    question_key = question.strip().lower() if question else ""
-                    if question_key and question_key not in seen_questions:
-                        seen_questions.add(question_key)
-                        data.append({
-                            "QuestionType": qtype or "Unknown",
-                            "Questions": question,
-                            "Answer": answer,
-                            "Marks": "/1",
-                            "Chapter": current['chapter'],
-                            "ChapterStyle": current['chapter_style'],
-                            "Process": current['process'],
-                            "ProcessStyle": current['process_style'],
-                            "Subsection": current['subsection'],
-                            "SubsectionStyle": current['subsection_style']
-                        })
-
-    df = pd.DataFrame(data)
+    paragraph_count = cell_count = cell_paragraph_count = qa_count = 0
+
+    try:
+        for para in paragraphs:
+            paragraph_count += 1
+            style = paragraph_style(para, style_index)
+            if style.heading_level:
+                current = _apply_heading(style, clean(para.text), current)
+
+        for cell in cells:
+            cell_count += 1
+            # Classify the cell's paragraphs once for both structure and Q&A extraction
+            lines = _read_lines(cell.paragraphs, style_index)
+            cell_paragraph_count += len(lines)
+            # Update structure if headings are in table cells
+            for style, text in lines:
+                current = _apply_heading(style, text, current)
+            # Extract all Q&A pairs from this cell
+            qas = _qa_from_lines(lines)
+            qa_count += len(qas)
+            for qtype, question, answer in qas:
+                # Only yield if question is not already seen
+                question_key = question.strip().lower() if question else ""
+                if question_key and question_key not in seen_questions:
+                    seen_questions.add(question_key)
+                    yield QuestionRecord(
+                        qtype or "Unknown", question, answer,
+                        current['chapter'], current['chapter_style'],
+                        current['process'], current['process_style'],
+                        current['subsection'], current['subsection_style']
+                    )
+    finally:
+        # Close the streaming readers now rather than when they are collected
+        for source in (paragraphs, cells):
+            if hasattr(source, "close"):
+                source.close()
+        if stats is not None:
+            for name, value in (
+                ("paragraphs", paragraph_count), ("cells", cell_count),
+                ("cell_paragraphs", cell_paragraph_count), ("qa_found", qa_count),
+                ("duplicates_dropped", qa_count - len(seen_questions)),
+                ("questions", len(seen_questions)),
+            ):
+                stats[name] = stats.get(name, 0) + value
+
+
+def iter_question_frames(path, chunk_size=DEFAULT_CHUNK_SIZE, engine="docx", stats=None):
+    """
+    Yield a document's questions as DataFrames of up to ``chunk_size`` rows.
+
+    Each chunk has the columns and dtypes of ``parse_document``'s frame (its
+    categoricals only hold the chunk's own values), so chunks can be appended to
+    a writer while only one chunk's rows are held in memory.
+
+    Args:
+        path (str or Path): The DOCX file to parse.
+        chunk_size (int): Maximum rows per frame.
+        engine (str): "docx" or "stream", as for ``parse_document``.
+        stats (dict, optional): Parse counters, as for ``iter_questions``.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows with ``records.COLUMNS``.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    table = QuestionTable()
+    for record in iter_questions(path, engine=engine, stats=stats):
+        table.add(record)
+        if len(table) == chunk_size:
+            yield table.to_frame()
+            table = QuestionTable()
+    if len(table):
+        yield table.to_frame()
+
+
+def parse_document(path, engine="docx", stats=None):
+    """
+    Parse a DOCX document and extract structured Q&A data as a DataFrame.
+
+    Args:
+        path (str or Path): The DOCX file to parse.
+        engine (str): "docx" (python-docx object model) or "stream" (incremental
+            lxml reader with flat memory use). Both produce the same rows.
+        stats (dict, optional): Incremented with the parse counters: paragraphs
+            (body), cells, cell_paragraphs, qa_found, duplicates_dropped and questions.
+
+    Returns:
+        pd.DataFrame: One row per unique question with ``records.COLUMNS``; the
+        question type, marks, heading and style columns are categorical.
+    """
+    table = QuestionTable()
+    for record in iter_questions(path, engine=engine, stats=stats):
+        table.add(record)
+    df = table.to_frame()
     logging.info("Extracted %d unique Q&A pairs.", len(df))
     return df
 
@@ -153,9 +300,7 @@ def parse_documents_in_parallel(doc_paths):
     """
     Parse multiple DOCX documents in parallel and return a list of DataFrames.
     """
-    with multiprocessing.Pool() as pool:
-        dfs = pool.map(parse_document, doc_paths)
-    return dfs
+    return get_pool().map(parse_document, doc_paths, chunksize=1)
 
 
 if __name__ == "__main__":
@@ -185,6 +330,12 @@ if __name__ == "__main__":
             "folder will be used."
         )
     )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="docx",
+        help="Parsing engine: python-docx object model or streaming lxml reader."
+    )
     args = parser.parse_args()
 
     # Determine which file to use
@@ -204,7 +355,7 @@ if __name__ == "__main__":
         sys.exit(1)
 
     try:
-        df_questions = parse_document(selected_doc_path)
+        df_questions = parse_document(selected_doc_path, engine=args.engine)
         print("DataFrame Summary:")
         print(df_questions.info())
         print(df_questions.head(15))
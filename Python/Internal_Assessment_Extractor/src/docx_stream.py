@@ -0,0 +1,229 @@
+"""
+docx_stream.py
+
+Streams paragraphs and table cells straight out of a DOCX package using lxml's
+iterparse, clearing each element as soon as it has been read. Memory use stays
+roughly flat no matter how large the document is, while the paragraphs and cells
+produced mirror what python-docx exposes through ``doc.paragraphs`` and
+``cell.paragraphs``; paragraph styles are resolved through ``style_index``.
+"""
+
+import posixpath
+import zipfile
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from .style_index import StyleIndex
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+OFFICE_DOCUMENT_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+STYLES_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+
+def _w(tag: str) -> str:
+    """Return the Clark-notation name of a WordprocessingML tag."""
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_TBL = _w("tbl")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_R = _w("r")
+W_T = _w("t")
+W_BR = _w("br")
+W_HYPERLINK = _w("hyperlink")
+W_VAL = _w("val")
+W_TYPE = _w("type")
+
+# Text equivalents of run inner-content, as python-docx renders them in ``Run.text``.
+_RUN_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+
+
+class StreamParagraph(NamedTuple):
+    """A paragraph read from the XML stream: its text and ``w:pStyle`` id."""
+    text: str
+    style_id: Optional[str]
+
+
+class StreamCell(NamedTuple):
+    """A table cell read from the XML stream, exposing its direct ``paragraphs``."""
+    paragraphs: List[StreamParagraph]
+
+
+def _package_parts(archive: zipfile.ZipFile) -> Tuple[str, Optional[str]]:
+    """
+    Locate the main document part and its styles part through the package
+    relationships, falling back to the conventional part names.
+    """
+    document_part = "word/document.xml"
+    rels = _read_rels(archive, "_rels/.rels", "")
+    document_part = rels.get(OFFICE_DOCUMENT_REL, document_part)
+
+    base, name = posixpath.split(document_part)
+    doc_rels = _read_rels(archive, posixpath.join(base, "_rels", f"{name}.rels"), base)
+    return document_part, doc_rels.get(STYLES_REL)
+
+
+def _read_rels(archive: zipfile.ZipFile, rels_path: str, base: str) -> Dict[str, str]:
+    """
+    Map relationship types to resolved part names for one relationships part.
+    """
+    try:
+        root = etree.fromstring(archive.read(rels_path))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in root.iter(f"{{{REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            part = target.lstrip("/")
+        else:
+            part = posixpath.normpath(posixpath.join(base, target))
+        targets.setdefault(rel.get("Type"), part)
+    return targets
+
+
+def load_style_index(path, inherit_headings: bool = False) -> StyleIndex:
+    """
+    Build the StyleIndex of a DOCX file from its styles part.
+    """
+    with zipfile.ZipFile(path) as archive:
+        _, styles_part = _package_parts(archive)
+        if styles_part is None:
+            return StyleIndex(None, inherit_headings)
+        root = etree.fromstring(archive.read(styles_part))
+    return StyleIndex(root, inherit_headings)
+
+
+def run_text(run) -> str:
+    """Return the text of a ``<w:r>`` element the way python-docx renders it."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def paragraph_text(para) -> str:
+    """Return the text of a ``<w:p>`` element, including hyperlink runs."""
+    parts = []
+    for child in para:
+        if child.tag == W_R:
+            parts.append(run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(run_text(run) for run in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def paragraph_style_id(para) -> Optional[str]:
+    """Return the ``w:pStyle`` id of a ``<w:p>`` element, or None."""
+    ppr = para.find(_w("pPr"))
+    if ppr is None:
+        return None
+    pstyle = ppr.find(_w("pStyle"))
+    return None if pstyle is None else pstyle.get(W_VAL)
+
+
+def read_paragraph(para) -> StreamParagraph:
+    """Build a StreamParagraph from a ``<w:p>`` element."""
+    return StreamParagraph(paragraph_text(para), paragraph_style_id(para))
+
+
+def _iter_body_events(path, want_paragraphs: bool, want_rows: bool):
+    """
+    Stream the document body, yielding ``("p", paragraph)`` for each body-level
+    paragraph and ``("tr", row_element)`` for each row of a body-level table.
+
+    Each yielded element is cleared once the consumer resumes, and finished
+    siblings are detached from the tree so memory does not grow with the document.
+    """
+    with zipfile.ZipFile(path) as archive:
+        document_part, _ = _package_parts(archive)
+        with archive.open(document_part) as stream:
+            events = etree.iterparse(
+                stream, events=("end",), tag=(W_P, W_TR, W_TBL), resolve_entities=False
+            )
+            for _, elem in events:
+                parent = elem.getparent()
+                if parent is None:
+                    continue
+                if elem.tag == W_P and parent.tag == W_BODY:
+                    if want_paragraphs:
+                        yield "p", read_paragraph(elem)
+                elif elem.tag == W_TR and parent.tag == W_TBL:
+                    grandparent = parent.getparent()
+                    if grandparent is None or grandparent.tag != W_BODY:
+                        continue
+                    if want_rows:
+                        yield "tr", elem
+                elif not (elem.tag == W_TBL and parent.tag == W_BODY):
+                    continue
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def iter_body_paragraphs(path) -> Iterator[StreamParagraph]:
+    """
+    Yield the body-level paragraphs of a DOCX file, equivalent to ``doc.paragraphs``.
+    """
+    for _, para in _iter_body_events(path, want_paragraphs=True, want_rows=False):
+        yield para
+
+
+def _grid_value(element, prop: str, child: str, default: int) -> int:
+    """Read the integer ``w:val`` of ``./<prop>/<child>``, or ``default`` if absent."""
+    props = element.find(_w(prop))
+    if props is None:
+        return default
+    el = props.find(_w(child))
+    return default if el is None else int(el.get(W_VAL))
+
+
+def _is_merge_continuation(tc) -> bool:
+    """Return True if a cell continues a vertical merge from the row above."""
+    tcpr = tc.find(_w("tcPr"))
+    if tcpr is None:
+        return False
+    v_merge = tcpr.find(_w("vMerge"))
+    return v_merge is not None and v_merge.get(W_VAL, "continue") == "continue"
+
+
+def iter_table_cells(path) -> Iterator[StreamCell]:
+    """
+    Yield each physical cell of every body-level table exactly once, row by row.
+    Horizontally spanned cells are read once and vertical-merge continuations are
+    skipped, matching ``tables.iter_unique_cells`` for the python-docx engine.
+    """
+    table, above = None, set()
+    for _, tr in _iter_body_events(path, want_paragraphs=False, want_rows=True):
+        if tr.getparent() is not table:
+            table, above = tr.getparent(), set()
+        starts = set()
+        col = _grid_value(tr, "trPr", "gridBefore", 0)
+        for tc in tr.iterchildren(W_TC):
+            starts.add(col)
+            if not (_is_merge_continuation(tc) and col in above):
+                yield StreamCell([read_paragraph(p) for p in tc.iterchildren(W_P)])
+            col += _grid_value(tc, "tcPr", "gridSpan", 1)
+        above = starts
@@ -1,36 +1,354 @@
-"""Exporter module for saving DataFrames to Word and Excel formats."""
+"""Exporter module for saving DataFrames to Word, Excel, Parquet, Arrow IPC, CSV and JSONL."""
+
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape
 
 import pandas as pd
 from docx import Document  # Move import to top-level
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from openpyxl import Workbook
+
+from .records import CATEGORY_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Data rows parsed into the document per batch, bounding the size of each XML string
+WORD_ROWS_PER_BATCH = 1000
+# Rows written at a time when streaming a DataFrame
+CHUNK_ROWS = 10_000
+# Data rows per worksheet (Excel's 1,048,576 row limit minus the header)
+EXCEL_MAX_ROWS = 1_048_575
+EXCEL_TITLE_LENGTH = 31
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+# Compression codec of Parquet and Arrow IPC exports
+COLUMNAR_COMPRESSION = "zstd"
+# Columns stored dictionary-encoded in columnar exports (matched ignoring case)
+_DICTIONARY_COLUMNS = {column.lower() for column in CATEGORY_COLUMNS}
+# Tabs and line breaks become <w:tab/> and <w:br/> in a run, as python-docx does
+_RUN_SPECIALS = re.compile(r"(\t|\r|\n)")
+
+
+def _run_content_xml(text: str) -> str:
+    """
+    Return the inner XML of a ``<w:r>`` holding ``text``, matching what
+    python-docx writes when a cell's ``text`` is assigned.
+    """
+    parts = []
+    for piece in _RUN_SPECIALS.split(text):
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif piece:
+            preserve = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ""
+            parts.append(f"<w:t{preserve}>{escape(piece)}</w:t>")
+    return "".join(parts)
+
 
-def export_to_word(df: pd.DataFrame, output_path):
+def _rows_xml(values, cell_props) -> str:
+    """
+    Return ``<w:tr>`` elements for a 2-D array of cell values. Each distinct
+    value is converted to XML once per call.
+    """
+    fragments = {}
+    rows = []
+    for row in values:
+        cells = []
+        for props, item in zip(cell_props, row):
+            text = str(item)
+            fragment = fragments.get(text)
+            if fragment is None:
+                fragment = fragments[text] = _run_content_xml(text)
+            cells.append(f"<w:tc>{props}<w:p><w:r>{fragment}</w:r></w:p></w:tc>")
+        rows.append(f"<w:tr>{''.join(cells)}</w:tr>")
+    return "".join(rows)
+
+
+def export_to_word(df: pd.DataFrame, output_path, header_bold: bool = False,
+                   table_style=None, column_widths=None):
     """
     Export the DataFrame to a Word document.
 
+    The header row is created through python-docx; the data rows are generated as
+    table XML in batches and appended to the table directly, which produces the
+    same document as assigning every cell's text but without the per-cell object
+    overhead.
+
     Args:
         df (pd.DataFrame): The DataFrame to export.
         output_path (str or Path): The output file path.
+        header_bold (bool): Make the header row text bold.
+        table_style (str, optional): Name of a table style defined in the document template.
+        column_widths (list, optional): One python-docx Length (e.g. ``Inches(2)``)
+            per column; by default the page width is split evenly.
     """
     doc = Document()
-    table = doc.add_table(rows=1, cols=len(df.columns))
+    table = doc.add_table(rows=1, cols=len(df.columns), style=table_style)
     hdr_cells = table.rows[0].cells
     for i, col in enumerate(df.columns):
         hdr_cells[i].text = str(col)
+        if header_bold:
+            hdr_cells[i].paragraphs[0].runs[0].bold = True
+    if column_widths is not None:
+        for i, width in enumerate(column_widths):
+            table.columns[i].width = width
+            hdr_cells[i].width = width
 
-    for _, row in df.iterrows():
-        row_cells = table.add_row().cells
-        for i, item in enumerate(row):
-            row_cells[i].text = str(item)
+    # Data cells repeat the header cells' properties (their widths)
+    cell_props = [
+        f"<w:tcPr><w:tcW w:type=\"dxa\" w:w=\"{cell.width.twips}\"/></w:tcPr>"
+        for cell in hdr_cells
+    ]
+    # The same values iterrows() yields, without boxing each row into a Series
+    values = df.to_numpy()
+    tbl = table._tbl  # pylint: disable=protected-access
+    for start in range(0, len(values), WORD_ROWS_PER_BATCH):
+        rows_xml = _rows_xml(values[start:start + WORD_ROWS_PER_BATCH], cell_props)
+        tbl.extend(list(parse_xml(f"<w:tbl {nsdecls('w')}>{rows_xml}</w:tbl>")))
 
     doc.save(str(output_path))
 
 
-def export_to_excel(df: pd.DataFrame, output_path):
+def _sheet_title(value, used) -> str:
+    """
+    Return a valid, unused worksheet title for a split value: at most 31
+    characters, without []:*?/\\, and unique ignoring case.
+    """
+    title = "(blank)" if pd.isna(value) or str(value).strip() == "" else str(value)
+    title = _INVALID_SHEET_CHARS.sub("_", title)[:EXCEL_TITLE_LENGTH]
+    candidate, number = title, 2
+    while candidate.lower() in used:
+        suffix = f" ({number})"
+        candidate = title[:EXCEL_TITLE_LENGTH - len(suffix)] + suffix
+        number += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _iter_chunks(data, chunk_rows: int):
+    """Yield DataFrame chunks from a DataFrame or an iterable of DataFrames."""
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, max(len(data), 1), chunk_rows):
+            yield data.iloc[start:start + chunk_rows]
+    else:
+        yield from data
+
+
+def _excel_rows(chunk: pd.DataFrame):
+    """Return a chunk's rows as lists of plain Python values, missing values as None."""
+    values = chunk.astype(object)
+    return values.where(values.notna(), None).to_numpy().tolist()
+
+
+class _SheetWriter:
+    """Appends rows to a write-only worksheet, continuing on a new sheet when full."""
+
+    def __init__(self, workbook, title, header, used_titles, max_rows):
+        self.workbook = workbook
+        self.title = title
+        self.header = header
+        self.used_titles = used_titles
+        self.max_rows = max_rows
+        self._start_sheet(title)
+
+    def _start_sheet(self, title) -> None:
+        self.sheet = self.workbook.create_sheet(title)
+        self.sheet.append(self.header)
+        self.rows = 0
+
+    def append(self, row) -> None:
+        """Write one data row, continuing on a new sheet when this one is full."""
+        if self.rows >= self.max_rows:
+            self._start_sheet(_sheet_title(self.title, self.used_titles))
+        self.sheet.append(row)
+        self.rows += 1
+
+
+def export_to_excel(data, output_path, split_by=None, sheet_name: str = "Sheet1",
+                    chunk_rows: int = CHUNK_ROWS, max_rows_per_sheet: int = EXCEL_MAX_ROWS):
     """
     Export the DataFrame to an Excel file.
 
+    The workbook is written in openpyxl's write-only mode, so rows are streamed
+    to disk as they arrive and memory stays flat however many rows are written.
+
     Args:
-        df (pd.DataFrame): The DataFrame to export.
+        data (pd.DataFrame or iterable): The DataFrame to export, or an iterable of
+            DataFrame chunks with the same columns.
+        output_path (str or Path): The output file path.
+        split_by (str, optional): Column whose values each get their own sheet
+            (e.g. 'Chapter'), in order of first appearance.
+        sheet_name (str): Sheet name when not splitting.
+        chunk_rows (int): Rows converted at a time when ``data`` is a DataFrame.
+        max_rows_per_sheet (int): Data rows per sheet before continuing on a new
+            sheet (Excel's limit by default).
+    """
+    workbook = Workbook(write_only=True)
+    used_titles = set()
+    writers = {}
+    header = None
+    for chunk in _iter_chunks(data, chunk_rows):
+        if header is None:
+            header = [str(col) for col in chunk.columns]
+        if split_by is None:
+            groups = [(sheet_name, chunk)]
+        else:
+            groups = chunk.groupby(split_by, dropna=False, observed=True, sort=False)
+        for key, group in groups:
+            key = key[0] if isinstance(key, tuple) else key
+            key = None if pd.isna(key) else key
+            writer = writers.get(key)
+            if writer is None:
+                title = sheet_name if split_by is None else _sheet_title(key, used_titles)
+                used_titles.add(title.lower())
+                writer = writers[key] = _SheetWriter(
+                    workbook, title, header, used_titles, max_rows_per_sheet
+                )
+            for row in _excel_rows(group):
+                writer.append(row)
+
+    if not writers:
+        # No rows: write the header alone, as DataFrame.to_excel does
+        workbook.create_sheet(sheet_name).append(header or [])
+    workbook.save(str(output_path))
+
+
+def _require_pyarrow(fmt: str) -> None:
+    """Raise ImportError if pyarrow, needed for ``fmt`` exports, is not installed."""
+    if pa is None:
+        raise ImportError(f"{fmt} export requires pyarrow (pip install pyarrow)")
+
+
+def _arrow_schema(chunk: pd.DataFrame):
+    """
+    Return the schema every chunk is converted to: dictionary-encoded strings
+    (int32 indices) for the hierarchy, style, type and marks columns, strings for
+    the text columns, and other columns as inferred from ``chunk``. Fixing the
+    types up front keeps later chunks convertible when they have more distinct
+    values than the first, or values where the first had only nulls.
+    """
+    inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+    fields = []
+    for fld in inferred:
+        if fld.name.lower() in _DICTIONARY_COLUMNS:
+            fld = fld.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif pa.types.is_null(fld.type) or pa.types.is_large_string(fld.type):
+            fld = fld.with_type(pa.string())
+        fields.append(fld)
+    return pa.schema(fields, metadata=inferred.metadata)
+
+
+def _arrow_batches(data, chunk_rows: int):
+    """Yield pyarrow Tables for the chunks of ``data``, all with one schema."""
+    schema = None
+    for chunk in _iter_chunks(data, chunk_rows):
+        schema = schema or _arrow_schema(chunk)
+        yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def export_to_parquet(data, output_path, chunk_rows: int = CHUNK_ROWS,
+                      compression: str = COLUMNAR_COMPRESSION):
+    """
+    Export to a compressed Parquet file, one row group per chunk. A partly
+    written file is removed if the export fails.
+
+    Args:
+        data (pd.DataFrame or iterable): The DataFrame, or an iterable of chunks.
+        output_path (str or Path): The output file path.
+        chunk_rows (int): Rows per row group when ``data`` is a DataFrame.
+        compression (str): Parquet compression codec.
+    """
+    _require_pyarrow("Parquet")
+    writer = None
+    try:
+        for table in _arrow_batches(data, chunk_rows):
+            if writer is None:
+                writer = pq.ParquetWriter(str(output_path), table.schema, compression=compression)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        Path(output_path).unlink(missing_ok=True)
+        raise
+
+
+def export_to_arrow(data, output_path, chunk_rows: int = CHUNK_ROWS,
+                    compression: str = COLUMNAR_COMPRESSION):
+    """
+    Export to a compressed Arrow IPC stream, one record batch per chunk. The
+    stream format is used (rather than the random-access file format) so that
+    each chunk may carry its own dictionaries. A partly written file is removed
+    if the export fails.
+
+    Args:
+        data (pd.DataFrame or iterable): The DataFrame, or an iterable of chunks.
         output_path (str or Path): The output file path.
+        chunk_rows (int): Rows per record batch when ``data`` is a DataFrame.
+        compression (str): IPC buffer compression codec.
     """
-    df.to_excel(str(output_path), index=False)
+    _require_pyarrow("Arrow IPC")
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    try:
+        with pa.OSFile(str(output_path), "wb") as sink:
+            writer = None
+            try:
+                for table in _arrow_batches(data, chunk_rows):
+                    if writer is None:
+                        writer = pa.ipc.new_stream(sink, table.schema, options=options)
+                    writer.write_table(table)
+            finally:
+                # Before the sink closes, so an error is not masked by a closed file
+                if writer is not None:
+                    writer.close()
+    except BaseException:
+        Path(output_path).unlink(missing_ok=True)
+        raise
+
+
+def export_to_csv(data, output_path, chunk_rows: int = CHUNK_ROWS):
+    """
+    Export to a UTF-8 CSV file, appending each chunk as it arrives.
+
+    Args:
+        data (pd.DataFrame or iterable): The DataFrame, or an iterable of chunks.
+        output_path (str or Path): The output file path.
+        chunk_rows (int): Rows written at a time when ``data`` is a DataFrame.
+    """
+    with open(output_path, "w", encoding="utf-8", newline="") as handle:
+        for idx, chunk in enumerate(_iter_chunks(data, chunk_rows)):
+            chunk.to_csv(handle, header=idx == 0, index=False)
+
+
+def export_to_jsonl(data, output_path, chunk_rows: int = CHUNK_ROWS):
+    """
+    Export to JSON Lines (one object per row, UTF-8), appending each chunk as it arrives.
+
+    Args:
+        data (pd.DataFrame or iterable): The DataFrame, or an iterable of chunks.
+        output_path (str or Path): The output file path.
+        chunk_rows (int): Rows written at a time when ``data`` is a DataFrame.
+    """
+    with open(output_path, "w", encoding="utf-8") as handle:
+        for chunk in _iter_chunks(data, chunk_rows):
+            if len(chunk):
+                lines = chunk.to_json(orient="records", lines=True, force_ascii=False)
+                handle.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+# Export format name -> (file suffix, writer)
+EXPORT_FORMATS = {
+    "docx": (".docx", export_to_word),
+    "xlsx": (".xlsx", export_to_excel),
+    "parquet": (".parquet", export_to_parquet),
+    "arrow": (".arrows", export_to_arrow),
+    "csv": (".csv", export_to_csv),
+    "jsonl": (".jsonl", export_to_jsonl),
+}
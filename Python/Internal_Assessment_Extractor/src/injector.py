@@ -1,13 +1,182 @@
 """
 injector.py
 
-Provides a function to inject cleaned DataFrame data into a document template.
-This basic implementation locates a cell in a DOCX table by row and column index and
-modifies its value.
+Provides functions to inject cleaned DataFrame data into a document template.
+Values are written into DOCX table cells by table, row and column index, either
+one cell at a time or as a batch of edits (or a whole DataFrame mapped onto a
+table region) applied in a single load/save.
+
+Templates are parsed once and cached in memory keyed by path and modification
+time. Each fill gets a copy of the cached Document with its own deep copy of the
+document XML, so neither the zip nor any XML part is re-read and fills never
+share the body they edit.
 """
 
+import copy
+import logging
+import os
 from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+import pandas as pd
 from docx import Document
+from docx.opc.part import XmlPart
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+# Resolved template path -> (mtime_ns, size, pristine Document)
+_TEMPLATE_CACHE: Dict[str, tuple] = {}
+
+
+class CellEdit(NamedTuple):
+    """One value to write into a template table cell (0-based indices)."""
+    table: int
+    row: int
+    col: int
+    value: str
+
+
+def resolve_template(template_name) -> Path:
+    """
+    Return the path of a template: an absolute path as given, otherwise a file
+    in the 'templates' directory.
+
+    Raises:
+        FileNotFoundError: If the template does not exist.
+    """
+    template_path = Path(template_name)
+    if not template_path.is_absolute():
+        template_path = TEMPLATE_DIR / template_name
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template file not found: {template_path}")
+    return template_path
+
+
+def load_template(template_name):
+    """
+    Return a new python-docx Document for a template. The package is read and
+    parsed only when the file is new to the cache or has changed. Every call
+    returns a copy of the cached Document with its own deep copy of the document
+    part's XML, so the bodies of Documents returned for the same template are
+    independent and may be filled from different threads. The other XML parts
+    (styles, numbering, settings, ...) are shared with the cache and must not be
+    modified.
+    """
+    template_path = resolve_template(template_name)
+    key = str(template_path.resolve())
+    stat = os.stat(template_path)
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        logger.debug("Loading template %s", template_path)
+        cached = (stat.st_mtime_ns, stat.st_size, Document(str(template_path)))
+        _TEMPLATE_CACHE[key] = cached
+    pristine = cached[2]
+    # Seeding the memo with the other parts' elements shares them instead of copying
+    memo = {
+        id(part.element): part.element for part in pristine.part.package.iter_parts()
+        if isinstance(part, XmlPart) and part is not pristine.part
+    }
+    return copy.deepcopy(pristine, memo)
+
+
+def clear_template_cache() -> None:
+    """Drop all cached templates."""
+    _TEMPLATE_CACHE.clear()
+
+
+def apply_cell_edits(doc, edits: Iterable[Tuple[int, int, int, str]]) -> int:
+    """
+    Write (table, row, col, value) edits into a Document's tables.
+
+    Returns:
+        int: The number of cells written.
+
+    Raises:
+        ValueError: If the document has no tables.
+        IndexError: If an edit addresses a table or cell that does not exist.
+    """
+    tables = doc.tables
+    if not tables:
+        raise ValueError("No tables found in the template document.")
+    rows_by_table = {}
+    row_cells = {}
+    count = 0
+    for table_idx, row_idx, col_idx, value in edits:
+        if table_idx >= len(tables):
+            raise IndexError(f"Table {table_idx} does not exist in the template.")
+        rows = rows_by_table.get(table_idx)
+        if rows is None:
+            rows = rows_by_table[table_idx] = tables[table_idx].rows
+        if row_idx >= len(rows) or col_idx >= len(tables[table_idx].columns):
+            raise IndexError("Specified cell is out of table bounds.")
+        cells = row_cells.get((table_idx, row_idx))
+        if cells is None:
+            cells = row_cells[(table_idx, row_idx)] = rows[row_idx].cells
+        cells[col_idx].text = str(value)
+        count += 1
+    return count
+
+
+def inject_cells(template_name, edits: Iterable[Tuple[int, int, int, str]], output_path) -> int:
+    """
+    Apply many cell edits to a template with one load and one save.
+
+    Args:
+        template_name (str or Path): Template file name in 'templates', or an absolute path.
+        edits: (table, row, col, value) tuples or CellEdit records (0-based indices).
+        output_path (str or Path): Path to save the filled document.
+
+    Returns:
+        int: The number of cells written.
+    """
+    doc = load_template(template_name)
+    count = apply_cell_edits(doc, edits)
+    doc.save(str(output_path))
+    return count
+
+
+def dataframe_edits(df: pd.DataFrame, table_idx: int = 0, start_row: int = 0,
+                    start_col: int = 0, header: bool = False):
+    """
+    Yield the CellEdits that map a DataFrame onto a table region whose top-left
+    cell is (start_row, start_col). With ``header`` the column names fill the
+    first row of the region. Missing values are written as empty cells.
+    """
+    row_idx = start_row
+    if header:
+        for offset, column in enumerate(df.columns):
+            yield CellEdit(table_idx, row_idx, start_col + offset, str(column))
+        row_idx += 1
+    for values in df.itertuples(index=False, name=None):
+        for offset, value in enumerate(values):
+            yield CellEdit(
+                table_idx, row_idx, start_col + offset, "" if pd.isna(value) else str(value)
+            )
+        row_idx += 1
+
+
+def inject_dataframe(template_name, df: pd.DataFrame, output_path, table_idx: int = 0,
+                     start_row: int = 0, start_col: int = 0, header: bool = False) -> int:
+    """
+    Fill a table region of a template with a DataFrame in one load/save.
+
+    Args:
+        template_name (str or Path): Template file name in 'templates', or an absolute path.
+        df (pd.DataFrame): The values to write, row by row.
+        output_path (str or Path): Path to save the filled document.
+        table_idx (int): Index of the target table.
+        start_row (int): Table row of the region's first row.
+        start_col (int): Table column of the region's first column.
+        header (bool): Write the column names in the region's first row.
+
+    Returns:
+        int: The number of cells written.
+    """
+    edits = dataframe_edits(df, table_idx, start_row, start_col, header)
+    return inject_cells(template_name, edits, output_path)
+
 
 def inject_data_into_table_cell(
     template_name: str,
@@ -26,24 +195,7 @@ def inject_data_into_table_cell(
         new_value (str): The value to insert into the cell.
         output_path (str): Path to save the modified document.
     """
-    template_dir = Path(__file__).resolve().parent.parent / "templates"
-    template_path = template_dir / template_name
-
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template file not found: {template_path}")
-
-    doc = Document(str(template_path))
-    if not doc.tables:
-        raise ValueError("No tables found in the template document.")
-
-    table = doc.tables[0]
-    if row_idx >= len(table.rows) or col_idx >= len(table.columns):
-        raise IndexError("Specified cell is out of table bounds.")
-
-    cell = table.cell(row_idx, col_idx)
-    cell.text = new_value
-
-    doc.save(output_path)
+    inject_cells(template_name, [CellEdit(0, row_idx, col_idx, new_value)], output_path)
 
 # Example usage (uncomment to use directly):
 # inject_data_into_table_cell(
@@ -53,3 +205,9 @@ def inject_data_into_table_cell(
 #     new_value="Injected Value",
 #     output_path="output/injected_result.docx"
 # )
+#
+# Many cells in one load/save:
+# inject_dataframe(
+#     "assessment_template.docx", df[["Questions", "Answer"]],
+#     "output/answer_sheet.docx", start_row=1
+# )
@@ -0,0 +1,106 @@
+"""
+loader.py
+
+Reads exported question files back into DataFrames for downstream jobs such as
+building a question bank. Parquet and Arrow IPC exports are read column-wise
+(optionally only the requested columns); CSV, JSONL and Excel exports are
+supported for completeness. Hierarchy, style, type and marks columns come back
+as categoricals whatever the format.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from .exporter import EXPORT_FORMATS
+from .records import CATEGORY_COLUMNS
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+_CATEGORY_COLUMNS = {column.lower() for column in CATEGORY_COLUMNS}
+# Formats that can be read back, by file suffix
+LOADABLE_SUFFIXES = {
+    suffix: fmt for fmt, (suffix, _) in EXPORT_FORMATS.items() if fmt != "docx"
+}
+
+
+def _read_arrow(path, columns: Optional[List[str]]) -> pd.DataFrame:
+    """Read an Arrow IPC stream written by ``exporter.export_to_arrow``."""
+    if pa is None:
+        raise ImportError("Reading Arrow IPC exports requires pyarrow (pip install pyarrow)")
+    with pa.OSFile(str(path), "rb") as source:
+        table = pa.ipc.open_stream(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with its low-cardinality question columns as categoricals."""
+    to_category = [
+        column for column in df.columns
+        if str(column).lower() in _CATEGORY_COLUMNS
+        and not isinstance(df[column].dtype, pd.CategoricalDtype)
+    ]
+    if to_category:
+        df = df.astype({column: "category" for column in to_category})
+    return df
+
+
+def load_export(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load one exported file, choosing the reader by file suffix.
+
+    Args:
+        path (str or Path): A .parquet, .arrows, .csv, .jsonl or .xlsx export.
+        columns (list, optional): Only read these columns.
+
+    Returns:
+        pd.DataFrame: The exported rows (all sheets, for a split Excel export).
+    """
+    path = Path(path)
+    fmt = LOADABLE_SUFFIXES.get(path.suffix.lower())
+    if fmt == "parquet":
+        df = pd.read_parquet(path, columns=columns)
+    elif fmt == "arrow":
+        df = _read_arrow(path, columns)
+    elif fmt == "csv":
+        df = pd.read_csv(path, usecols=columns)
+    elif fmt == "jsonl":
+        df = pd.read_json(path, lines=True, dtype=False)
+        df = df if columns is None else df[columns]
+    elif fmt == "xlsx":
+        sheets = pd.read_excel(path, sheet_name=None, usecols=columns)
+        df = pd.concat(sheets.values(), ignore_index=True)
+    else:
+        raise ValueError(
+            f"Cannot load '{path.name}': expected one of {', '.join(LOADABLE_SUFFIXES)}"
+        )
+
+    return _categorize(df)
+
+
+def load_exports(paths: Iterable, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load and concatenate several exported files.
+
+    Args:
+        paths: Exported files, in any loadable format.
+        columns (list, optional): Only read these columns.
+
+    Returns:
+        pd.DataFrame: All rows, with a fresh RangeIndex.
+    """
+    frames = [load_export(path, columns) for path in paths]
+    logger.info("Loaded %d rows from %d exports.", sum(map(len, frames)), len(frames))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    # Frames with different categories concatenate to plain columns; re-encode them
+    return _categorize(pd.concat(frames, ignore_index=True))
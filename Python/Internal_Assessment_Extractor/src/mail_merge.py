@@ -0,0 +1,340 @@
+"""
+mail_merge.py
+
+Generates many filled documents from one DOCX template containing placeholder
+tokens such as ``{{Chapter}}`` or ``{{Questions}}``.
+
+The template is scanned once into a TemplateIndex recording, for every
+paragraph in the body (including table cells) that holds a placeholder, the
+location of the paragraph and how to rebuild each affected ``<w:t>`` from
+literal text and field values, so placeholders split across runs by Word are
+handled. The index also keeps the template package, compressed once, without
+its main document part. Rendering deep-copies the document XML, fills the
+indexed slots and writes that base package plus the new document part, so each
+output costs one copy and one small compression rather than a template re-parse
+and re-save. Many documents are rendered in the shared worker pool, each worker
+indexing the template once.
+
+A document is rendered from one record or, with ``group_by``, from a group of
+records: table rows holding placeholders are then repeated once per record,
+while placeholders elsewhere take the group's first record.
+"""
+
+import io
+import logging
+import os
+import re
+import zipfile
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from lxml import etree
+
+from .injector import load_template, resolve_template
+from .workers import WorkerPool, get_pool
+
+logger = logging.getLogger(__name__)
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_P = f"{{{W_NS}}}p"
+W_T = f"{{{W_NS}}}t"
+W_TR = f"{{{W_NS}}}tr"
+W_TBL = f"{{{W_NS}}}tbl"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+# Documents rendered per worker task
+DOCUMENTS_PER_TASK = 16
+
+# Template key -> TemplateIndex, per process
+_INDEXES: Dict[tuple, "TemplateIndex"] = {}
+
+
+class _Field(NamedTuple):
+    """A placeholder occurrence inside a text node plan."""
+    name: str
+
+
+class _Slot(NamedTuple):
+    """A paragraph with placeholders: its path and the new content of its text nodes."""
+    path: Tuple[int, ...]
+    plan: Tuple[Tuple[int, tuple], ...]
+
+
+class _RowBlock(NamedTuple):
+    """A table row with placeholders, repeated once per record of a group."""
+    path: Tuple[int, ...]
+    slots: Tuple[_Slot, ...]
+
+
+def _path(element, base) -> Tuple[int, ...]:
+    """Return the child-index path from ``base`` down to ``element``."""
+    path = []
+    while element is not base:
+        parent = element.getparent()
+        path.append(parent.index(element))
+        element = parent
+    return tuple(reversed(path))
+
+
+def _follow(base, path):
+    """Return the element at a child-index path below ``base``."""
+    for idx in path:
+        base = base[idx]
+    return base
+
+
+def _text_nodes(paragraph) -> List:
+    """Return the paragraph's own ``<w:t>`` elements (not those of nested text boxes)."""
+    return [
+        node for node in paragraph.iter(W_T)
+        if next(node.iterancestors(W_P)) is paragraph
+    ]
+
+
+def _plan_paragraph(paragraph):
+    """
+    Return (field names, plan) for a paragraph, or None if it has no placeholder.
+    The plan maps each affected text node index to its pieces: literal strings
+    and _Field references.
+    """
+    nodes = _text_nodes(paragraph)
+    texts = [node.text or "" for node in nodes]
+    full = "".join(texts)
+    if "{{" not in full:
+        return None
+    matches = list(PLACEHOLDER.finditer(full))
+    if not matches:
+        return None
+
+    plan = []
+    start = 0
+    for node_idx, text in enumerate(texts):
+        end = start + len(text)
+        overlapping = [m for m in matches if m.start() < end and m.end() > start]
+        if overlapping:
+            pieces = []
+            pos = start
+            for match in overlapping:
+                if match.start() > pos:
+                    pieces.append(full[pos:match.start()])
+                if match.start() >= start:
+                    pieces.append(_Field(match.group(1)))
+                pos = max(pos, min(match.end(), end))
+            if pos < end:
+                pieces.append(full[pos:end])
+            plan.append((node_idx, tuple(pieces)))
+        start = end
+    return {match.group(1) for match in matches}, tuple(plan)
+
+
+def _fill(paragraph, plan, values: Dict[str, str]) -> None:
+    """Rewrite a paragraph's planned text nodes with the record's values."""
+    nodes = _text_nodes(paragraph)
+    for node_idx, pieces in plan:
+        text = "".join(
+            values.get(piece.name, "") if isinstance(piece, _Field) else piece
+            for piece in pieces
+        )
+        node = nodes[node_idx]
+        node.text = text
+        if text != text.strip():
+            node.set(XML_SPACE, "preserve")
+
+
+def _base_package(doc) -> Tuple[str, bytes]:
+    """
+    Return the main document part name and the template package as zip bytes
+    without that part, so filled copies only need the part appended.
+    """
+    part_name = doc.part.partname.lstrip("/")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    base = io.BytesIO()
+    with zipfile.ZipFile(buffer) as source, \
+            zipfile.ZipFile(base, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            if info.filename != part_name:
+                target.writestr(info, source.read(info), zipfile.ZIP_DEFLATED)
+    return part_name, base.getvalue()
+
+
+class TemplateIndex:
+    """
+    Placeholder index of a DOCX template's body, built from one scan.
+
+    Args:
+        template_name (str or Path): Template file name in 'templates', or an absolute path.
+    """
+
+    def __init__(self, template_name):
+        self.template_path = resolve_template(template_name)
+        doc = load_template(self.template_path)
+        root = self._pristine = doc.element
+        self._part_name, self._base_package = _base_package(doc)
+        self.fields = set()
+        # (document position, _Slot or _RowBlock), top-level items only
+        items = []
+        blocks: Dict[object, list] = {}
+        positions = {element: idx for idx, element in enumerate(root.iter())}
+        for paragraph in root.iter(W_P):
+            planned = _plan_paragraph(paragraph)
+            if planned is None:
+                continue
+            names, plan = planned
+            self.fields.update(names)
+            row = next(paragraph.iterancestors(W_TR), None)
+            # Only innermost rows (without nested tables) repeat
+            if row is not None and row.find(f".//{W_TBL}") is None:
+                blocks.setdefault(row, []).append(_Slot(_path(paragraph, row), plan))
+            else:
+                items.append((positions[paragraph], _Slot(_path(paragraph, root), plan)))
+        for row, slots in blocks.items():
+            items.append((positions[row], _RowBlock(_path(row, root), tuple(slots))))
+        # Filled last to first, so row insertions never shift a pending path
+        self._items = [item for _, item in sorted(items, key=lambda entry: -entry[0])]
+        logger.debug(
+            "Indexed %s: %d fields in %d slots", self.template_path.name,
+            len(self.fields), len(self._items)
+        )
+
+    def render(self, records: List[Dict[str, str]], output_path) -> None:
+        """
+        Fill the template with one record (or a group of records) and save it.
+
+        Args:
+            records (list): Field name -> text mappings; table rows with
+                placeholders are repeated once per record.
+            output_path (str or Path): Where to save the document.
+        """
+        root = deepcopy(self._pristine)
+        first = records[0] if records else {}
+        for item in self._items:
+            if isinstance(item, _Slot):
+                _fill(_follow(root, item.path), item.plan, first)
+                continue
+            row = _follow(root, item.path)
+            pristine = deepcopy(row)
+            for record_idx, record in enumerate(records or [first]):
+                target = row if record_idx == 0 else deepcopy(pristine)
+                for slot in item.slots:
+                    _fill(_follow(target, slot.path), slot.plan, record)
+                if record_idx:
+                    row.addnext(target)
+                    row = target
+        xml = etree.tostring(root, encoding="UTF-8", standalone=True)
+        with open(output_path, "wb") as handle:
+            handle.write(self._base_package)
+        with zipfile.ZipFile(output_path, "a", zipfile.ZIP_DEFLATED) as package:
+            package.writestr(self._part_name, xml)
+
+
+def template_index(template_name) -> TemplateIndex:
+    """Return this process's TemplateIndex for a template, rebuilt if the file changed."""
+    template_path = resolve_template(template_name)
+    stat = os.stat(template_path)
+    key = (str(template_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    index = _INDEXES.get(key)
+    if index is None:
+        index = _INDEXES[key] = TemplateIndex(template_path)
+    return index
+
+
+def _render_batch(template_path, jobs) -> int:
+    """Render (output path, records) jobs in this process; used by worker tasks."""
+    index = template_index(template_path)
+    for output_path, records in jobs:
+        index.render(records, output_path)
+    return len(jobs)
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, str]]:
+    """Return a frame's rows as field -> text mappings, missing values as ''."""
+    text = df.astype(object).where(df.notna(), "")
+    return [
+        {str(key): str(value) for key, value in row.items()}
+        for row in text.to_dict(orient="records")
+    ]
+
+
+def _safe_filename(name: str) -> str:
+    """Replace characters that are not allowed in file names."""
+    return _INVALID_FILENAME_CHARS.sub("_", name).strip() or "_"
+
+
+def _render_batches(pool: WorkerPool, template_path: Path, batches) -> None:
+    """Render batches of (output path, records) jobs in ``pool``'s workers."""
+    futures = [pool.submit(_render_batch, template_path, batch) for batch in batches]
+    for future in futures:
+        future.result()
+
+
+def render_documents(template_name, df: pd.DataFrame, output_dir,
+                     filename: str = "{index:05d}.docx", group_by: Optional[str] = None,
+                     workers: Optional[int] = None, strict: bool = True) -> List[Path]:
+    """
+    Render one document per row of ``df`` (or per ``group_by`` value) from a template.
+
+    Args:
+        template_name (str or Path): Template file name in 'templates', or an absolute path.
+        df (pd.DataFrame): Values for the placeholders, one column per field.
+        output_dir (str or Path): Folder for the generated documents.
+        filename (str): Format string for file names; ``index`` is the document
+            number (even if ``df`` has an ``index`` column) and the first record's
+            fields are available by name, e.g. "{Chapter}.docx".
+        group_by (str, optional): Column to group rows by; each group becomes one
+            document with placeholder table rows repeated per record.
+        workers (int, optional): Processes to render in. 1 renders in this process,
+            N > 1 in a pool of N workers started for this call, and None in the
+            shared worker pool.
+        strict (bool): Raise if the template uses fields that ``df`` lacks
+            (otherwise they render empty).
+
+    Returns:
+        list: Paths of the generated documents, in order.
+    """
+    index = template_index(template_name)
+    missing = sorted(index.fields - {str(column) for column in df.columns})
+    if missing and strict:
+        raise ValueError(f"Template fields missing from the data: {', '.join(missing)}")
+
+    if group_by is None:
+        groups = [[record] for record in _records(df)]
+    else:
+        groups = [
+            _records(group)
+            for _, group in df.groupby(group_by, sort=False, observed=True, dropna=False)
+        ]
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for doc_idx, records in enumerate(groups):
+        name = _safe_filename(filename.format_map({**records[0], "index": doc_idx}))
+        jobs.append((output_dir / name, records))
+    names = [path.name for path, _ in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"File name pattern '{filename}' gives duplicate names")
+
+    if workers == 1 or len(jobs) <= DOCUMENTS_PER_TASK:
+        _render_batch(index.template_path, jobs)
+    else:
+        batches = [
+            jobs[start:start + DOCUMENTS_PER_TASK]
+            for start in range(0, len(jobs), DOCUMENTS_PER_TASK)
+        ]
+        if workers is None:
+            _render_batches(get_pool(), index.template_path, batches)
+        else:
+            with WorkerPool(min(workers, len(batches))) as pool:
+                _render_batches(pool, index.template_path, batches)
+    logger.info("Rendered %d documents into %s", len(jobs), output_dir)
+    return [path for path, _ in jobs]
+
+
+def find_placeholders(template_name) -> Iterable[str]:
+    """Return the sorted field names used by a template's placeholders."""
+    return sorted(template_index(template_name).fields)
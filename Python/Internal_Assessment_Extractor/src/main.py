@@ -4,15 +4,25 @@ main.py
 Entry point for running the assessment extractor workflow.
 """
 
+import argparse
 import logging
+import os
 import time
 import sys
+from concurrent.futures import as_completed
 from pathlib import Path
 from dataclasses import dataclass
-from .doc_parser import parse_document
-from .analysis import summarize_dataframe
-from .exporter import export_to_word, export_to_excel
-from .cleaner import clean_data
+from .doc_parser import ENGINES
+from .parse_cache import DEFAULT_MAX_BYTES
+from .manifest import BatchManifest, pipeline_version
+from .metrics import METRICS_FORMATS, write_metrics
+from .exporter import EXPORT_FORMATS
+from .pipeline import (
+    DEFAULT_FORMATS, STAGES, FileResult, PipelineOptions, dedup_index, process_file
+)
+from .staged import DEFAULT_QUEUE_SIZE, STAGE_NAMES, run_staged
+from .watch import DEFAULT_POLL_SECONDS, DEFAULT_SETTLE_SECONDS, watch
+from . import workers as worker_pool
 
 logging.basicConfig(level=logging.INFO)
 
@@ -42,67 +52,375 @@ def print_progress(progress: ProgressInfo):
     )
     sys.stdout.flush()
 
-def main():
+def parse_args(argv=None):
+    """
+    Parse command-line options for the batch workflow.
+    """
+    parser = argparse.ArgumentParser(
+        description="Extract assessment questions from every DOCX file in the input folder."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="docx",
+        help="Parsing engine: python-docx object model or streaming lxml reader."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Cache parsed documents here, keyed by file content and parser version."
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Size budget of the parse cache in MiB (least recently used entries are evicted)."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip inputs whose outputs in output/manifest.json are up to date."
+    )
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        nargs="+",
+        choices=list(EXPORT_FORMATS),
+        default=list(DEFAULT_FORMATS),
+        help="Output formats to write for each input (parquet and arrow need pyarrow)."
+    )
+    parser.add_argument(
+        "--excel-split-by",
+        default=None,
+        metavar="COLUMN",
+        help="Write one Excel sheet per value of this cleaned column (e.g. chapter)."
+    )
+    parser.add_argument(
+        "--dedup-index",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Add canonical question ids from this corpus dedup index, growing and saving it."
+    )
+    parser.add_argument(
+        "--bank",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Also store every file's questions in this SQLite question bank (see question_bank)."
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write per-file, per-stage timings, memory and counters here (.json or .csv)."
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record each stage's peak Python allocations with tracemalloc (slower)."
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Profile every stage with cProfile, writing <file>.<stage>.prof files here."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process files in N worker processes (0 = one per CPU core)."
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Run Parsing, Cleaning and Exporting as concurrent stages joined by bounded queues."
+    )
+    parser.add_argument(
+        "--stage-workers",
+        type=int,
+        nargs=3,
+        default=[1, 1, 1],
+        metavar=("PARSE", "CLEAN", "EXPORT"),
+        help="Worker threads of the Parsing, Cleaning and Exporting stages (with --staged)."
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Files that may wait between two stages before the earlier one blocks (--staged)."
+    )
+    parser.add_argument(
+        "--max-in-flight-mb",
+        type=int,
+        default=0,
+        help="Pause parsing while parsed frames not yet exported exceed this many MiB "
+             "(--staged; 0 = no cap)."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and process DOCX files as they are added to or changed in input/."
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=DEFAULT_POLL_SECONDS,
+        help="Seconds between scans of the input folder (--watch)."
+    )
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="Seconds a file must stay unchanged before it is processed (--watch)."
+    )
+    parser.add_argument(
+        "--start-method",
+        choices=("fork", "spawn", "forkserver"),
+        default=None,
+        help="Multiprocessing start method of the worker pool (default: platform default)."
+    )
+    args = parser.parse_args(argv)
+    if args.metrics is not None and args.metrics.suffix.lower() not in METRICS_FORMATS:
+        parser.error(f"--metrics must end in {' or '.join(METRICS_FORMATS)}")
+    if args.staged and args.workers != 1:
+        parser.error("--staged runs stages in threads of one process; it cannot use --workers")
+    if args.watch and args.staged:
+        parser.error("--watch processes each file in a warm worker; it cannot use --staged")
+    return args
+
+def run_serial(docx_files, options, manifest=None):
+    """
+    Process files one at a time in this process, reporting progress per stage.
+
+    Returns:
+        tuple: (list of FileResult, number of files skipped as up to date).
+    """
+    total_files = len(docx_files)
+    total_stages = len(STAGES)
+    start_time = time.time()
+    results = []
+    skipped = 0
+    for file_idx, doc_path in enumerate(docx_files, 1):
+        if manifest is not None and manifest.is_current(doc_path):
+            skipped += 1
+            logging.info("Up to date, skipping: %s", doc_path)
+            continue
+        logging.info("Processing: %s", doc_path)
+
+        def report(stage_idx, stage, file_idx=file_idx):
+            # Elapsed time is taken when each stage starts, not once per file
+            print_progress(ProgressInfo(
+                file_idx, total_files, stage_idx, total_stages, stage,
+                time.time() - start_time
+            ))
+
+        result = process_file(doc_path, options, report)
+        _record_result(result, manifest)
+        results.append(result)
+        # Completed this file
+        report(total_stages, "Completed")
+    return results, skipped
+
+def run_parallel(docx_files, options, manifest=None):
+    """
+    Process files in the shared worker pool. Each worker runs the whole per-file
+    workflow and returns only a FileResult; progress counts finished files.
+
+    Returns:
+        tuple: (list of FileResult, number of files skipped as up to date).
+    """
+    total_files = len(docx_files)
+    total_stages = len(STAGES)
+    start_time = time.time()
+    pending = []
+    for doc_path in docx_files:
+        if manifest is not None and manifest.is_current(doc_path):
+            logging.info("Up to date, skipping: %s", doc_path)
+        else:
+            pending.append(doc_path)
+    skipped = total_files - len(pending)
+    done = skipped
+    results = []
+    pool = worker_pool.get_pool()
+    futures = {pool.submit(process_file, doc_path, options): doc_path for doc_path in pending}
+    for future in as_completed(futures):
+        try:
+            result = future.result()
+        except Exception as exc:  # pylint: disable=broad-except
+            # The worker itself died (e.g. out of memory); only this file is lost
+            logging.error("Worker failed on %s: %s", futures[future], exc)
+            result = FileResult(futures[future], error=f"{type(exc).__name__}: {exc}")
+        _record_result(result, manifest)
+        results.append(result)
+        done += 1
+        print_progress(ProgressInfo(
+            done, total_files, total_stages, total_stages,
+            f"Completed {result.doc_path.name}", time.time() - start_time
+        ))
+    return results, skipped
+
+def run_pipelined(docx_files, options, args, manifest=None):
+    """
+    Process files with the staged runner (see ``staged.py``): exporting one file
+    overlaps with parsing the next. Progress counts finished files.
+
+    Returns:
+        tuple: (list of FileResult, number of files skipped as up to date).
+    """
+    total_files = len(docx_files)
+    total_stages = len(STAGES)
+    start_time = time.time()
+    pending = []
+    for doc_path in docx_files:
+        if manifest is not None and manifest.is_current(doc_path):
+            logging.info("Up to date, skipping: %s", doc_path)
+        else:
+            pending.append(doc_path)
+    skipped = total_files - len(pending)
+    done = skipped
+    logging.info(
+        "Staged run: %s worker(s), queues of %d",
+        ", ".join(f"{name} {count}" for name, count in zip(STAGE_NAMES, args.stage_workers)),
+        args.queue_size
+    )
+
+    def finished(result):
+        nonlocal done
+        _record_result(result, manifest)
+        done += 1
+        print_progress(ProgressInfo(
+            done, total_files, total_stages, total_stages,
+            f"Completed {result.doc_path.name}", time.time() - start_time
+        ))
+
+    results = run_staged(
+        pending, options, args.stage_workers, args.queue_size,
+        args.max_in_flight_mb * 1024 * 1024, on_result=finished
+    )
+    return results, skipped
+
+def run_watch(input_dir, options, args, workers, manifest):
+    """
+    Watch the input folder until interrupted (see ``watch.py``), then write the
+    metrics of the processed files if requested.
+    """
+    results = []
+    watch(
+        input_dir, options, manifest, workers, args.poll_seconds, args.settle_seconds,
+        args.start_method, on_result=results.append if args.metrics is not None else None
+    )
+    if args.metrics is not None:
+        _write_metrics(results, args.metrics)
+
+def _record_result(result: FileResult, manifest=None):
+    """Add a successful file's artifacts to the manifest, if one is kept."""
+    if result.ok and manifest is not None:
+        manifest.record(result.doc_path, result.input_info, result.artifacts)
+
+def _write_metrics(results, path):
+    """Save the batch's per-file metrics and log the slowest file."""
+    metrics = [result.metrics for result in results if result.metrics is not None]
+    write_metrics(metrics, path)
+    logging.info("Wrote metrics for %d files to %s", len(metrics), path)
+    if metrics:
+        slowest = max(metrics, key=lambda item: item.wall_seconds)
+        stage = max(slowest.stages, key=lambda item: item.wall_seconds, default=None)
+        logging.info(
+            "Slowest file: %s (%.2fs%s)", Path(slowest.file).name, slowest.wall_seconds,
+            f", mostly {stage.stage} {stage.wall_seconds:.2f}s" if stage else ""
+        )
+
+def main(argv=None):
     """
     Main workflow for processing assessment documents.
     """
+    args = parse_args(argv)
+
     script_dir = Path(__file__).resolve().parent.parent
     input_dir = script_dir / "input"
     input_dir.mkdir(exist_ok=True)
 
     docx_files = list(input_dir.glob("*.docx"))
     total_files = len(docx_files)
-    if not docx_files:
+    if not docx_files and not args.watch:
         logging.error("No DOCX files found in %s", input_dir)
         return
 
     output_dir = script_dir / "output"
     output_dir.mkdir(exist_ok=True)
+    manifest = None
+    if args.incremental or args.watch:
+        # Watch mode always keeps the manifest, so a restart skips finished files
+        manifest = BatchManifest(output_dir, pipeline_version(
+            args.engine, args.excel_split_by, args.dedup_index is not None,
+            args.bank, *args.formats
+        ))
+    options = PipelineOptions(
+        output_dir,
+        engine=args.engine,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        record_input=manifest is not None,
+        excel_split_by=args.excel_split_by,
+        formats=tuple(dict.fromkeys(args.formats)),
+        dedup_index=args.dedup_index,
+        question_bank=args.bank,
+        trace_memory=args.trace_memory,
+        profile_dir=args.profile_dir,
+    )
+    if args.staged and args.trace_memory:
+        # tracemalloc is process-wide, so concurrent stages would share one trace
+        logging.warning("--trace-memory needs stages to run one at a time; ignoring it.")
+        options.trace_memory = False
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    if workers > 1 and args.dedup_index is not None:
+        # The index is grown file by file, so it must live in one process
+        logging.warning("--dedup-index processes files serially; ignoring --workers.")
+        workers = 1
 
-    stages = ["Parsing", "Summarizing", "Cleaning", "Exporting"]
-    total_stages = len(stages)
-    start_time = time.time()
-
-    for file_idx, doc_path in enumerate(docx_files, 1):
-        logging.info("Processing: %s", doc_path)
-        try:
-            elapsed = time.time() - start_time
-
-            # Parsing
-            print_progress(
-                ProgressInfo(file_idx, total_files, 0, total_stages, stages[0], elapsed)
-            )
-            df = parse_document(str(doc_path))
-
-            # Summarizing
-            print_progress(
-                ProgressInfo(file_idx, total_files, 1, total_stages, stages[1], elapsed)
-            )
-            summarize_dataframe(df)
-
-            # Cleaning
-            print_progress(
-                ProgressInfo(file_idx, total_files, 2, total_stages, stages[2], elapsed)
-            )
-            df = clean_data(df)
-
-            # Exporting
-            print_progress(
-                ProgressInfo(file_idx, total_files, 3, total_stages, stages[3], elapsed)
-            )
-            export_to_word(df, output_dir / f"{doc_path.stem}_cleaned.docx")
-            export_to_excel(df, output_dir / f"{doc_path.stem}_cleaned.xlsx")
-
-            # Completed this file
-            print_progress(
-                ProgressInfo(file_idx, total_files, 4, total_stages, "Completed", elapsed)
-            )
+    if args.watch:
+        run_watch(input_dir, options, args, workers, manifest)
+        return
 
-        except Exception as exc:  # pylint: disable=broad-except
-            logging.error("Failed to process %s: %s", doc_path, exc)
+    start_time = time.time()
+    if args.staged:
+        results, skipped = run_pipelined(docx_files, options, args, manifest)
+    elif workers > 1:
+        worker_pool.configure(min(workers, total_files), args.start_method).warm_up()
+        results, skipped = run_parallel(docx_files, options, manifest)
+        worker_pool.shutdown()
+    else:
+        results, skipped = run_serial(docx_files, options, manifest)
+    index = dedup_index(options)
+    if index is not None:
+        logging.info(
+            "Dedup index: %d canonical questions (%d exact, %d near duplicates this run)",
+            len(index), index.exact_hits, index.near_hits
+        )
+        index.save()
 
     elapsed = time.time() - start_time
     print(f"\nAll files processed in {elapsed:.2f} seconds.")
+    failed = [result for result in results if not result.ok]
+    if failed:
+        logging.error(
+            "%d of %d files failed: %s", len(failed), total_files,
+            ", ".join(result.doc_path.name for result in failed)
+        )
+    if manifest is not None:
+        logging.info("Incremental run: %d of %d files up to date.", skipped, total_files)
+    if args.metrics is not None:
+        _write_metrics(results, args.metrics)
+    if args.cache_dir is not None:
+        lookups = [result.cache_hit for result in results if result.cache_hit is not None]
+        logging.info(
+            "Parse cache: %d hits, %d misses", sum(lookups), len(lookups) - sum(lookups)
+        )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,132 @@
+"""
+manifest.py
+
+Tracks which input documents have already been processed so that an incremental
+batch only reprocesses new or changed files.
+
+The manifest lives in the output folder as JSON and records, per input file, its
+size, modification time and SHA-256, the pipeline version that processed it and
+the artifacts produced. It is rewritten after every completed file, so a batch
+that stops part-way resumes from the last completed file.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .parse_cache import PARSER_MODULES, file_sha256, source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+# Modules whose source determines the exported artifacts
+PIPELINE_MODULES = PARSER_MODULES + (
+    "cleaner.py", "dedup.py", "exporter.py", "pipeline.py", "question_bank.py",
+)
+
+
+def pipeline_version(*options) -> str:
+    """
+    Return the fingerprint of the pipeline code plus any output-affecting options.
+    """
+    return source_fingerprint(PIPELINE_MODULES, options)
+
+
+class BatchManifest:
+    """
+    Manifest of processed inputs and their artifacts in ``output_dir``.
+
+    Args:
+        output_dir (str or Path): Folder holding the artifacts and the manifest.
+        version (str): Pipeline version; entries made by another version are stale.
+    """
+
+    def __init__(self, output_dir, version: str):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self.version = version
+        self.entries: Dict[str, dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Read the manifest from disk, starting empty if it is missing or unreadable."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable manifest %s: %s", self.path, exc)
+            return
+        if data.get("format") == MANIFEST_FORMAT:
+            self.entries = data.get("files", {})
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        payload = {"format": MANIFEST_FORMAT, "files": self.entries}
+        fd, tmp_name = tempfile.mkstemp(dir=self.output_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, indent=2, sort_keys=True)
+            os.replace(tmp_name, self.path)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+    @staticmethod
+    def stat_input(doc_path, sha256: Optional[str] = None) -> dict:
+        """Return the size, mtime and SHA-256 of an input file."""
+        stat = os.stat(doc_path)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256 or file_sha256(doc_path),
+        }
+
+    def is_current(self, doc_path) -> bool:
+        """
+        Return True if ``doc_path`` was processed by this pipeline version and all
+        of its artifacts are still present. A file whose timestamp changed but
+        whose content did not is treated as current.
+        """
+        entry = self.entries.get(Path(doc_path).name)
+        if entry is None or entry.get("pipeline_version") != self.version:
+            return False
+        for artifact in entry.get("artifacts", []):
+            artifact_path = self.output_dir / artifact["name"]
+            if not artifact_path.exists() or artifact_path.stat().st_size != artifact["size"]:
+                return False
+
+        stat = os.stat(doc_path)
+        recorded = entry["input"]
+        if stat.st_size != recorded["size"]:
+            return False
+        if stat.st_mtime_ns == recorded["mtime_ns"]:
+            return True
+        if file_sha256(doc_path) != recorded["sha256"]:
+            return False
+        recorded["mtime_ns"] = stat.st_mtime_ns
+        self.save()
+        return True
+
+    def record(self, doc_path, input_info: dict, artifacts: Iterable) -> None:
+        """
+        Record a completed file and its artifacts, then save the manifest.
+
+        Args:
+            doc_path: The processed input file.
+            input_info (dict): ``stat_input`` taken before processing started.
+            artifacts: Paths of the files produced for this input.
+        """
+        self.entries[Path(doc_path).name] = {
+            "input": input_info,
+            "pipeline_version": self.version,
+            "artifacts": [
+                {"name": Path(artifact).name, "size": Path(artifact).stat().st_size}
+                for artifact in artifacts
+            ],
+        }
+        self.save()
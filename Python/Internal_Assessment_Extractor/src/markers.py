@@ -0,0 +1,130 @@
+"""
+markers.py
+
+Single-pass scanner for the instructional markers that delimit questions and
+answers in facilitator guides ("ASK participants:", "ANSWER:", "CONCEPT CHECK", ...).
+
+All markers are compiled into one alternation of lower-cased literals, longest
+first, and found with a single left-to-right pass over the lower-cased text (plain
+literal alternations let the regex engine skip ahead far faster than capturing or
+IGNORECASE patterns). A marker that contains another (e.g.
+"CHALLENGES CONCEPT CHECK" contains "CONCEPT CHECK") reports the embedded marker
+too, the way output links do in an Aho-Corasick automaton.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+DEFAULT_MARKERS = {
+    "ask": "ASK participants:",
+    "answer": "ANSWER:",
+    "concept_check": "CONCEPT CHECK",
+    "challenges_concept_check": "CHALLENGES CONCEPT CHECK",
+    "display": "DISPLAY the question below on the PowerPoint Presentation.",
+    "multiple_choice": "MULTIPLE CHOICE QUESTIONS",
+}
+
+
+class MarkerHit(NamedTuple):
+    """One marker occurrence: its vocabulary name and [start, end) offsets."""
+    name: str
+    start: int
+    end: int
+
+
+class Segment(NamedTuple):
+    """Text following a marker, up to the next marker or the end of the text."""
+    name: str
+    start: int
+    end: int
+
+
+class MarkerScanner:
+    """
+    Finds every marker of a vocabulary in one pass over a text.
+
+    Args:
+        markers (dict, optional): Mapping of marker name to literal marker text.
+            Matching is case-insensitive. Defaults to DEFAULT_MARKERS; the "ask",
+            "answer" and "concept_check" names used by doc_parser fall back to
+            their defaults when omitted.
+    """
+
+    def __init__(self, markers: Optional[Dict[str, str]] = None):
+        self.markers = dict(DEFAULT_MARKERS if markers is None else markers)
+        for name in ("ask", "answer", "concept_check"):
+            self.markers.setdefault(name, DEFAULT_MARKERS[name])
+        names = sorted(self.markers, key=lambda name: -len(self.markers[name]))
+        self._by_text = {self.markers[name].lower(): name for name in names}
+        # Lower-cased ASK / ANSWER / CONCEPT CHECK literals for per-paragraph tests
+        self.qa_literals = tuple(
+            self.markers[name].lower() for name in ("ask", "answer", "concept_check")
+        )
+        alternation = "|".join(re.escape(self.markers[name].lower()) for name in names)
+        self._pattern = re.compile(alternation)
+        # Used when lower-casing changes the text length (e.g. dotted capital I)
+        self._fallback = re.compile(alternation, re.IGNORECASE)
+        # Markers embedded in a longer marker: name -> [(embedded name, offset, length)]
+        self._links = {name: [] for name in names}
+        for outer in names:
+            outer_text = self.markers[outer].lower()
+            for inner in names:
+                inner_text = self.markers[inner].lower()
+                if inner == outer or len(inner_text) >= len(outer_text):
+                    continue
+                offset = outer_text.find(inner_text)
+                while offset != -1:
+                    self._links[outer].append((inner, offset, len(inner_text)))
+                    offset = outer_text.find(inner_text, offset + 1)
+
+    def _matches(self, text: str):
+        """Return an iterator of matches and whether their text must be lower-cased."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return self._pattern.finditer(lowered), False
+        return self._fallback.finditer(text), True
+
+    def scan(self, text: str) -> List[MarkerHit]:
+        """
+        Return every marker occurrence in ``text``, ordered by start offset.
+        """
+        matches, fold = self._matches(text)
+        by_text, links = self._by_text, self._links
+        hits = []
+        linked = False
+        for match in matches:
+            name = by_text[match.group().lower() if fold else match.group()]
+            start, end = match.span()
+            hits.append(MarkerHit(name, start, end))
+            if links[name]:
+                linked = True
+                for inner, offset, length in links[name]:
+                    hits.append(MarkerHit(inner, start + offset, start + offset + length))
+        if linked:
+            hits.sort(key=lambda hit: hit.start)
+        return hits
+
+    def segments(self, text: str) -> List[Segment]:
+        """
+        Split ``text`` into the segments introduced by each marker. Markers
+        embedded in a longer marker do not start a segment of their own.
+        """
+        matches, fold = self._matches(text)
+        primary = list(matches)
+        result = []
+        for idx, match in enumerate(primary):
+            name = self._by_text[match.group().lower() if fold else match.group()]
+            end = primary[idx + 1].start() if idx + 1 < len(primary) else len(text)
+            result.append(Segment(name, match.end(), end))
+        return result
+
+    @staticmethod
+    def first(hits: List[MarkerHit], name: str, start: int = 0) -> Optional[MarkerHit]:
+        """Return the first hit of ``name`` at or after offset ``start``, or None."""
+        for hit in hits:
+            if hit.name == name and hit.start >= start:
+                return hit
+        return None
+
+
+DEFAULT_SCANNER = MarkerScanner()
@@ -0,0 +1,179 @@
+"""
+metrics.py
+
+Per-file, per-stage instrumentation of the pipeline.
+
+A StageRecorder measures each stage of one file: wall time, the CPU time of the
+thread running it, the process's peak resident memory after the stage and how
+much the stage raised it. Optionally it also traces Python allocations with
+``tracemalloc`` (peak per stage) and profiles each stage with ``cProfile``,
+writing one ``.prof`` file per file and stage. Counters (paragraphs and cells
+visited, Q&A found, duplicates dropped, ...) are collected alongside. The
+resulting FileMetrics are small and picklable, so worker processes send them
+back with their FileResult, and ``write_metrics`` saves a batch's metrics as
+JSON or CSV.
+"""
+
+import cProfile
+import csv
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+METRICS_FORMATS = (".json", ".csv")
+# ru_maxrss is reported in bytes on macOS and KiB elsewhere
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_mib() -> Optional[float]:
+    """Return this process's peak resident memory in MiB, or None if unavailable."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT / (1024 * 1024)
+
+
+@dataclass
+class StageMetrics:
+    """Measurements of one pipeline stage for one file."""
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mib: Optional[float] = None
+    rss_growth_mib: Optional[float] = None
+    traced_peak_mib: Optional[float] = None
+
+
+@dataclass
+class FileMetrics:
+    """Stage measurements and counters of one processed file."""
+    file: str
+    stages: List[StageMetrics] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def wall_seconds(self) -> float:
+        """Total wall time of the measured stages."""
+        return sum(stage.wall_seconds for stage in self.stages)
+
+    def to_dict(self) -> dict:
+        """Return the metrics as plain JSON-serializable data, with totals."""
+        data = asdict(self)
+        data["wall_seconds"] = round(self.wall_seconds, 6)
+        data["cpu_seconds"] = round(sum(stage.cpu_seconds for stage in self.stages), 6)
+        return data
+
+
+class StageRecorder:
+    """
+    Records the stages of one file into a FileMetrics.
+
+    Args:
+        file (str or Path): The file being processed.
+        progress (callable, optional): Called with (stage index, stage name) as each stage starts.
+        trace_memory (bool): Trace Python allocations per stage (slows processing).
+        profile_dir (str or Path, optional): Write a cProfile ``.prof`` file per stage here.
+    """
+
+    def __init__(self, file, progress: Optional[Callable[[int, str], None]] = None,
+                 trace_memory: bool = False, profile_dir=None):
+        self.path = Path(file)
+        self.metrics = FileMetrics(str(file))
+        self.progress = progress
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """The file's counters, for stages to increment."""
+        return self.metrics.counters
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as stage ``name``."""
+        if self.progress is not None:
+            self.progress(len(self.metrics.stages), name)
+        result = StageMetrics(name)
+        profiler = cProfile.Profile() if self.profile_dir is not None else None
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        rss_before = peak_rss_mib()
+        # Thread CPU time, so concurrent stages (see staged.py) are not charged for each other
+        wall, cpu = time.perf_counter(), time.thread_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield result
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            result.wall_seconds = round(time.perf_counter() - wall, 6)
+            result.cpu_seconds = round(time.thread_time() - cpu, 6)
+            if tracing:
+                result.traced_peak_mib = round(
+                    tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3
+                )
+                tracemalloc.stop()
+            rss_after = peak_rss_mib()
+            if rss_after is not None:
+                result.peak_rss_mib = round(rss_after, 3)
+                result.rss_growth_mib = round(rss_after - rss_before, 3)
+            if profiler is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(self.profile_dir / f"{self.path.stem}.{name}.prof"))
+            self.metrics.stages.append(result)
+
+
+def write_metrics(metrics: Iterable[FileMetrics], path) -> Path:
+    """
+    Write a batch's metrics to ``path``: JSON (one object per file, with its stages,
+    counters and totals) or CSV (one row per file and stage, then a "Total" row per
+    file carrying the counters), chosen by suffix.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    metrics = list(metrics)
+    if path.suffix.lower() not in METRICS_FORMATS:
+        raise ValueError(
+            f"Unsupported metrics file '{path.name}': expected one of {', '.join(METRICS_FORMATS)}"
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".json":
+        data = {"files": [item.to_dict() for item in metrics]}
+        path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        return path
+
+    stage_fields = list(StageMetrics.__dataclass_fields__)
+    counter_fields = sorted({name for item in metrics for name in item.counters})
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, ["file"] + stage_fields + counter_fields)
+        writer.writeheader()
+        for item in metrics:
+            for stage in item.stages:
+                writer.writerow({"file": item.file, **asdict(stage)})
+            totals = item.to_dict()
+            writer.writerow({
+                "file": item.file, "stage": "Total",
+                "wall_seconds": totals["wall_seconds"], "cpu_seconds": totals["cpu_seconds"],
+                "peak_rss_mib": max(
+                    (stage.peak_rss_mib for stage in item.stages
+                     if stage.peak_rss_mib is not None), default=None
+                ),
+                **item.counters,
+            })
+    return path
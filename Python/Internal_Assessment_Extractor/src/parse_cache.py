@@ -0,0 +1,169 @@
+"""
+parse_cache.py
+
+Content-addressed on-disk cache for ``doc_parser.parse_document`` results.
+
+Entries are keyed by the SHA-256 of the DOCX bytes plus a fingerprint of the
+parsing code, so editing the parser invalidates every entry automatically. Frames
+are stored as Parquet when pyarrow is installed (pickle otherwise) and the cache
+is kept under a size budget by evicting the least recently used entries.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from .doc_parser import parse_document
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401  pylint: disable=unused-import
+    CACHE_FORMAT = "parquet"
+except ImportError:
+    CACHE_FORMAT = "pickle"
+
+# Modules whose source determines the rows parse_document produces
+PARSER_MODULES = (
+    "doc_parser.py", "docx_stream.py", "markers.py", "records.py", "style_index.py",
+    "tables.py",
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path) -> str:
+    """
+    Return the hex SHA-256 digest of a file's bytes, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(module_names, extra=()) -> str:
+    """
+    Return a short hash of the given ``src`` modules' source code and any extra
+    strings, used to invalidate derived data when the code changes.
+    """
+    src_dir = Path(__file__).resolve().parent
+    digest = hashlib.sha256()
+    for name in sorted(module_names):
+        digest.update(name.encode())
+        digest.update((src_dir / name).read_bytes())
+    for item in extra:
+        digest.update(str(item).encode())
+    return digest.hexdigest()[:16]
+
+
+def parser_fingerprint(engine: str = "docx") -> str:
+    """
+    Return the fingerprint of the parsing code for ``engine``.
+    """
+    return source_fingerprint(PARSER_MODULES, (engine, pd.__version__, CACHE_FORMAT))
+
+
+class ParseCache:
+    """
+    LRU-bounded cache of parsed DataFrames under ``cache_dir``.
+
+    Args:
+        cache_dir (str or Path): Directory holding the cache entries.
+        max_bytes (int): Total size above which least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints = {}
+
+    def key(self, path, engine: str = "docx") -> str:
+        """Return the cache key of a DOCX file for the given engine."""
+        if engine not in self._fingerprints:
+            self._fingerprints[engine] = parser_fingerprint(engine)
+        return f"{file_sha256(path)}-{self._fingerprints[engine]}"
+
+    def _entry_path(self, key: str) -> Path:
+        suffix = ".parquet" if CACHE_FORMAT == "parquet" else ".pkl"
+        return self.cache_dir / f"{key}{suffix}"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return the cached frame for ``key`` or None, marking it recently used."""
+        entry = self._entry_path(key)
+        try:
+            if CACHE_FORMAT == "parquet":
+                df = pd.read_parquet(entry)
+            else:
+                df = pd.read_pickle(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Discarding unreadable cache entry %s: %s", entry.name, exc)
+            entry.unlink(missing_ok=True)
+            return None
+        os.utime(entry)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Store a frame under ``key`` and evict old entries if over budget."""
+        entry = self._entry_path(key)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            if CACHE_FORMAT == "parquet":
+                df.to_parquet(tmp_name, index=False)
+            else:
+                df.to_pickle(tmp_name)
+            os.replace(tmp_name, entry)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        self.evict()
+
+    def parse(self, path, engine: str = "docx", stats=None) -> pd.DataFrame:
+        """
+        Return ``parse_document(path, engine)``, from the cache when the file and
+        the parser are unchanged. ``stats`` is passed to the parser on a miss, and
+        its ``cache_hits`` counter is set to 1 on a hit and 0 on a miss.
+        """
+        key = self.key(path, engine)
+        df = self.get(key)
+        if stats is not None:
+            stats["cache_hits"] = int(df is not None)
+        if df is not None:
+            self.hits += 1
+            logger.info("Parse cache hit for %s", path)
+            return df
+        self.misses += 1
+        df = parse_document(path, engine=engine, stats=stats)
+        self.put(key, df)
+        return df
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if entry.suffix in (".parquet", ".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            logger.info("Evicted parse cache entry %s", entry.name)
+
+    def log_stats(self) -> None:
+        """Log the hit/miss counters."""
+        logger.info("Parse cache: %d hits, %d misses", self.hits, self.misses)
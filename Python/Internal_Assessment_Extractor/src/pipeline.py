@@ -0,0 +1,221 @@
+"""
+pipeline.py
+
+The per-file workflow (Parsing -> Summarizing -> Cleaning -> Exporting) as a
+single picklable function, so a batch can run it in the current process or in
+worker processes. Workers send back only a small FileResult (including the
+file's per-stage metrics), never DataFrames. FileRun exposes the same workflow
+step by step for the staged runner.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .doc_parser import parse_document
+from .parse_cache import ParseCache
+from .analysis import summarize_dataframe
+from .exporter import EXPORT_FORMATS
+from .cleaner import clean_data
+from .dedup import DedupIndex
+from .manifest import BatchManifest
+from .metrics import FileMetrics, StageRecorder
+from .question_bank import QuestionBank
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["Parsing", "Summarizing", "Cleaning", "Exporting"]
+DEFAULT_FORMATS = ("docx", "xlsx")
+
+# ParseCache per (cache_dir, max_bytes), one per process
+_CACHES = {}
+# DedupIndex per index path, one per process
+_DEDUP_INDEXES = {}
+# QuestionBank connection per (database path, thread), one per process
+_BANKS = {}
+
+
+@dataclass
+class PipelineOptions:
+    """Settings shared by every file of a batch."""
+    output_dir: Path
+    engine: str = "docx"
+    cache_dir: Optional[Path] = None
+    cache_max_bytes: int = 0
+    record_input: bool = False
+    excel_split_by: Optional[str] = None
+    formats: Tuple[str, ...] = DEFAULT_FORMATS
+    dedup_index: Optional[Path] = None
+    question_bank: Optional[Path] = None
+    trace_memory: bool = False
+    profile_dir: Optional[Path] = None
+
+
+@dataclass
+class FileResult:
+    """Status and metrics of one processed file."""
+    doc_path: Path
+    ok: bool = False
+    rows: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    cache_hit: Optional[bool] = None
+    input_info: Optional[dict] = None
+    artifacts: List[Path] = field(default_factory=list)
+    metrics: Optional[FileMetrics] = None
+
+
+def _parse_cache(options: PipelineOptions) -> Optional[ParseCache]:
+    """Return this process's ParseCache for the options, or None if caching is off."""
+    if options.cache_dir is None:
+        return None
+    key = (str(options.cache_dir), options.cache_max_bytes)
+    if key not in _CACHES:
+        _CACHES[key] = ParseCache(options.cache_dir, options.cache_max_bytes)
+    return _CACHES[key]
+
+
+def dedup_index(options: PipelineOptions) -> Optional[DedupIndex]:
+    """Return this process's DedupIndex for the options, or None if ids are off."""
+    if options.dedup_index is None:
+        return None
+    key = str(options.dedup_index)
+    if key not in _DEDUP_INDEXES:
+        _DEDUP_INDEXES[key] = DedupIndex(options.dedup_index)
+    return _DEDUP_INDEXES[key]
+
+
+def _question_bank(options: PipelineOptions) -> Optional[QuestionBank]:
+    """Return this process's QuestionBank connection, or None if no bank is kept."""
+    if options.question_bank is None:
+        return None
+    # SQLite connections belong to the thread that opened them (see staged.py)
+    key = (str(options.question_bank), threading.get_ident())
+    if key not in _BANKS:
+        _BANKS[key] = QuestionBank(options.question_bank)
+    return _BANKS[key]
+
+
+class FileRun:
+    """
+    One file on its way through the workflow. ``process_file`` runs its stages
+    back to back; the staged runner (see ``staged.py``) hands it from one stage's
+    workers to the next. Each step raises on failure; ``fail`` records the error.
+
+    Args:
+        doc_path (str or Path): The DOCX file to process.
+        options (PipelineOptions): Batch settings.
+        progress (callable, optional): Called with (stage index, stage name) as
+            each stage starts.
+    """
+
+    def __init__(self, doc_path, options: PipelineOptions,
+                 progress: Optional[Callable[[int, str], None]] = None):
+        self.options = options
+        self.result = FileResult(Path(doc_path))
+        self.recorder = StageRecorder(
+            self.result.doc_path, progress, options.trace_memory, options.profile_dir
+        )
+        self.df = None
+        self._start = time.perf_counter()
+
+    @property
+    def failed(self) -> bool:
+        """Whether a step has failed, so the remaining steps are skipped."""
+        return self.result.error is not None
+
+    def parse(self) -> None:
+        """Parsing: read the document (or its cached frame)."""
+        options, result = self.options, self.result
+        counters = self.recorder.counters
+        if options.record_input:
+            result.input_info = BatchManifest.stat_input(result.doc_path)
+
+        with self.recorder.stage(STAGES[0]):
+            cache = _parse_cache(options)
+            if cache is not None:
+                self.df = cache.parse(str(result.doc_path), engine=options.engine, stats=counters)
+                result.cache_hit = bool(counters["cache_hits"])
+            else:
+                self.df = parse_document(
+                    str(result.doc_path), engine=options.engine, stats=counters
+                )
+
+    def clean(self) -> None:
+        """Summarizing and Cleaning, including canonical question ids."""
+        counters = self.recorder.counters
+        with self.recorder.stage(STAGES[1]):
+            summarize_dataframe(self.df)
+
+        with self.recorder.stage(STAGES[2]):
+            parsed_rows = len(self.df)
+            self.df = clean_data(self.df)
+            counters["rows_dropped_cleaning"] = parsed_rows - len(self.df)
+            index = dedup_index(self.options)
+            if index is not None:
+                known = len(index)
+                self.df = index.assign_ids(self.df)
+                counters["new_canonical_questions"] = len(index) - known
+            self.result.rows = len(self.df)
+
+    def export(self) -> None:
+        """Exporting: write every output format and store the rows in the bank."""
+        options, result = self.options, self.result
+        with self.recorder.stage(STAGES[3]):
+            for fmt in options.formats:
+                suffix, writer = EXPORT_FORMATS[fmt]
+                artifact = options.output_dir / f"{result.doc_path.stem}_cleaned{suffix}"
+                if fmt == "xlsx":
+                    writer(self.df, artifact, split_by=options.excel_split_by)
+                else:
+                    writer(self.df, artifact)
+                result.artifacts.append(artifact)
+            bank = _question_bank(options)
+            if bank is not None:
+                sha256 = result.input_info["sha256"] if result.input_info else None
+                self.recorder.counters["bank_rows"] = bank.store(result.doc_path, self.df, sha256)
+        result.ok = True
+        self.df = None
+
+    def fail(self, exc: Exception) -> None:
+        """Log and record a failed step, dropping the file's frame."""
+        logger.error("Failed to process %s: %s", self.result.doc_path, exc)
+        self.result.error = f"{type(exc).__name__}: {exc}"
+        self.df = None
+
+    def finish(self) -> FileResult:
+        """Return the result with its total time and per-stage metrics."""
+        self.result.seconds = time.perf_counter() - self._start
+        self.result.metrics = self.recorder.metrics
+        return self.result
+
+
+def process_file(
+    doc_path,
+    options: PipelineOptions,
+    progress: Optional[Callable[[int, str], None]] = None,
+) -> FileResult:
+    """
+    Run the full workflow for one DOCX file. Failures are logged and reported in
+    the result instead of raised, so one bad file does not stop a batch.
+
+    Args:
+        doc_path (str or Path): The DOCX file to process.
+        options (PipelineOptions): Batch settings.
+        progress (callable, optional): Called with (stage index, stage name) as
+            each stage starts.
+
+    Returns:
+        FileResult: Outcome, row count, timing, per-stage metrics and the artifacts written.
+    """
+    run = FileRun(doc_path, options, progress)
+    try:
+        run.parse()
+        run.clean()
+        run.export()
+    except Exception as exc:  # pylint: disable=broad-except
+        run.fail(exc)
+    return run.finish()
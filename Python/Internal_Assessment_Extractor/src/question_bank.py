@@ -0,0 +1,400 @@
+"""
+question_bank.py
+
+SQLite store of every parsed question across the corpus, for queries such as
+"all questions in chapter X across every manual" without re-reading exports.
+
+Each document is keyed by the SHA-256 of its DOCX bytes: storing a document
+replaces its earlier rows (and those of an older version at the same path) in
+one transaction with a bulk insert. The questions table is indexed on chapter,
+process, subsection, question type and canonical question id.
+
+Questions and answers are also kept in an FTS5 full-text index, updated in the
+same transaction. Question text is indexed as ``cleaner.clean_question_text``
+leaves it (instruction phrases removed), and the tokenizer folds case and
+diacritics and splits on punctuation and whitespace, as cleaning does. Searches
+are ranked with BM25, question matches weighing more than answer matches.
+
+From the command line::
+
+    python -m src.question_bank BANK.db query --chapter "Chapter Two"
+    python -m src.question_bank BANK.db search "chain sling" --process Lifting
+"""
+
+import argparse
+import logging
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .cleaner import clean_question_text
+from .parse_cache import file_sha256
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 3
+# Bank column -> DataFrame column (lower-cased, as after clean_data)
+QUESTION_COLUMNS = {
+    "question_type": "questiontype",
+    "question": "questions",
+    "answer": "answer",
+    "marks": "marks",
+    "chapter": "chapter",
+    "chapter_style": "chapterstyle",
+    "process": "process",
+    "process_style": "processstyle",
+    "subsection": "subsection",
+    "subsection_style": "subsectionstyle",
+    "question_id": "question_id",
+}
+# Bank columns that can be filtered on, all indexed
+FILTER_COLUMNS = ("chapter", "process", "subsection", "question_type", "question_id")
+# BM25 weights of the indexed question and answer text
+SEARCH_WEIGHTS = (2.0, 1.0)
+_SEARCH_TERM = re.compile(r"\w+\*?")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_path ON documents (path);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL REFERENCES documents (doc_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    {", ".join(f"{column} TEXT" for column in QUESTION_COLUMNS)},
+    UNIQUE (doc_id, position)
+);
+{"".join(
+    f"CREATE INDEX IF NOT EXISTS questions_{column} ON questions ({column});"
+    for column in FILTER_COLUMNS
+)}
+CREATE VIRTUAL TABLE IF NOT EXISTS question_search USING fts5 (
+    question, answer, tokenize = "unicode61 remove_diacritics 2"
+);
+CREATE TRIGGER IF NOT EXISTS questions_search_delete AFTER DELETE ON questions BEGIN
+    DELETE FROM question_search WHERE rowid = old.id;
+END;
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+def search_text(question, answer):
+    """Return the (question, answer) text indexed for searching."""
+    return (
+        clean_question_text(question) if question is not None else None,
+        answer.strip() if answer is not None else None,
+    )
+
+
+def fts_query(terms: str) -> str:
+    """
+    Turn free text into an FTS5 query matching rows that contain every word.
+    A trailing ``*`` keeps prefix matching (``lift*``); other syntax is ignored.
+    """
+    words = _SEARCH_TERM.findall(terms)
+    if not words:
+        raise ValueError(f"No searchable words in {terms!r}")
+    return " ".join(
+        f'"{word[:-1]}"*' if word.endswith("*") else f'"{word}"' for word in words
+    )
+
+
+class QuestionBank:
+    """
+    SQLite-backed question bank.
+
+    Args:
+        path (str or Path): Database file, created if missing.
+        timeout (float): Seconds to wait for another process's write lock.
+    """
+
+    def __init__(self, path, timeout: float = 60.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), timeout=timeout)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        # WAL lets readers query while a batch (possibly several workers) writes
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, 1, 2, SCHEMA_VERSION):
+            raise ValueError(f"Unsupported question bank schema {version} in {self.path}")
+        if version in (1, 2):
+            self._upgrade_questions()
+        else:
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def store(self, doc_path, df: pd.DataFrame, sha256: Optional[str] = None) -> int:
+        """
+        Replace a document's questions with the rows of ``df`` in one transaction.
+
+        Args:
+            doc_path (str or Path): The source DOCX file.
+            df (pd.DataFrame): Parsed rows, with parser or cleaned column names.
+                Columns the bank does not know are ignored; missing ones are NULL.
+            sha256 (str, optional): Content hash of the file, computed if omitted.
+
+        Returns:
+            int: The number of questions stored.
+        """
+        doc_path = Path(doc_path)
+        sha256 = sha256 or file_sha256(doc_path)
+        columns = {str(column).lower(): column for column in df.columns}
+        source = [columns.get(frame_column) for frame_column in QUESTION_COLUMNS.values()]
+        present = [column for column in source if column is not None]
+        values = df[present].astype(object).where(df[present].notna(), None)
+        width = len(source)
+        # Rows in bank column order, None for columns the frame lacks
+        slots = [source.index(column) for column in present]
+
+        def rows():
+            for position, record in enumerate(values.itertuples(index=False, name=None)):
+                row = [None] * width
+                for slot, value in zip(slots, record):
+                    row[slot] = None if value is None else str(value)
+                yield (doc_id, position, *row)
+
+        with self.conn:
+            # Older versions of this file and earlier copies of these bytes are replaced
+            self.conn.execute(
+                "DELETE FROM documents WHERE path = ? OR sha256 = ?", (str(doc_path), sha256)
+            )
+            doc_id = self.conn.execute(
+                "INSERT INTO documents (sha256, path, rows, stored_at) VALUES (?, ?, ?, ?)",
+                (sha256, str(doc_path), len(df), time.time()),
+            ).lastrowid
+            self.conn.executemany(
+                f"INSERT INTO questions (doc_id, position, {', '.join(QUESTION_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (width + 2))})",
+                rows(),
+            )
+            self._index_search("WHERE doc_id = ?", (doc_id,))
+        logger.debug("Stored %d questions from %s", len(df), doc_path.name)
+        return len(df)
+
+    def _upgrade_questions(self) -> None:
+        """
+        Move the questions of a bank made before schema 3 into the current table
+        and (re)build the search index. Those banks keyed questions only by
+        (doc_id, position), so the search index followed their implicit rowids,
+        which VACUUM may renumber.
+        """
+        columns = ", ".join(("doc_id", "position", *QUESTION_COLUMNS))
+        self.conn.executescript(f"""
+            BEGIN;
+            DROP TRIGGER IF EXISTS questions_search_delete;
+            DROP TABLE IF EXISTS question_search;
+            {"".join(f"DROP INDEX IF EXISTS questions_{column};" for column in FILTER_COLUMNS)}
+            ALTER TABLE questions RENAME TO old_questions;
+            {_SCHEMA}
+            INSERT INTO questions ({columns})
+                SELECT {columns} FROM old_questions ORDER BY doc_id, position;
+            DROP TABLE old_questions;
+            COMMIT;
+        """)
+        self.rebuild_search_index()
+
+    def _index_search(self, where: str, params=()) -> None:
+        """Add the questions selected by ``where`` to the full-text index."""
+        selected = self.conn.execute(
+            f"SELECT id, question, answer FROM questions {where}", params
+        ).fetchall()
+        self.conn.executemany(
+            "INSERT INTO question_search (rowid, question, answer) VALUES (?, ?, ?)",
+            ((row_id, *search_text(question, answer)) for row_id, question, answer in selected),
+        )
+
+    def rebuild_search_index(self) -> None:
+        """Re-create the full-text index from every stored question."""
+        with self.conn:
+            self.conn.execute("DELETE FROM question_search")
+            self._index_search("")
+
+    def has_document(self, sha256: str) -> bool:
+        """Return whether a document with this content hash is stored."""
+        return self.conn.execute(
+            "SELECT 1 FROM documents WHERE sha256 = ?", (sha256,)
+        ).fetchone() is not None
+
+    def remove_document(self, doc_path) -> int:
+        """Remove the questions of a document path; returns the number of documents removed."""
+        with self.conn:
+            return self.conn.execute(
+                "DELETE FROM documents WHERE path = ?", (str(doc_path),)
+            ).rowcount
+
+    @staticmethod
+    def _where(filters: Dict[str, Optional[str]]):
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter on '{column}': expected one of {FILTER_COLUMNS}")
+            if value is not None:
+                clauses.append(f"q.{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit: Optional[int] = None, **filters) -> pd.DataFrame:
+        """
+        Return the stored questions matching exact values of the filter columns.
+
+        Args:
+            limit (int, optional): Return at most this many rows.
+            **filters: chapter, process, subsection, question_type or question_id.
+
+        Returns:
+            pd.DataFrame: Matching questions with their source document path,
+            in document and position order.
+        """
+        where, params = self._where(filters)
+        sql = (
+            f"SELECT d.path AS document, q.position, "
+            f"{', '.join(f'q.{column}' for column in QUESTION_COLUMNS)} "
+            f"FROM questions q JOIN documents d USING (doc_id){where} "
+            f"ORDER BY q.doc_id, q.position"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def search(self, terms: str, limit: Optional[int] = 20, **filters) -> pd.DataFrame:
+        """
+        Return the questions containing every word of ``terms``, best matches first.
+
+        Args:
+            terms (str): Words to find in the question or answer text; a trailing
+                ``*`` matches prefixes.
+            limit (int, optional): Return at most this many hits.
+            **filters: Exact chapter, process, subsection, question_type or question_id.
+
+        Returns:
+            pd.DataFrame: Hits with their score (lower is better), document, heading
+            context, question, answer and a snippet of the matched text.
+        """
+        where, params = self._where(filters)
+        where = where.replace(" WHERE ", " AND ", 1)
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        sql = (
+            f"SELECT bm25(question_search, {weights}) AS score, d.path AS document, "
+            f"q.position, q.chapter, q.process, q.subsection, q.question_type, q.question, "
+            f"q.answer, q.question_id, "
+            f"snippet(question_search, -1, '[', ']', '...', 12) AS snippet "
+            f"FROM question_search JOIN questions q ON q.id = question_search.rowid "
+            f"JOIN documents d USING (doc_id) "
+            f"WHERE question_search MATCH ?{where} ORDER BY score"
+        )
+        params = [fts_query(terms)] + params
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def counts(self, by: str = "chapter", **filters) -> pd.DataFrame:
+        """
+        Return the number of questions and documents per value of a filter column.
+        """
+        if by not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot group by '{by}': expected one of {FILTER_COLUMNS}")
+        where, params = self._where(filters)
+        sql = (
+            f"SELECT q.{by} AS {by}, COUNT(*) AS questions, "
+            f"COUNT(DISTINCT q.doc_id) AS documents FROM questions q{where} "
+            f"GROUP BY q.{by} ORDER BY questions DESC, q.{by}"
+        )
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of stored documents and questions."""
+        documents, questions = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM documents), (SELECT COUNT(*) FROM questions)"
+        ).fetchone()
+        return {"documents": documents, "questions": questions}
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line options for querying or searching a question bank.
+    """
+    parser = argparse.ArgumentParser(description="Query or search a question bank database.")
+    parser.add_argument("bank", type=Path, help="Question bank SQLite file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help="List questions by exact heading or type.")
+    search = commands.add_parser("search", help="Full-text search of questions and answers.")
+    search.add_argument("terms", help="Words that every hit must contain (word* for prefixes).")
+    for command in (query, search):
+        for column in FILTER_COLUMNS:
+            command.add_argument(
+                f"--{column.replace('_', '-')}", dest=column, default=None,
+                help=f"Only questions whose {column.replace('_', ' ')} is exactly this value."
+            )
+        command.add_argument(
+            "--csv", action="store_true", help="Print CSV instead of an aligned table."
+        )
+    query.add_argument(
+        "--count-by",
+        choices=FILTER_COLUMNS,
+        default=None,
+        help="Print question and document counts per value of this column instead of rows."
+    )
+    query.add_argument("--limit", type=int, default=None, help="Print at most N rows.")
+    search.add_argument("--limit", type=int, default=20, help="Print at most N hits.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Run a query or search against a question bank and print the result.
+    """
+    args = parse_args(argv)
+    if not args.bank.exists():
+        logger.error("Question bank not found: %s", args.bank)
+        return 1
+    filters = {column: getattr(args, column) for column in FILTER_COLUMNS}
+    start = time.perf_counter()
+    with QuestionBank(args.bank) as bank:
+        if args.command == "search":
+            try:
+                result = bank.search(args.terms, limit=args.limit, **filters)
+            except ValueError as exc:
+                logger.error("%s", exc)
+                return 1
+            if not args.csv:
+                result = result[["score", "document", "chapter", "process", "subsection",
+                                 "snippet"]]
+        elif args.count_by:
+            result = bank.counts(args.count_by, **filters)
+        else:
+            result = bank.query(limit=args.limit, **filters)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if args.csv:
+        result.to_csv(sys.stdout, index=False)
+    else:
+        print(result.to_string(index=False))
+    print(f"{len(result)} rows in {elapsed_ms:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
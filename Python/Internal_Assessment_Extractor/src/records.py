@@ -0,0 +1,121 @@
+"""
+records.py
+
+Compact, column-wise accumulator for the Q&A rows found by ``doc_parser``.
+
+Each question stores only its own text plus two small integer codes: one for its
+question type and one for its place in the document hierarchy (the chapter,
+process and subsection headings and their styles, interned as a single tuple).
+``to_frame`` expands the codes into categorical columns, so heading and style
+strings are held once per distinct value instead of once per row.
+"""
+
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = (
+    "QuestionType", "Questions", "Answer", "Marks",
+    "Chapter", "ChapterStyle", "Process", "ProcessStyle", "Subsection", "SubsectionStyle",
+)
+# Columns interned through the hierarchy tuple, in tuple order
+HIERARCHY_COLUMNS = COLUMNS[4:]
+# Low-cardinality columns stored as pandas categoricals
+CATEGORY_COLUMNS = ("QuestionType", "Marks") + HIERARCHY_COLUMNS
+DEFAULT_MARKS = "/1"
+
+
+class QuestionRecord(NamedTuple):
+    """One parsed question with the headings in effect where it was found."""
+    question_type: str
+    question: str
+    answer: Optional[str]
+    chapter: str = ""
+    chapter_style: str = ""
+    process: str = ""
+    process_style: str = ""
+    subsection: str = ""
+    subsection_style: str = ""
+
+    @property
+    def hierarchy(self) -> Tuple[str, ...]:
+        """The values of HIERARCHY_COLUMNS, in order."""
+        return tuple(self[3:])
+
+    def as_row(self) -> Dict[str, Optional[str]]:
+        """Return the record keyed by COLUMNS, as in the parser's DataFrame."""
+        return dict(zip(COLUMNS, (
+            self.question_type, self.question, self.answer, DEFAULT_MARKS, *self.hierarchy
+        )))
+
+
+class QuestionTable:
+    """
+    Accumulates parsed questions column-wise and builds the parser's DataFrame.
+    """
+
+    __slots__ = ("questions", "answers", "_type_codes", "_types",
+                 "_hierarchy_codes", "_hierarchies")
+
+    def __init__(self):
+        self.questions: List[str] = []
+        self.answers: List[str] = []
+        self._type_codes = array("i")
+        self._types: Dict[str, int] = {}
+        self._hierarchy_codes = array("i")
+        self._hierarchies: Dict[Tuple[str, ...], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def append(self, question_type: str, question: str, answer: Optional[str],
+               hierarchy: Tuple[str, ...]) -> None:
+        """
+        Add one question.
+
+        Args:
+            question_type (str): e.g. 'CONCEPT CHECK'.
+            question (str): The question text.
+            answer (str): The answer text.
+            hierarchy (tuple): Values of HIERARCHY_COLUMNS for this question.
+        """
+        self.questions.append(question)
+        self.answers.append(answer)
+        self._type_codes.append(self._types.setdefault(question_type, len(self._types)))
+        self._hierarchy_codes.append(
+            self._hierarchies.setdefault(hierarchy, len(self._hierarchies))
+        )
+
+    def add(self, record: QuestionRecord) -> None:
+        """Add one QuestionRecord."""
+        self.append(record.question_type, record.question, record.answer, record.hierarchy)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the questions as a DataFrame with COLUMNS, using categorical dtypes
+        for CATEGORY_COLUMNS (categories in order of first appearance).
+        """
+        rows = len(self)
+        hierarchy_codes = np.frombuffer(self._hierarchy_codes, dtype=np.int32)
+        data = {
+            "QuestionType": pd.Categorical.from_codes(
+                np.frombuffer(self._type_codes, dtype=np.int32), list(self._types)
+            ),
+            "Questions": self.questions if rows else pd.Series([], dtype=object),
+            "Answer": self.answers if rows else pd.Series([], dtype=object),
+            "Marks": pd.Categorical.from_codes(
+                np.zeros(rows, dtype=np.int32), [DEFAULT_MARKS]
+            ),
+        }
+        hierarchies = list(self._hierarchies)
+        for position, column in enumerate(HIERARCHY_COLUMNS):
+            # Map hierarchy ids to codes of this column's distinct values
+            codes, categories = pd.factorize(
+                pd.Series([hierarchy[position] for hierarchy in hierarchies])
+            )
+            data[column] = pd.Categorical.from_codes(
+                codes[hierarchy_codes] if rows else np.zeros(0, dtype=np.int32), categories
+            )
+        return pd.DataFrame(data, columns=list(COLUMNS))
@@ -0,0 +1,227 @@
+"""
+staged.py
+
+A staged batch runner. Parsing, Cleaning (with Summarizing) and Exporting each
+run in their own worker threads, joined by bounded queues, so writing file N's
+outputs overlaps with parsing file N+1 instead of following it. A full queue
+blocks the stage feeding it (backpressure), and a MemoryBudget stops Parsing
+from admitting new files while the parsed frames still in flight exceed a cap.
+
+Threads rather than processes keep the frames in one process, so they are never
+pickled. The overlap comes from the work that releases the GIL: lxml parsing
+and serialization, zlib (de)compression of the DOCX/XLSX packages and file I/O.
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from .pipeline import FileResult, FileRun, PipelineOptions
+
+logger = logging.getLogger(__name__)
+
+STAGE_NAMES = ("Parsing", "Cleaning", "Exporting")
+DEFAULT_QUEUE_SIZE = 2
+
+# Tells a stage's workers that no more files will arrive
+_DONE = object()
+
+
+class MemoryBudget:
+    """
+    Admits parsed frames while the frames in flight stay under ``max_bytes``.
+
+    One frame is always admitted when none is in flight, so a single file larger
+    than the cap still goes through.
+
+    Args:
+        max_bytes (int): Cap on the total size of frames in flight (0 = no cap).
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self.bytes = 0
+        self.peak_bytes = 0
+        self._condition = threading.Condition()
+
+    def admit(self) -> None:
+        """Block until another file may be parsed, then count it as in flight."""
+        with self._condition:
+            while self.max_bytes and self.in_flight and self.bytes >= self.max_bytes:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def charge(self, nbytes: int) -> None:
+        """Add the size of an admitted file's parsed frame."""
+        with self._condition:
+            self.bytes += nbytes
+            self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    def release(self, nbytes: int) -> None:
+        """Forget a file whose frame is no longer held (exported or failed)."""
+        with self._condition:
+            self.in_flight -= 1
+            self.bytes -= nbytes
+            self._condition.notify_all()
+
+
+@dataclass
+class _Job:
+    """A file between stages and the frame size charged to the budget."""
+    doc_path: Path
+    run: Optional[FileRun] = None
+    admitted: bool = False
+    nbytes: int = 0
+    # Set when the file failed before it had a FileRun
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        """Whether a step has failed, so the remaining steps are skipped."""
+        return self.error is not None or (self.run is not None and self.run.failed)
+
+    def fail(self, exc: Exception) -> None:
+        """Record a failed step on the file's FileRun, or on the job if it has none."""
+        if self.run is not None:
+            self.run.fail(exc)
+            return
+        logger.error("Failed to process %s: %s", self.doc_path, exc)
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def finish(self) -> FileResult:
+        """Return the file's result."""
+        if self.run is None:
+            return FileResult(self.doc_path, error=self.error)
+        return self.run.finish()
+
+
+class _Stage:
+    """The worker threads of one stage, reading ``inbox`` and feeding ``outbox``."""
+
+    def __init__(self, name: str, step: Callable[[_Job], None], workers: int,
+                 inbox: queue.Queue, outbox: queue.Queue, next_workers: int):
+        self.name = name
+        self.step = step
+        self.inbox = inbox
+        self.outbox = outbox
+        self.next_workers = next_workers
+        self._running = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"{name}-{idx}", daemon=True)
+            for idx in range(workers)
+        ]
+
+    def _work(self) -> None:
+        try:
+            while True:
+                job = self.inbox.get()
+                if job is _DONE:
+                    break
+                if not job.failed:
+                    try:
+                        self.step(job)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        job.fail(exc)
+                self.outbox.put(job)
+        finally:
+            # Even if this thread dies, the stages after it must be told to stop
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                # Only once every worker of this stage is done can the next one stop
+                for _ in range(self.next_workers):
+                    self.outbox.put(_DONE)
+
+
+def run_staged(
+    doc_paths: Sequence,
+    options: PipelineOptions,
+    workers: Sequence[int] = (1, 1, 1),
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    max_in_flight_bytes: int = 0,
+    on_result: Optional[Callable[[FileResult], None]] = None,
+) -> List[FileResult]:
+    """
+    Process files through the Parsing, Cleaning and Exporting stages concurrently.
+
+    Args:
+        doc_paths (sequence): The DOCX files to process, in order.
+        options (PipelineOptions): Batch settings. A dedup index is grown file by
+            file, so Cleaning then runs in one worker whatever ``workers`` says.
+        workers (sequence of int): Worker threads for Parsing, Cleaning and Exporting.
+        queue_size (int): Files that may wait between two stages.
+        max_in_flight_bytes (int): Stop parsing new files while the parsed frames
+            not yet exported take this much memory (0 = no cap).
+        on_result (callable, optional): Called in this thread with each FileResult
+            as its file finishes.
+
+    Returns:
+        list: One FileResult per file, in completion order.
+    """
+    workers = [max(1, count) for count in workers]
+    if len(workers) != len(STAGE_NAMES):
+        raise ValueError(f"Expected {len(STAGE_NAMES)} worker counts, got {len(workers)}")
+    if options.dedup_index is not None and workers[1] > 1:
+        logger.warning("A dedup index is grown file by file; cleaning in one worker.")
+        workers[1] = 1
+    budget = MemoryBudget(max_in_flight_bytes)
+
+    def parse(job: _Job) -> None:
+        job.run = FileRun(job.doc_path, options)
+        budget.admit()
+        job.admitted = True
+        try:
+            job.run.parse()
+        finally:
+            if job.run.df is not None:
+                job.nbytes = int(job.run.df.memory_usage(deep=True).sum())
+            budget.charge(job.nbytes)
+
+    def clean(job: _Job) -> None:
+        job.run.clean()
+
+    def export(job: _Job) -> None:
+        job.run.export()
+
+    # Parsing reads an unbounded queue of paths; the results queue is unbounded
+    # too, so finished files never hold up Exporting
+    queues = [queue.Queue()]
+    queues += [queue.Queue(maxsize=max(1, queue_size)) for _ in STAGE_NAMES[1:]]
+    queues.append(queue.Queue())
+    stages = [
+        _Stage(name, step, workers[idx], queues[idx], queues[idx + 1],
+               workers[idx + 1] if idx + 1 < len(workers) else 1)
+        for idx, (name, step) in enumerate(zip(STAGE_NAMES, (parse, clean, export)))
+    ]
+    for doc_path in doc_paths:
+        queues[0].put(_Job(Path(doc_path)))
+    for _ in range(workers[0]):
+        queues[0].put(_DONE)
+    for stage in stages:
+        for thread in stage.threads:
+            thread.start()
+
+    results = []
+    while True:
+        job = queues[-1].get()
+        if job is _DONE:
+            break
+        if job.admitted:
+            # Exported or failed, the file no longer holds its frame
+            budget.release(job.nbytes)
+        result = job.finish()
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    for stage in stages:
+        for thread in stage.threads:
+            thread.join()
+    logger.debug("Staged run: peak %.1f MiB of parsed frames in flight",
+                 budget.peak_bytes / (1024 * 1024))
+    return results
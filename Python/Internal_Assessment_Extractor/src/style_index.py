@@ -0,0 +1,129 @@
+"""
+style_index.py
+
+Builds a per-document index of paragraph styles from ``styles.xml`` so paragraph
+classification is a dictionary lookup instead of a python-docx style resolution
+(which scans the whole styles part for the default style on every call).
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+from docx.styles import BabelFish
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_STYLE = f"{{{W_NS}}}style"
+W_NAME = f"{{{W_NS}}}name"
+W_BASED_ON = f"{{{W_NS}}}basedOn"
+W_VAL = f"{{{W_NS}}}val"
+W_TYPE = f"{{{W_NS}}}type"
+W_STYLE_ID = f"{{{W_NS}}}styleId"
+W_DEFAULT = f"{{{W_NS}}}default"
+
+HEADING_PREFIXES = ("heading 1", "heading 2", "heading 3")
+BODY_TEXT_STYLES = ("normal", "body text")
+_ON_VALUES = {"1", "true", "on"}
+
+
+class StyleInfo(NamedTuple):
+    """Precomputed classification of one paragraph style."""
+    name: Optional[str]
+    key: str
+    heading_level: int
+    body_text: bool
+
+
+def classify_style_name(name: Optional[str], heading_level: int = 0) -> StyleInfo:
+    """
+    Classify a UI style name: heading level 1-3 by name prefix (0 if not a
+    heading) and whether it is a plain body-text style.
+
+    Args:
+        name (str): The UI style name, e.g. 'Heading 1'.
+        heading_level (int): Level to use when the name itself is not a heading.
+    """
+    key = name.lower() if name else ""
+    for level, prefix in enumerate(HEADING_PREFIXES, start=1):
+        if key.startswith(prefix):
+            heading_level = level
+            break
+    return StyleInfo(name, key, heading_level, key in BODY_TEXT_STYLES)
+
+
+DEFAULT_STYLE = classify_style_name("Normal")
+
+
+class StyleIndex:
+    """
+    Maps paragraph style ids to StyleInfo, resolved once per document.
+
+    Lookups follow python-docx semantics: a missing or unknown style id, or one
+    that does not name a paragraph style, resolves to the default paragraph style.
+
+    Args:
+        styles_element: The root ``<w:styles>`` element, or None when the
+            document has no styles part (python-docx then uses "Normal").
+        inherit_headings (bool): If True, a style whose own name is not a heading
+            takes the heading level of the nearest ``basedOn`` ancestor that is.
+    """
+
+    def __init__(self, styles_element=None, inherit_headings: bool = False):
+        self._styles: Dict[str, StyleInfo] = {}
+        self.default = DEFAULT_STYLE
+        if styles_element is None:
+            return
+
+        first_by_id = {}
+        default_id = None
+        for style in styles_element.iterchildren(W_STYLE):
+            style_id = style.get(W_STYLE_ID)
+            if style_id is not None and style_id not in first_by_id:
+                first_by_id[style_id] = style
+            if style.get(W_TYPE) == "paragraph" and style.get(W_DEFAULT) in _ON_VALUES:
+                default_id = style_id
+
+        for style_id, style in first_by_id.items():
+            if style.get(W_TYPE) != "paragraph":
+                continue
+            level = _inherited_level(style, first_by_id) if inherit_headings else 0
+            self._styles[style_id] = classify_style_name(_style_name(style), level)
+
+        self.default = self._styles.get(default_id, classify_style_name(None))
+
+    @classmethod
+    def from_document(cls, doc, inherit_headings: bool = False) -> "StyleIndex":
+        """Build the index for a python-docx Document."""
+        return cls(doc.styles.element, inherit_headings)
+
+    def lookup(self, style_id: Optional[str]) -> StyleInfo:
+        """Return the StyleInfo for a paragraph's ``w:pStyle`` id."""
+        if not style_id:
+            return self.default
+        return self._styles.get(style_id, self.default)
+
+    def __len__(self) -> int:
+        return len(self._styles)
+
+
+def _style_name(style) -> Optional[str]:
+    """Return the UI name of a ``<w:style>`` element, or None if it has none."""
+    name = style.find(W_NAME)
+    if name is None or name.get(W_VAL) is None:
+        return None
+    return BabelFish.internal2ui(name.get(W_VAL))
+
+
+def _inherited_level(style, styles_by_id) -> int:
+    """Return the heading level of the nearest heading ancestor via ``basedOn``."""
+    seen = set()
+    based_on = style.find(W_BASED_ON)
+    while based_on is not None:
+        parent_id = based_on.get(W_VAL)
+        parent = styles_by_id.get(parent_id)
+        if parent is None or parent_id in seen or parent.get(W_TYPE) != "paragraph":
+            return 0
+        seen.add(parent_id)
+        level = classify_style_name(_style_name(parent)).heading_level
+        if level:
+            return level
+        based_on = parent.find(W_BASED_ON)
+    return 0
@@ -0,0 +1,53 @@
+"""
+tables.py
+
+Walks Word tables by physical cell. python-docx's ``row.cells`` returns the same
+``<w:tc>`` once for every grid column it spans (gridSpan) and once for every row it
+covers (vMerge), so merged cells are otherwise processed many times over.
+"""
+
+from typing import Iterator, List, NamedTuple
+
+from docx.table import Table, _Cell
+
+
+class TableCell(NamedTuple):
+    """A physical table cell with its top-left grid position and its span."""
+    row: int
+    col: int
+    row_span: int
+    col_span: int
+    cell: _Cell
+
+
+def iter_unique_cells(table: Table) -> Iterator[TableCell]:
+    """
+    Yield every physical cell of a table exactly once, in reading order of the
+    row where the cell starts.
+
+    Args:
+        table (Table): A python-docx Table object.
+
+    Yields:
+        TableCell: The cell, the grid row/column where it starts and the number
+                   of rows/columns it covers.
+    """
+    origins: List[list] = []
+    above = {}  # grid column -> origin of the cell occupying it in the previous row
+    for row_idx, tr in enumerate(table._tbl.tr_lst):  # pylint: disable=protected-access
+        col = tr.grid_before
+        current = {}
+        for tc in tr.tc_lst:
+            span = tc.grid_span
+            if tc.vMerge == "continue" and col in above:
+                origin = above[col]
+                origin[2] += 1
+            else:
+                origin = [row_idx, col, 1, span, tc]
+                origins.append(origin)
+            current[col] = origin
+            col += span
+        above = current
+
+    for row_idx, col, row_span, col_span, tc in origins:
+        yield TableCell(row_idx, col, row_span, col_span, _Cell(tc, table))
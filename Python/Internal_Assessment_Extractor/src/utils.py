@@ -6,9 +6,11 @@ table data extraction from Word documents, and structured logging for document p
 """
 
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from docx.table import Table
 from docx.text.paragraph import Paragraph
+from .style_index import StyleIndex
+from .tables import iter_unique_cells
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
@@ -31,18 +33,25 @@ def clean_text(text: str) -> str:
     return ' '.join(text.strip().split())
 
 
-def is_heading(paragraph: Paragraph, style_name: str) -> bool:
+def is_heading(
+    paragraph: Paragraph, style_name: str, style_index: Optional[StyleIndex] = None
+) -> bool:
     """
     Determine if a Word paragraph matches a given heading style.
 
     Args:
         paragraph (Paragraph): The Word paragraph object.
         style_name (str): The expected style name (e.g., 'Heading 1').
+        style_index (StyleIndex, optional): Index built once per document with
+            StyleIndex.from_document(doc); makes the check a dictionary lookup.
 
     Returns:
         bool: True if the paragraph's style matches, else False.
     """
     try:
+        if style_index is not None:
+            style_id = paragraph._p.style  # pylint: disable=protected-access
+            return style_index.lookup(style_id).name == style_name
         return paragraph.style.name == style_name
     except AttributeError:
         logger.warning("Paragraph style check failed due to missing style: %s", paragraph.text)
@@ -54,7 +63,8 @@ def extract_table_data(table: Table) -> List[Dict[str, str]]:
     Extract structured data from a Word table as a list of dictionaries.
 
     Assumes the first row is the header row, and each subsequent row
-    represents a record.
+    represents a record. Each physical cell is read once; a merged cell's value
+    is repeated for every row and header column it covers.
 
     Args:
         table (Table): A python-docx Table object.
@@ -64,20 +74,23 @@ def extract_table_data(table: Table) -> List[Dict[str, str]]:
                               header names to cleaned cell text values.
     """
     try:
-        headers = [clean_text(cell.text) for cell in table.rows[0].cells]
+        grid = [{} for _ in table.rows]
+        for entry in iter_unique_cells(table):
+            text = clean_text(entry.cell.text)
+            for row_idx in range(entry.row, entry.row + entry.row_span):
+                for col_idx in range(entry.col, entry.col + entry.col_span):
+                    grid[row_idx][col_idx] = text
+        if not grid:
+            return []
+
+        headers = grid[0]
         rows = []
-
-        for row_idx, row in enumerate(table.rows[1:], start=1):
-            try:
-                row_data = {
-                    headers[i]: clean_text(cell.text)
-                    for i, cell in enumerate(row.cells)
-                    if i < len(headers)
-                }
-                rows.append(row_data)
-            except IndexError as e:
-                logger.warning("Failed to extract row %d due to mismatch: %s", row_idx, str(e))
-                continue
+        for row in grid[1:]:
+            rows.append({
+                headers[col_idx]: text
+                for col_idx, text in sorted(row.items())
+                if col_idx in headers
+            })
 
         return rows
 
@@ -0,0 +1,283 @@
+"""
+watch.py
+
+Watch-folder mode: a long-running loop that processes DOCX files as they are
+added to or updated in the input folder.
+
+The folder is polled, which needs no extra dependency and also works on network
+shares where file-system events are unreliable. A file is passed on only after
+its size and modification time have not changed for ``settle_seconds`` and it
+opens as a complete ZIP package. Copies still being written and Word's ``~$``
+lock files are skipped. Ready files go to the shared worker pool, which is
+started and warmed once, so each new document is parsed, cleaned and exported
+without paying import or pool start-up time. SIGINT/SIGTERM stop the polling,
+wait for the files in progress to finish and save the dedup index before
+returning.
+"""
+
+import logging
+import signal
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .pipeline import FileResult, PipelineOptions, dedup_index, process_file
+from . import workers as worker_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_SETTLE_SECONDS = 2.0
+# Word lock files and hidden/temporary files are never inputs
+IGNORED_PREFIXES = ("~$", ".")
+
+Signature = Tuple[int, int]
+
+
+def _init_worker():
+    """
+    Start-up of each watch-mode worker. Resolving this function imports this module
+    and so the whole pipeline; the stop signals are left to the watching process,
+    which lets the files in progress finish.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+class FolderWatcher:
+    """
+    Finds new or changed files in a folder that have finished being written.
+
+    Args:
+        folder (str or Path): The folder to watch.
+        pattern (str): Glob pattern of the files to watch.
+        settle_seconds (float): How long a file's size and mtime must stay unchanged.
+        clock (callable): Monotonic time source (replaceable in tests).
+    """
+
+    def __init__(self, folder, pattern: str = "*.docx",
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.folder = Path(folder)
+        self.pattern = pattern
+        self.settle_seconds = settle_seconds
+        self.clock = clock
+        # Signature of each changing file and when it was first seen with it
+        self._pending: Dict[Path, Tuple[Signature, float]] = {}
+        # Signature of each file when it was last handed out
+        self._handed: Dict[Path, Signature] = {}
+        # Signature of files that settled without being a complete package
+        self._incomplete: Dict[Path, Signature] = {}
+
+    def poll(self) -> List[Path]:
+        """
+        Scan the folder once.
+
+        Returns:
+            list: Files that are new or changed since they were last returned and
+            whose writes have settled, in name order.
+        """
+        now = self.clock()
+        ready = []
+        present = set()
+        for path in sorted(self.folder.glob(self.pattern)):
+            if path.name.startswith(IGNORED_PREFIXES):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            present.add(path)
+            if self._handed.get(path) == signature:
+                continue
+            seen = self._pending.get(path)
+            if seen is None or seen[0] != signature:
+                # New, or still being written
+                self._pending[path] = (signature, now)
+                continue
+            if now - seen[1] < self.settle_seconds:
+                continue
+            if not zipfile.is_zipfile(path):
+                if self._incomplete.get(path) != signature:
+                    self._incomplete[path] = signature
+                    logger.warning("%s is not a complete DOCX package yet; waiting", path.name)
+                continue
+            del self._pending[path]
+            self._incomplete.pop(path, None)
+            self._handed[path] = signature
+            ready.append(path)
+        for tracked in (self._pending, self._handed, self._incomplete):
+            for gone in set(tracked) - present:
+                del tracked[gone]
+        return ready
+
+    def forget(self, path) -> None:
+        """Return ``path`` again from the next poll, even if it has not changed."""
+        path = Path(path)
+        signature = self._handed.pop(path, None)
+        if signature is not None:
+            # It has already settled, so it need not wait again
+            self._pending[path] = (signature, float("-inf"))
+
+
+def _install_stop_handlers(stop: threading.Event) -> Dict[int, object]:
+    """Make SIGINT/SIGTERM set ``stop``; return the previous handlers."""
+    if threading.current_thread() is not threading.main_thread():
+        return {}
+
+    def handler(signum, _frame):
+        if stop.is_set():
+            raise KeyboardInterrupt
+        logger.info("Received %s; finishing files in progress (again to abort)",
+                    signal.Signals(signum).name)
+        stop.set()
+
+    previous = {}
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        previous[signum] = signal.signal(signum, handler)
+    return previous
+
+
+def watch(
+    input_dir,
+    options: PipelineOptions,
+    manifest=None,
+    workers: int = 1,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+    start_method: Optional[str] = None,
+    stop: Optional[threading.Event] = None,
+    on_result: Optional[Callable[[FileResult], None]] = None,
+) -> int:
+    """
+    Process DOCX files from ``input_dir`` as they appear or change, until stopped.
+
+    Args:
+        input_dir (str or Path): The folder to watch.
+        options (PipelineOptions): Batch settings for every file.
+        manifest (BatchManifest, optional): Skips files that are already up to date
+            (including on start-up) and records every processed file.
+        workers (int): Warm worker processes. With a dedup index, files are
+            processed in this process instead, since the index is grown file by file.
+        poll_seconds (float): Time between scans of the folder.
+        settle_seconds (float): How long a file must stay unchanged before processing.
+        start_method (str, optional): Multiprocessing start method of the pool.
+        stop (threading.Event, optional): Set to stop watching; SIGINT and SIGTERM
+            set it too when called from the main thread.
+        on_result (callable, optional): Called with each FileResult.
+
+    Returns:
+        int: The number of files processed (successfully or not).
+    """
+    stop = stop or threading.Event()
+    watcher = FolderWatcher(input_dir, settle_seconds=settle_seconds)
+    index = dedup_index(options)
+    pool = None
+    if index is None:
+        pool = worker_pool.configure(workers, start_method, _init_worker)
+        started = time.perf_counter()
+        pool.warm_up()
+        logger.info("Started %d warm worker(s) in %.2fs", workers, time.perf_counter() - started)
+    in_flight = {}
+    # Futures of a pool that has since been restarted
+    orphans = set()
+    processed = 0
+
+    def finish(result: FileResult) -> None:
+        nonlocal processed
+        processed += 1
+        if result.ok:
+            if manifest is not None:
+                manifest.record(result.doc_path, result.input_info, result.artifacts)
+            logger.info("Processed %s: %d questions in %.2fs",
+                        result.doc_path.name, result.rows, result.seconds)
+        else:
+            logger.error("Failed %s: %s", result.doc_path.name, result.error)
+        if on_result is not None:
+            on_result(result)
+
+    def restart() -> None:
+        logger.warning("Restarting the worker pool")
+        # The old pool's remaining files fail too; they must not restart it again
+        orphans.update(in_flight)
+        try:
+            pool.restart()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("Could not restart the worker pool: %s", exc)
+
+    def collect(futures) -> None:
+        broken = False
+        for future in futures:
+            path = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                # A worker died: the whole pool is broken, not just this file
+                broken = broken or (
+                    isinstance(exc, BrokenProcessPool) and future not in orphans
+                )
+                result = FileResult(path, error=f"{type(exc).__name__}: {exc}")
+            orphans.discard(future)
+            finish(result)
+        if broken and not stop.is_set():
+            restart()
+
+    def submit(path: Path) -> None:
+        try:
+            in_flight[pool.submit(process_file, path, options)] = path
+        except Exception as exc:  # pylint: disable=broad-except
+            # Report the file and keep watching with warm workers
+            finish(FileResult(path, error=f"{type(exc).__name__}: {exc}"))
+            restart()
+
+    previous = _install_stop_handlers(stop)
+    logger.info("Watching %s for DOCX files every %.1fs (Ctrl+C to stop)",
+                input_dir, poll_seconds)
+    try:
+        while not stop.is_set():
+            changed = False
+            for path in watcher.poll():
+                if path in in_flight.values():
+                    # Changed again while being processed: pick it up once it is done
+                    watcher.forget(path)
+                    continue
+                if manifest is not None and manifest.is_current(path):
+                    logger.info("Up to date, skipping: %s", path.name)
+                    continue
+                logger.info("Processing: %s", path.name)
+                if pool is None:
+                    finish(process_file(path, options))
+                    changed = True
+                else:
+                    submit(path)
+            if changed:
+                index.save()
+            if in_flight:
+                done, _ = wait(in_flight, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+                collect(done)
+            else:
+                stop.wait(poll_seconds)
+    except KeyboardInterrupt:
+        # Second signal: stop waiting; results of the files in progress are lost
+        logger.warning("Aborted with %d file(s) in progress", len(in_flight))
+        in_flight.clear()
+        if pool is not None:
+            pool.shutdown(wait=False)
+        raise
+    finally:
+        if in_flight:
+            logger.info("Waiting for %d file(s) in progress", len(in_flight))
+            collect(wait(in_flight).done)
+        if pool is not None:
+            worker_pool.shutdown()
+        if index is not None:
+            index.save()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    logger.info("Stopped watching %s after %d file(s)", input_dir, processed)
+    return processed
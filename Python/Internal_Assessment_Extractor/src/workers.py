@@ -0,0 +1,172 @@
+"""
+workers.py
+
+One long-lived process pool shared by every parallel entry point of the package
+(batch processing, parsing and cleaning), so a run pays the pool start-up cost
+once instead of on every call.
+
+The shared pool is created lazily by ``get_pool`` and shut down at interpreter
+exit; ``configure`` sets its worker count and multiprocessing start method.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tasks per worker when map() picks the chunk size itself
+CHUNKS_PER_WORKER = 4
+
+_SHARED_POOL = None
+
+
+def _noop(value=None):
+    """Task used to start the worker processes."""
+    return value
+
+
+def _check_picklable(func: Callable) -> None:
+    """Raise TypeError if ``func`` cannot be sent to a worker process."""
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError) as exc:
+        raise TypeError(
+            f"{func!r} cannot be pickled for a worker process; use a module-level "
+            "function or functools.partial instead of a lambda or closure"
+        ) from exc
+
+
+class WorkerPool:
+    """
+    A lazily started ProcessPoolExecutor with chunked mapping.
+
+    Args:
+        max_workers (int, optional): Number of worker processes (default: CPU count).
+        start_method (str, optional): 'fork', 'spawn' or 'forkserver' (default:
+            the platform default).
+        initializer (callable, optional): Picklable function run once in every
+            worker process as it starts.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: Optional[str] = None,
+                 initializer: Optional[Callable[[], None]] = None):
+        if initializer is not None:
+            _check_picklable(initializer)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self.initializer = initializer
+        self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The underlying executor, started on first use."""
+        if self._executor is None:
+            context = (
+                multiprocessing.get_context(self.start_method) if self.start_method else None
+            )
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context,
+                initializer=self.initializer
+            )
+            logger.debug(
+                "Started worker pool: %d workers (%s)", self.max_workers,
+                self.start_method or multiprocessing.get_start_method()
+            )
+        return self._executor
+
+    def submit(self, func: Callable, *args, **kwargs):
+        """
+        Submit one task and return its Future. A pool broken by a dead worker is
+        replaced once before giving up.
+        """
+        _check_picklable(func)
+        try:
+            return self.executor.submit(func, *args, **kwargs)
+        except BrokenProcessPool:
+            logger.warning("Worker pool was broken; restarting it")
+            self.shutdown(wait=False)
+            return self.executor.submit(func, *args, **kwargs)
+
+    def map(self, func: Callable, items: Iterable, chunksize: Optional[int] = None) -> List:
+        """
+        Apply ``func`` to every item in the workers and return the results in order.
+
+        Items are sent in chunks (by default about CHUNKS_PER_WORKER per worker) to
+        keep the per-task IPC overhead low.
+        """
+        _check_picklable(func)
+        items = list(items)
+        if not items:
+            return []
+        if chunksize is None:
+            chunksize = max(1, -(-len(items) // (self.max_workers * CHUNKS_PER_WORKER)))
+        try:
+            return list(self.executor.map(func, items, chunksize=chunksize))
+        except BrokenProcessPool:
+            self.shutdown(wait=False)
+            raise
+
+    def warm_up(self) -> None:
+        """Start every worker process now rather than on the first real task."""
+        futures = [self.executor.submit(_noop, idx) for idx in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def restart(self) -> None:
+        """Replace the worker processes (e.g. after one died) and warm the new ones up."""
+        self.shutdown(wait=False)
+        self.warm_up()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes; the pool restarts on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+def configure(max_workers: Optional[int] = None, start_method: Optional[str] = None,
+              initializer: Optional[Callable[[], None]] = None) -> WorkerPool:
+    """
+    Replace the shared pool with one using the given settings.
+
+    Args:
+        max_workers (int, optional): Number of worker processes (default: CPU count).
+        start_method (str, optional): Multiprocessing start method.
+        initializer (callable, optional): Run once in every worker process as it starts.
+
+    Returns:
+        WorkerPool: The new shared pool (not yet started).
+    """
+    global _SHARED_POOL  # pylint: disable=global-statement
+    if _SHARED_POOL is not None:
+        _SHARED_POOL.shutdown()
+    _SHARED_POOL = WorkerPool(max_workers, start_method, initializer)
+    return _SHARED_POOL
+
+
+def get_pool() -> WorkerPool:
+    """Return the shared pool, creating it with default settings if needed."""
+    if _SHARED_POOL is None:
+        return configure()
+    return _SHARED_POOL
+
+
+def shutdown() -> None:
+    """Shut down the shared pool if it was started."""
+    if _SHARED_POOL is not None:
+        _SHARED_POOL.shutdown()
+
+
+atexit.register(shutdown)
@@ -0,0 +1,63 @@
+"""Tests for the assessment_summary module."""
+
+import json
+import unittest
+
+import pandas as pd
+
+from src.assessment_summary import build_assessment_summary, summarize_assessment_breakdown
+
+
+def sample_frame():
+    """Return a small frame spanning two chapters with a missing subsection."""
+    return pd.DataFrame({
+        "Chapter": ["C1", "C1", "C1", "C2", "C1"],
+        "Process": ["P1", "P1", "P2", "P1", "P1"],
+        "Subsection": ["S1", "S2", None, "S1", "S1"],
+        "QuestionType": ["Unknown", "CONCEPT CHECK", "Unknown", "Unknown", "Unknown"],
+        "Questions": ["q1", "q2", "q3", "q4", ""],
+        "Answer": ["a1", "", "a3", "a4", "a5"],
+    })
+
+
+class TestAssessmentSummary(unittest.TestCase):
+    """Test case for the grouped assessment breakdown."""
+
+    def test_structure_and_counts(self):
+        """Groups keep first-appearance order and per-level counts."""
+        summary = build_assessment_summary(sample_frame())
+        self.assertEqual(
+            (summary.total_chapters, summary.total_processes, summary.total_subsections),
+            (2, 3, 3)
+        )
+        self.assertEqual((summary.total_questions, summary.total_answers), (4, 4))
+        self.assertEqual(summary.question_types, ["Unknown", "CONCEPT CHECK"])
+        chapter = summary.chapters[0]
+        self.assertEqual([process.name for process in chapter.processes], ["P1", "P2"])
+        process = chapter.processes[0]
+        self.assertEqual((process.questions, process.answers), (2, 2))
+        self.assertEqual(
+            [(sub.name, sub.questions, sub.answers) for sub in process.subsections],
+            [("S1", 1, 2), ("S2", 1, 0)]
+        )
+        self.assertEqual(chapter.processes[1].subsections, [])
+        self.assertEqual(chapter.question_types, {"Unknown": 3, "CONCEPT CHECK": 1})
+        self.assertEqual(summary.chapters[1].question_types, {"Unknown": 1, "CONCEPT CHECK": 0})
+        json.dumps(summary.to_dict())
+
+    def test_logged_breakdown(self):
+        """The breakdown is logged chapter by chapter."""
+        with self.assertLogs("src.assessment_summary", level="INFO") as logs:
+            summarize_assessment_breakdown(sample_frame().astype("category"))
+        messages = [record.getMessage() for record in logs.records]
+        self.assertEqual(messages[7:12], [
+            "Chapter: 'C1' | Processes: 2",
+            "  Process: 'P1' | Subsections: 2",
+            "    Subsection: 'S1' | Questions: 1 | Answers: 2",
+            "    Subsection: 'S2' | Questions: 1 | Answers: 0",
+            "  Process Total: Questions: 2 | Answers: 2",
+        ])
+        self.assertEqual(messages[-1], "Summary complete.")
+
+if __name__ == "__main__":
+    unittest.main()
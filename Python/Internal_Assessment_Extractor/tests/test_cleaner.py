@@ -0,0 +1,78 @@
+"""Tests for the cleaner module."""
+
+import unittest
+
+import pandas as pd
+
+from src.cleaner import clean_data, clean_question_text, clean_text_column, preprocess_data
+
+
+class TestPreprocessData(unittest.TestCase):
+    """Test case for the vectorized question/answer preprocessing."""
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "Questions": [
+                    " ASK participants:  Why? ",
+                    "display the question below on the PowerPoint Presentation. Which one?",
+                    "MULTIPLE CHOICE QUESTIONS ASK PARTICIPANTS: Pick one.",
+                    None,
+                ],
+                "Answer": [" Because. ", "This one", None, "x"],
+            },
+            index=[5, 6, 7, 8],
+        )
+
+    def test_vectorized_matches_row_cleaning(self):
+        """Each row equals the scalar cleaning of its values."""
+        result = preprocess_data(self.df)
+        self.assertEqual(
+            result["Questions"].tolist(),
+            [clean_question_text(str(q).strip()) for q in self.df["Questions"]],
+        )
+        self.assertEqual(result["Questions"].tolist()[:3], ["Why?", "Which one?", "Pick one."])
+        self.assertEqual(
+            result["Answer"].tolist(), ["Because.", "This one", str(self.df["Answer"][7]), "x"]
+        )
+        self.assertEqual(result.index.tolist(), [0, 1, 2, 3])
+
+    def test_chunked_path_matches_vectorized(self):
+        """Frames above the threshold are split into chunks with the same result."""
+        expected = preprocess_data(self.df)
+        chunked = preprocess_data(self.df, parallel_threshold=1, workers=2)
+        self.assertTrue(chunked.equals(expected))
+
+    def test_missing_column_raises(self):
+        """A frame without the required columns is rejected."""
+        with self.assertRaises(KeyError):
+            preprocess_data(pd.DataFrame({"Questions": []}))
+
+
+class TestCleanTextColumn(unittest.TestCase):
+    """Test case for the factorized whitespace normalization."""
+
+    def test_matches_per_cell_cleaning(self):
+        """Each cell equals the stripped, whitespace-collapsed original."""
+        values = [" Chapter  1 ", "Chapter 1", "Heading\t2", " Chapter  1 ", None]
+        df = clean_text_column(pd.DataFrame({"Chapter": values}), "Chapter")
+        self.assertEqual(df["Chapter"].tolist()[:4], ["Chapter 1", "Chapter 1", "Heading 2",
+                                                      "Chapter 1"])
+        self.assertTrue(pd.isna(df["Chapter"][4]))
+
+    def test_categorical_categories_are_merged(self):
+        """Categories that become equal after cleaning are merged."""
+        df = pd.DataFrame({"Style": pd.Categorical([" a ", "a", "b  c", None])})
+        style = clean_text_column(df, "Style")["Style"]
+        self.assertEqual(style.cat.categories.tolist(), ["a", "b c"])
+        self.assertEqual(style.cat.codes.tolist(), [0, 0, 1, -1])
+
+    def test_clean_data_cleans_text_columns_only(self):
+        """clean_data normalizes names and text columns and leaves numbers alone."""
+        df = clean_data(pd.DataFrame({" Questions ": ["  q  1 ", "q 2"], "Marks": [1, 2]}))
+        self.assertEqual(df.columns.tolist(), ["questions", "marks"])
+        self.assertEqual(df["questions"].tolist(), ["q 1", "q 2"])
+        self.assertEqual(df["marks"].tolist(), [1, 2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Tests for the synthetic benchmark corpus and the benchmark regression check."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from docx import Document
+
+from benchmarks.bench_suite import compare
+from benchmarks.corpus import CorpusSpec, build_document, noise_png
+from src.doc_parser import parse_document
+
+
+class TestCorpus(unittest.TestCase):
+    """Test case for generated documents and baseline comparison."""
+
+    def test_parser_finds_every_generated_question(self):
+        """Both engines extract exactly the questions the spec promises."""
+        spec = CorpusSpec(chapters=2, processes=2, subsections=1, tables=2, qa_rows=4,
+                          vertical_merges=2, media_kb=8)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "corpus.docx"
+            self.assertEqual(build_document(spec, path), spec.questions)
+            docx_rows = parse_document(path, engine="docx")
+            stream_rows = parse_document(path, engine="stream")
+            self.assertEqual(len(Document(str(path)).inline_shapes), 2)
+        self.assertEqual(len(docx_rows), spec.questions)
+        self.assertTrue(docx_rows.equals(stream_rows))
+
+    def test_scaled_spec_keeps_shape(self):
+        """Scaling changes only the number of tables."""
+        spec = CorpusSpec().scaled_to(10_000)
+        self.assertEqual((spec.chapters, spec.qa_rows), (4, 6))
+        self.assertAlmostEqual(spec.questions, 10_000, delta=spec.questions / spec.tables)
+
+    def test_noise_png_size(self):
+        """Embedded media is about the requested size."""
+        self.assertGreater(len(noise_png(64)), 64 * 1024)
+
+    def test_compare_flags_only_real_regressions(self):
+        """Slowdowns beyond tolerance and the noise floor are reported."""
+        baseline = {"results": [
+            {"size": 1, "stage": "a", "seconds": 1.0, "peak_mib": 10.0},
+            {"size": 1, "stage": "b", "seconds": 0.001, "peak_mib": 0.1},
+        ]}
+        results = [
+            {"size": 1, "stage": "a", "seconds": 1.5, "peak_mib": 10.5},
+            {"size": 1, "stage": "b", "seconds": 0.004, "peak_mib": 0.3},
+            {"size": 2, "stage": "a", "seconds": 9.0, "peak_mib": 99.0},
+        ]
+        regressions = compare(results, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("a @ 1: seconds"))
+
+
+if __name__ == "__main__":
+    unittest.main()
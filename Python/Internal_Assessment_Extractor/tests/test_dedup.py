@@ -0,0 +1,68 @@
+"""Tests for the dedup module."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.dedup import DedupIndex, normalize_question
+
+
+class TestDedupIndex(unittest.TestCase):
+    """Test case for exact and near-duplicate question ids."""
+
+    QUESTION = "What is the safe working load of a two-leg chain sling at 60 degrees?"
+
+    def test_normalization_ignores_case_spacing_and_punctuation(self):
+        """Whitespace, case and punctuation differences normalize to the same text."""
+        self.assertEqual(
+            normalize_question("  What  is\tthe LOAD? "), normalize_question("what is the load")
+        )
+
+    def test_exact_and_near_duplicates_share_an_id(self):
+        """Reworded copies get the first question's id; different questions do not."""
+        index = DedupIndex()
+        first = index.add(self.QUESTION)
+        self.assertEqual(index.add(self.QUESTION.upper() + "  "), first)
+        self.assertEqual(
+            index.add("What is the safe working load of a two leg chain sling at 60 degrees"),
+            first
+        )
+        self.assertEqual(
+            index.add("What's the safe working load of a two-leg chain sling at 60 degrees?"),
+            first
+        )
+        other = index.add("Name three hazards when operating an overhead crane near power lines.")
+        self.assertNotEqual(other, first)
+        self.assertEqual(len(index), 2)
+        self.assertIsNone(index.add("  "))
+
+    def test_lookup_does_not_grow_the_index(self):
+        """lookup only reports ids of known questions."""
+        index = DedupIndex()
+        self.assertIsNone(index.lookup(self.QUESTION))
+        self.assertEqual(len(index), 0)
+        qid = index.add(self.QUESTION)
+        self.assertEqual(index.lookup(self.QUESTION.lower()), qid)
+
+    def test_assign_ids_and_persist(self):
+        """Ids are added to a frame and survive saving and reloading the index."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "questions.npz"
+            index = DedupIndex(path)
+            df = pd.DataFrame({"questions": [self.QUESTION, None, self.QUESTION.lower()]})
+            df = index.assign_ids(df)
+            self.assertEqual(df["question_id"][0], df["question_id"][2])
+            self.assertTrue(pd.isna(df["question_id"][1]))
+            index.save()
+
+            reloaded = DedupIndex(path)
+            self.assertEqual(len(reloaded), 1)
+            self.assertEqual(reloaded.lookup(self.QUESTION + "!"), df["question_id"][0])
+            reworded = "What is the safe working load of a 2-leg chain sling at 60 degrees?"
+            self.assertEqual(reloaded.add(reworded), df["question_id"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
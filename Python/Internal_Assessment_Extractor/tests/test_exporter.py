@@ -0,0 +1,76 @@
+"""Tests for the exporter module."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from docx import Document
+from docx.shared import Inches
+
+from src.exporter import export_to_excel, export_to_word
+
+
+class TestExportToWord(unittest.TestCase):
+    """Test case for the bulk Word exporter."""
+
+    def test_cells_match_assigned_text(self):
+        """Each cell holds what python-docx would write for the same text."""
+        df = pd.DataFrame({"Questions": [" a\tb\nc ", "x<&>y", ""], "Marks": [1, 2, 3]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "out.docx"
+            export_to_word(df, path)
+            table = Document(str(path)).tables[0]
+
+            expected = Document().add_table(rows=1, cols=2).rows[0].cells[0]
+            expected.text = " a\tb\nc "
+            self.assertEqual(table.rows[1].cells[0]._tc.xml, expected._tc.xml)
+            self.assertEqual(
+                [[cell.text for cell in row.cells] for row in table.rows],
+                [["Questions", "Marks"], [" a\tb\nc ", "1"], ["x<&>y", "2"], ["", "3"]]
+            )
+
+    def test_header_style_and_widths(self):
+        """Header bolding and column widths apply to the header and every row."""
+        df = pd.DataFrame({"a": ["1", "2"], "b": ["3", "4"]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "out.docx"
+            export_to_word(df, path, header_bold=True, column_widths=[Inches(1), Inches(4)])
+            table = Document(str(path)).tables[0]
+            self.assertTrue(table.rows[0].cells[0].paragraphs[0].runs[0].bold)
+            self.assertIsNone(table.rows[1].cells[0].paragraphs[0].runs[0].bold)
+            self.assertEqual([column.width for column in table.columns], [Inches(1), Inches(4)])
+            self.assertEqual([cell.width for cell in table.rows[2].cells], [Inches(1), Inches(4)])
+
+
+class TestExportToExcel(unittest.TestCase):
+    """Test case for the streaming Excel exporter."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "Chapter": pd.Categorical(["One", "Two", "One", None]),
+            "Questions": ["q1", "q2", "q3", None],
+            "Marks": [1, 2, 3, 4],
+        })
+
+    def test_single_sheet_matches_to_excel(self):
+        """A DataFrame reads back the same as one written by DataFrame.to_excel."""
+        with tempfile.TemporaryDirectory() as tmp:
+            expected, streamed = Path(tmp) / "expected.xlsx", Path(tmp) / "streamed.xlsx"
+            self.df.to_excel(expected, index=False)
+            export_to_excel(self.df, streamed)
+            self.assertTrue(pd.read_excel(streamed).equals(pd.read_excel(expected)))
+
+    def test_chunks_split_across_sheets(self):
+        """Chunks are split into one sheet per value, continuing on full sheets."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "split.xlsx"
+            export_to_excel(iter([self.df, self.df]), path, split_by="Chapter",
+                            max_rows_per_sheet=3)
+            sheets = pd.read_excel(path, sheet_name=None)
+            self.assertEqual(list(sheets), ["One", "Two", "(blank)", "One (2)"])
+            self.assertEqual([len(sheet) for sheet in sheets.values()], [3, 2, 2, 1])
+            self.assertEqual(sheets["Two"]["Questions"].tolist(), ["q2", "q2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests for the injector module."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+from docx import Document
+
+from src import injector
+
+
+def build_template(path, rows=3, cols=2):
+    """Save a template with a heading paragraph and one table."""
+    doc = Document()
+    doc.add_paragraph("Answer sheet")
+    doc.add_table(rows=rows, cols=cols)
+    doc.save(str(path))
+
+
+class TestInjector(unittest.TestCase):
+    """Test case for batch injection with the template cache."""
+
+    def setUp(self):
+        injector.clear_template_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.template = self.dir / "template.docx"
+        build_template(self.template)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_inject_dataframe_region(self):
+        """A DataFrame fills the region below a header row in one save."""
+        df = pd.DataFrame({"Questions": ["q1", "q2"], "Answer": ["a1", None]})
+        out = self.dir / "out.docx"
+        count = injector.inject_dataframe(self.template, df, out, start_row=0, header=True)
+        self.assertEqual(count, 6)
+        table = Document(str(out)).tables[0]
+        self.assertEqual(
+            [[cell.text for cell in row.cells] for row in table.rows],
+            [["Questions", "Answer"], ["q1", "a1"], ["q2", ""]]
+        )
+
+    def test_fills_do_not_leak_between_outputs(self):
+        """Each fill starts from the pristine template."""
+        first, second = self.dir / "first.docx", self.dir / "second.docx"
+        injector.inject_cells(self.template, [(0, 0, 0, "only first")], first)
+        injector.inject_cells(self.template, [(0, 1, 1, "only second")], second)
+        table = Document(str(second)).tables[0]
+        self.assertEqual(table.cell(0, 0).text, "")
+        self.assertEqual(table.cell(1, 1).text, "only second")
+        self.assertEqual(Document(str(second)).paragraphs[0].text, "Answer sheet")
+
+    def test_loaded_documents_are_independent(self):
+        """A Document loaded earlier keeps its own body after the template is loaded again."""
+        first = injector.load_template(self.template)
+        first.tables[0].cell(0, 0).text = "first"
+        second = injector.load_template(self.template)
+        second.tables[0].cell(0, 0).text = "second"
+        out = self.dir / "first.docx"
+        first.save(str(out))
+        self.assertEqual(Document(str(out)).tables[0].cell(0, 0).text, "first")
+
+    def test_template_is_parsed_once(self):
+        """Later loads copy the cached Document instead of opening the package again."""
+        with mock.patch.object(injector, "Document", wraps=Document) as opened:
+            first = injector.load_template(self.template)
+            second = injector.load_template(self.template)
+        opened.assert_called_once()
+        self.assertIsNot(first.element, second.element)
+        self.assertEqual(first.element.xml, second.element.xml)
+
+    def test_changed_template_is_reloaded(self):
+        """Editing the template file invalidates the cached copy."""
+        injector.inject_cells(self.template, [(0, 0, 0, "x")], self.dir / "a.docx")
+        build_template(self.template, rows=1, cols=1)
+        stat = os.stat(self.template)
+        os.utime(self.template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        with self.assertRaises(IndexError):
+            injector.inject_cells(self.template, [(0, 2, 0, "x")], self.dir / "b.docx")
+
+    def test_single_cell_wrapper(self):
+        """The single-cell API keeps its bounds and missing-template errors."""
+        out = self.dir / "single.docx"
+        injector.inject_data_into_table_cell(str(self.template), 2, 1, "value", str(out))
+        self.assertEqual(Document(str(out)).tables[0].cell(2, 1).text, "value")
+        with self.assertRaises(IndexError):
+            injector.inject_data_into_table_cell(str(self.template), 3, 0, "x", str(out))
+        with self.assertRaises(FileNotFoundError):
+            injector.inject_data_into_table_cell("missing.docx", 0, 0, "x", str(out))
+
+if __name__ == "__main__":
+    unittest.main()
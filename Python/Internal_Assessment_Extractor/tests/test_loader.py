@@ -0,0 +1,101 @@
+"""Tests for the loader module and the line-based and columnar exporters."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.exporter import EXPORT_FORMATS, pa
+from src.loader import load_export, load_exports
+
+
+def sample_frame():
+    """Return a small cleaned-style frame."""
+    return pd.DataFrame({
+        "questiontype": pd.Categorical(["Unknown", "CONCEPT CHECK", "Unknown"]),
+        "questions": ["Why?", "Name two, \"tools\".", "Ünïcode?"],
+        "answer": ["Because.", "hammer\nsaw", "yes"],
+        "chapter": ["One", "One", "Two"],
+    })
+
+
+class TestExportRoundTrip(unittest.TestCase):
+    """Test case for writing exports and loading them back."""
+
+    def _round_trip(self, fmt):
+        suffix, writer = EXPORT_FORMATS[fmt]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / f"export{suffix}"
+            # Written as chunks to exercise the streaming path
+            writer(iter([sample_frame()[:2], sample_frame()[2:]]), path)
+            loaded = load_export(path)
+            both = load_exports([path, path], columns=["questions", "chapter"])
+        expected = sample_frame()
+        self.assertEqual(loaded.astype(str).values.tolist(), expected.astype(str).values.tolist())
+        self.assertEqual(loaded["chapter"].dtype, "category")
+        self.assertEqual(list(both.columns), ["questions", "chapter"])
+        self.assertEqual(len(both), 6)
+
+    def test_csv(self):
+        """CSV exports round-trip."""
+        self._round_trip("csv")
+
+    def test_jsonl(self):
+        """JSONL exports round-trip."""
+        self._round_trip("jsonl")
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_parquet(self):
+        """Parquet exports round-trip."""
+        self._round_trip("parquet")
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_arrow(self):
+        """Arrow IPC exports round-trip."""
+        self._round_trip("arrow")
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_columnar_chunks_with_new_categories_and_values(self):
+        """Later chunks may have over 127 categories, or values where the first had nulls."""
+        first = pd.DataFrame({
+            "answer": [None] * 10,
+            "subsection": [f"Section {idx % 5}" for idx in range(10)],
+        })
+        rest = pd.DataFrame({
+            "answer": [f"Answer {idx}" for idx in range(300)],
+            "subsection": [f"Section {idx}" for idx in range(300)],
+        })
+        expected = pd.concat([first, rest], ignore_index=True)
+        for fmt in ("parquet", "arrow"):
+            suffix, writer = EXPORT_FORMATS[fmt]
+            with self.subTest(fmt=fmt), tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / f"export{suffix}"
+                writer(iter([first, rest]), path)
+                loaded = load_export(path)
+                self.assertEqual(loaded["subsection"].tolist(), expected["subsection"].tolist())
+                self.assertEqual(loaded["answer"].tolist()[10:], expected["answer"].tolist()[10:])
+                self.assertTrue(loaded["answer"][:10].isna().all())
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_failed_columnar_export_leaves_no_file(self):
+        """An error mid-stream is raised as is and the partial file is removed."""
+        def chunks():
+            yield sample_frame()
+            raise RuntimeError("source failed")
+
+        for fmt in ("parquet", "arrow"):
+            suffix, writer = EXPORT_FORMATS[fmt]
+            with self.subTest(fmt=fmt), tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / f"export{suffix}"
+                with self.assertRaisesRegex(RuntimeError, "source failed"):
+                    writer(chunks(), path)
+                self.assertFalse(path.exists())
+
+    def test_unknown_suffix(self):
+        """Files that are not exports are rejected."""
+        with self.assertRaises(ValueError):
+            load_export("questions.txt")
+
+if __name__ == "__main__":
+    unittest.main()
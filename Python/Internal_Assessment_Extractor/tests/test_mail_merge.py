@@ -0,0 +1,124 @@
+"""Tests for the mail_merge module."""
+
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import pandas as pd
+from docx import Document
+
+from src import injector, mail_merge
+
+
+def build_template(path):
+    """Save a template with placeholders in a paragraph, a split run and a table row."""
+    doc = Document()
+    doc.add_paragraph("Chapter: {{Chapter}}")
+    split = doc.add_paragraph("Process: ")
+    split.add_run("{{Pro")
+    split.add_run("cess}} (")
+    split.add_run("{{ Marks }})")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Question"
+    table.cell(0, 1).text = "Answer"
+    table.cell(1, 0).text = "{{Questions}}"
+    table.cell(1, 1).text = "{{Answer}}"
+    doc.save(str(path))
+
+
+def table_rows(path):
+    """Return the text of the first table of a document, row by row."""
+    table = Document(str(path)).tables[0]
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+
+class TestMailMerge(unittest.TestCase):
+    """Test case for indexed template rendering."""
+
+    def setUp(self):
+        injector.clear_template_cache()
+        mail_merge._INDEXES.clear()  # pylint: disable=protected-access
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.template = self.dir / "template.docx"
+        build_template(self.template)
+        self.df = pd.DataFrame({
+            "Chapter": ["Safety", "Safety", "Tools"],
+            "Process": ["Lifting", "Lifting", "Cutting"],
+            "Marks": ["1", "2", None],
+            "Questions": ["q1", "q2", "q3"],
+            "Answer": ["a1", "a2", "a3"],
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_index_finds_split_placeholders(self):
+        """Placeholders split across runs are indexed under their field name."""
+        self.assertEqual(
+            mail_merge.find_placeholders(self.template),
+            ["Answer", "Chapter", "Marks", "Process", "Questions"]
+        )
+
+    def test_one_document_per_row(self):
+        """Each row renders its own document with every slot filled."""
+        paths = mail_merge.render_documents(self.template, self.df, self.dir / "out", workers=1)
+        self.assertEqual([path.name for path in paths], ["00000.docx", "00001.docx", "00002.docx"])
+        doc = Document(str(paths[2]))
+        self.assertEqual(doc.paragraphs[0].text, "Chapter: Tools")
+        self.assertEqual(doc.paragraphs[1].text, "Process: Cutting ()")
+        self.assertEqual(table_rows(paths[2]), [["Question", "Answer"], ["q3", "a3"]])
+        self.assertEqual(Document(str(paths[0])).paragraphs[1].text, "Process: Lifting (1)")
+
+    def test_group_repeats_table_rows(self):
+        """With group_by, placeholder rows repeat once per record of the group."""
+        paths = mail_merge.render_documents(
+            self.template, self.df, self.dir / "out", filename="{Chapter}.docx",
+            group_by="Chapter", workers=1
+        )
+        self.assertEqual([path.name for path in paths], ["Safety.docx", "Tools.docx"])
+        self.assertEqual(
+            table_rows(paths[0]), [["Question", "Answer"], ["q1", "a1"], ["q2", "a2"]]
+        )
+        self.assertEqual(Document(str(paths[0])).paragraphs[0].text, "Chapter: Safety")
+
+    def test_missing_fields_raise_unless_lenient(self):
+        """Template fields absent from the data are an error unless strict is off."""
+        df = self.df.drop(columns=["Answer"])
+        with self.assertRaises(ValueError):
+            mail_merge.render_documents(self.template, df, self.dir / "out", workers=1)
+        paths = mail_merge.render_documents(
+            self.template, df, self.dir / "out", workers=1, strict=False
+        )
+        self.assertEqual(table_rows(paths[0])[1], ["q1", ""])
+
+    def test_duplicate_file_names_raise(self):
+        """A file name pattern that collides is rejected before rendering."""
+        with self.assertRaises(ValueError):
+            mail_merge.render_documents(
+                self.template, self.df, self.dir / "out", filename="{Chapter}.docx", workers=1
+            )
+
+    def test_index_column_does_not_clash_with_document_number(self):
+        """A data column named index leaves {index} as the document number."""
+        df = self.df.assign(index=["x", "y", "z"])
+        paths = mail_merge.render_documents(
+            self.template, df, self.dir / "out", filename="{index}-{Questions}.docx", workers=1
+        )
+        self.assertEqual([path.name for path in paths], ["0-q1.docx", "1-q2.docx", "2-q3.docx"])
+
+    def test_workers_sizes_a_dedicated_pool(self):
+        """With workers > 1, batches render in a pool of that size."""
+        df = pd.concat([self.df] * 12, ignore_index=True)
+        with unittest.mock.patch.object(
+            mail_merge, "WorkerPool", wraps=mail_merge.WorkerPool
+        ) as pool_class:
+            paths = mail_merge.render_documents(self.template, df, self.dir / "out", workers=2)
+        pool_class.assert_called_once_with(2)
+        self.assertEqual(len(paths), 36)
+        self.assertEqual(table_rows(paths[35])[1], ["q3", "a3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
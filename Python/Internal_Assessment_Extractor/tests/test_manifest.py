@@ -0,0 +1,44 @@
+"""Tests for the manifest module."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.manifest import BatchManifest
+
+
+class TestBatchManifest(unittest.TestCase):
+    """Test case for the incremental batch manifest."""
+
+    def _record(self, tmp, version="v1"):
+        """Record one input with one artifact and return their paths."""
+        doc = Path(tmp) / "guide.docx"
+        doc.write_bytes(b"original")
+        artifact = Path(tmp) / "guide_cleaned.xlsx"
+        artifact.write_bytes(b"artifact")
+        manifest = BatchManifest(tmp, version)
+        manifest.record(doc, BatchManifest.stat_input(doc), [artifact])
+        return doc, artifact
+
+    def test_unchanged_input_is_current(self):
+        """A recorded file is current, even after its timestamp alone changes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            doc, _ = self._record(tmp)
+            self.assertTrue(BatchManifest(tmp, "v1").is_current(doc))
+            os.utime(doc, ns=(0, 0))
+            self.assertTrue(BatchManifest(tmp, "v1").is_current(doc))
+
+    def test_changes_make_input_stale(self):
+        """Edited inputs, missing artifacts and new pipeline versions are stale."""
+        with tempfile.TemporaryDirectory() as tmp:
+            doc, artifact = self._record(tmp)
+            self.assertFalse(BatchManifest(tmp, "v2").is_current(doc))
+            doc.write_bytes(b"modified")
+            self.assertFalse(BatchManifest(tmp, "v1").is_current(doc))
+            doc, artifact = self._record(tmp)
+            artifact.unlink()
+            self.assertFalse(BatchManifest(tmp, "v1").is_current(doc))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the metrics module."""
+
+import csv
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.doc_parser import parse_document
+from src.metrics import StageRecorder, write_metrics
+from tests.test_doc_parser import build_sample_document
+
+
+class TestMetrics(unittest.TestCase):
+    """Test case for stage recording and metrics files."""
+
+    def test_stages_are_timed_separately(self):
+        """Each stage gets its own wall time and the progress callback sees it start."""
+        started = []
+        recorder = StageRecorder("doc.docx", lambda idx, name: started.append((idx, name)))
+        with recorder.stage("Parsing"):
+            time.sleep(0.05)
+        with recorder.stage("Cleaning"):
+            pass
+        parsing, cleaning = recorder.metrics.stages
+        self.assertEqual(started, [(0, "Parsing"), (1, "Cleaning")])
+        self.assertGreaterEqual(parsing.wall_seconds, 0.05)
+        self.assertLess(cleaning.wall_seconds, 0.05)
+        self.assertLess(parsing.cpu_seconds, parsing.wall_seconds)
+
+    def test_cpu_time_excludes_other_threads(self):
+        """A stage is not charged for CPU burnt by a concurrent thread."""
+        stop = threading.Event()
+
+        def burn():
+            while not stop.is_set():
+                sum(range(1000))
+
+        burner = threading.Thread(target=burn)
+        burner.start()
+        recorder = StageRecorder("doc.docx")
+        try:
+            with recorder.stage("Exporting"):
+                time.sleep(0.2)
+        finally:
+            stop.set()
+            burner.join()
+        self.assertLess(recorder.metrics.stages[0].cpu_seconds, 0.05)
+
+    def test_failed_stage_is_still_recorded(self):
+        """A stage that raises is measured before the error propagates."""
+        recorder = StageRecorder("doc.docx")
+        with self.assertRaises(RuntimeError):
+            with recorder.stage("Parsing"):
+                raise RuntimeError("boom")
+        self.assertEqual(recorder.metrics.stages[0].stage, "Parsing")
+
+    def test_parser_counters(self):
+        """parse_document reports what it visited and what it dropped."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.docx"
+            build_sample_document(path)
+            stats = {}
+            df = parse_document(path, stats=stats)
+        self.assertEqual(stats["questions"], len(df))
+        self.assertEqual(stats["qa_found"] - stats["duplicates_dropped"], len(df))
+        self.assertGreater(stats["cells"], 0)
+        self.assertGreater(stats["paragraphs"], 0)
+
+    def test_write_json_and_csv(self):
+        """Metrics files hold one entry per stage plus per-file totals and counters."""
+        recorder = StageRecorder("doc.docx")
+        for name in ("Parsing", "Exporting"):
+            with recorder.stage(name):
+                pass
+        recorder.counters["questions"] = 5
+        with tempfile.TemporaryDirectory() as tmp:
+            data = json.loads(write_metrics([recorder.metrics], Path(tmp) / "m.json").read_text())
+            self.assertEqual(len(data["files"][0]["stages"]), 2)
+            self.assertEqual(data["files"][0]["counters"], {"questions": 5})
+            with open(write_metrics([recorder.metrics], Path(tmp) / "m.csv"),
+                      encoding="utf-8") as handle:
+                rows = list(csv.DictReader(handle))
+            self.assertEqual([row["stage"] for row in rows], ["Parsing", "Exporting", "Total"])
+            self.assertEqual(rows[-1]["questions"], "5")
+            with self.assertRaises(ValueError):
+                write_metrics([recorder.metrics], Path(tmp) / "m.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Tests for the parse_cache module."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.parse_cache import ParseCache
+from tests.test_doc_parser import build_sample_document
+
+
+class TestParseCache(unittest.TestCase):
+    """Test case for the content-addressed parse cache."""
+
+    def test_second_parse_is_a_hit(self):
+        """An unchanged file is served from the cache with identical rows."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.docx"
+            build_sample_document(path)
+            cache = ParseCache(Path(tmp) / "cache")
+            first = cache.parse(path)
+            second = cache.parse(path)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertTrue(first.equals(second))
+            # The stream engine has its own fingerprint, so it is a separate entry
+            cache.parse(path, engine="stream")
+            self.assertEqual(cache.misses, 2)
+
+    def test_eviction_keeps_cache_within_budget(self):
+        """Entries beyond the size budget are evicted."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.docx"
+            build_sample_document(path)
+            cache = ParseCache(Path(tmp) / "cache", max_bytes=1)
+            cache.parse(path)
+            self.assertEqual(list((Path(tmp) / "cache").iterdir()), [])
+
+if __name__ == "__main__":
+    unittest.main()
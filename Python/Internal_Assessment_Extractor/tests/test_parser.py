@@ -1,13 +1,47 @@
-"""Placeholder tests for doc_parser module."""
+"""Tests for the Q&A marker scanning used by the doc_parser module."""
 
 import unittest
 
+from src.doc_parser import extract_question_answer
+from src.markers import MarkerScanner
+
+
 class TestDocParser(unittest.TestCase):
-    """Placeholder test case for doc_parser."""
+    """Test case for doc_parser marker scanning."""
 
     def test_placeholder(self):
         """Placeholder test."""
         self.assertTrue(True)
 
+    def test_scan_reports_embedded_markers(self):
+        """A marker inside a longer marker is reported alongside it."""
+        text = "Challenges Concept Check\nASK participants: Why? answer: Because."
+        hits = [(hit.name, hit.start) for hit in MarkerScanner().scan(text)]
+        self.assertEqual(hits, [
+            ("challenges_concept_check", 0),
+            ("concept_check", 11),
+            ("ask", 25),
+            ("answer", 48),
+        ])
+
+    def test_segments_use_configured_vocabulary(self):
+        """Segments run from the end of each marker to the start of the next."""
+        scanner = MarkerScanner({"ask": "Q:", "answer": "A:"})
+        text = "q: Which colour? A: Blue"
+        self.assertEqual(
+            [(seg.name, text[seg.start:seg.end].strip()) for seg in scanner.segments(text)],
+            [("ask", "Which colour?"), ("answer", "Blue")],
+        )
+
+    def test_extract_question_answer(self):
+        """Question, answer and type are cut from the cell text."""
+        self.assertEqual(
+            extract_question_answer(
+                "CHALLENGES CONCEPT CHECK ASK participants: Why? ANSWER: Because."
+            ),
+            ("Why?", "Because.", "Challenges Concept Check Question"),
+        )
+        self.assertEqual(extract_question_answer("ANSWER: only"), (None, "only", None))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+"""Tests for the pipeline module."""
+
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from src.pipeline import PipelineOptions, process_file
+from tests.test_doc_parser import build_sample_document
+
+
+class TestProcessFile(unittest.TestCase):
+    """Test case for the per-file workflow."""
+
+    def test_process_file_writes_artifacts(self):
+        """A valid document is exported and reported with its row count."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.docx"
+            build_sample_document(path)
+            stages = []
+            with redirect_stdout(StringIO()):
+                result = process_file(
+                    path, PipelineOptions(Path(tmp), record_input=True),
+                    lambda idx, stage: stages.append(stage)
+                )
+            self.assertTrue(result.ok)
+            self.assertGreater(result.rows, 0)
+            self.assertEqual(stages, ["Parsing", "Summarizing", "Cleaning", "Exporting"])
+            self.assertTrue(all(artifact.exists() for artifact in result.artifacts))
+            self.assertIn("sha256", result.input_info)
+            self.assertEqual([stage.stage for stage in result.metrics.stages], stages)
+            self.assertEqual(result.metrics.counters["questions"], result.rows)
+
+    def test_stage_profiles_are_written(self):
+        """With a profile directory every stage leaves a cProfile file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.docx"
+            build_sample_document(path)
+            options = PipelineOptions(
+                Path(tmp), formats=("csv",), trace_memory=True, profile_dir=Path(tmp) / "prof"
+            )
+            with redirect_stdout(StringIO()):
+                result = process_file(path, options)
+            self.assertTrue(result.ok)
+            self.assertEqual(len(list((Path(tmp) / "prof").glob("sample.*.prof"))), 4)
+            self.assertTrue(all(stage.traced_peak_mib > 0 for stage in result.metrics.stages))
+
+    def test_failure_is_reported_not_raised(self):
+        """A corrupt document yields a failed result instead of an exception."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "broken.docx"
+            path.write_bytes(b"not a zip file")
+            with self.assertLogs("src.pipeline", level="ERROR"):
+                result = process_file(path, PipelineOptions(Path(tmp)))
+            self.assertFalse(result.ok)
+            self.assertIsNotNone(result.error)
+            self.assertEqual(result.artifacts, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Tests for the question_bank module."""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.question_bank import QUESTION_COLUMNS, QuestionBank, fts_query, main
+
+
+def frame(chapters, prefix="q"):
+    """Return a cleaned-style frame with one question per chapter value."""
+    return pd.DataFrame({
+        "questiontype": ["Short Answer"] * len(chapters),
+        "questions": [f"{prefix}{idx}" for idx in range(len(chapters))],
+        "answer": ["a"] * (len(chapters) - 1) + [None],
+        "chapter": chapters,
+        "process": ["P1"] * len(chapters),
+        "extra": [1] * len(chapters),
+    })
+
+
+class TestQuestionBank(unittest.TestCase):
+    """Test case for storing and querying parsed questions."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.bank = QuestionBank(self.dir / "bank.db")
+
+    def tearDown(self):
+        self.bank.close()
+        self.tmp.cleanup()
+
+    def test_store_and_query_across_documents(self):
+        """Chapter queries return rows of every document, in order."""
+        self.bank.store(self.dir / "a.docx", frame(["One", "Two", "One"]), sha256="aaa")
+        self.bank.store(self.dir / "b.docx", frame(["One"], prefix="b"), sha256="bbb")
+        result = self.bank.query(chapter="One")
+        self.assertEqual(result["question"].tolist(), ["q0", "q2", "b0"])
+        self.assertEqual(result["document"].map(lambda p: Path(p).name).tolist(),
+                         ["a.docx", "a.docx", "b.docx"])
+        self.assertTrue(pd.isna(result["answer"].iloc[-1]))
+        self.assertTrue(pd.isna(result["marks"].iloc[0]))
+        counts = self.bank.counts("chapter")
+        self.assertEqual(counts.to_dict("list"), {
+            "chapter": ["One", "Two"], "questions": [3, 1], "documents": [2, 1]
+        })
+
+    def test_restoring_a_document_replaces_its_rows(self):
+        """A new version of a path and repeated content hashes do not duplicate rows."""
+        path = self.dir / "a.docx"
+        self.bank.store(path, frame(["One", "Two"]), sha256="v1")
+        self.bank.store(path, frame(["Three"]), sha256="v2")
+        self.bank.store(path, frame(["Three"]), sha256="v2")
+        self.assertEqual(self.bank.stats(), {"documents": 1, "questions": 1})
+        self.assertTrue(self.bank.has_document("v2"))
+        self.assertFalse(self.bank.has_document("v1"))
+        self.assertEqual(self.bank.remove_document(path), 1)
+        self.assertEqual(self.bank.stats(), {"documents": 0, "questions": 0})
+
+    def test_invalid_filter_raises(self):
+        """Only indexed columns can be filtered on."""
+        with self.assertRaises(ValueError):
+            self.bank.query(answer="a")
+
+    def test_cli_counts(self):
+        """The command line prints per-chapter counts."""
+        self.bank.store(self.dir / "a.docx", frame(["One", "Two"]), sha256="aaa")
+        bank = str(self.dir / "bank.db")
+        self.assertEqual(main([bank, "query", "--count-by", "chapter", "--csv"]), 0)
+        self.assertEqual(main([bank, "search", "q0", "--chapter", "One"]), 0)
+        self.assertEqual(main([str(self.dir / "missing.db"), "query"]), 1)
+
+    def test_search_ranks_and_filters(self):
+        """Hits contain every word, question matches rank first, filters apply."""
+        df = pd.DataFrame({
+            "questions": [
+                "ASK participants: Inspect the chain sling before lifting?",
+                "What does a sling tag show?",
+                "Name a lifting accessory.",
+            ],
+            "answer": ["Check links", "Safe working load", "A chain sling"],
+            "chapter": ["Rigging", "Rigging", "Cranes"],
+        })
+        self.bank.store(self.dir / "a.docx", df, sha256="aaa")
+        hits = self.bank.search("Chain SLING")
+        self.assertEqual(hits["position"].tolist(), [0, 2])
+        self.assertIn("[chain]", hits["snippet"][0])
+        self.assertEqual(self.bank.search("sling", chapter="Cranes")["position"].tolist(), [2])
+        self.assertEqual(sorted(self.bank.search("lift*")["position"]), [0, 2])
+        # Instruction phrases removed by cleaning are not indexed
+        self.assertTrue(self.bank.search("participants").empty)
+
+    def test_search_index_follows_replaced_documents(self):
+        """Re-storing a document drops its old text from the index."""
+        path = self.dir / "a.docx"
+        self.bank.store(path, pd.DataFrame({"questions": ["old wording"]}), sha256="v1")
+        self.bank.store(path, pd.DataFrame({"questions": ["new wording"]}), sha256="v2")
+        self.assertTrue(self.bank.search("old").empty)
+        self.assertEqual(len(self.bank.search("wording")), 1)
+
+    def test_schema_2_bank_is_upgraded(self):
+        """Older banks get explicit question ids, and search survives a VACUUM."""
+        path = self.dir / "old.db"
+        conn = sqlite3.connect(str(path))
+        conn.executescript(f"""
+            CREATE TABLE documents (
+                doc_id INTEGER PRIMARY KEY, sha256 TEXT NOT NULL UNIQUE,
+                path TEXT NOT NULL, rows INTEGER NOT NULL, stored_at REAL NOT NULL
+            );
+            CREATE TABLE questions (
+                doc_id INTEGER NOT NULL, position INTEGER NOT NULL,
+                {", ".join(f"{column} TEXT" for column in QUESTION_COLUMNS)},
+                PRIMARY KEY (doc_id, position)
+            );
+            CREATE INDEX questions_chapter ON questions (chapter);
+            INSERT INTO documents VALUES (1, 'aaa', 'a.docx', 2, 0);
+            INSERT INTO questions (doc_id, position, question, chapter)
+                VALUES (1, 0, 'chain sling', 'Rigging'), (1, 1, 'hook', 'Cranes');
+            PRAGMA user_version = 2;
+        """)
+        conn.close()
+        with QuestionBank(path) as bank:
+            self.assertEqual(bank.conn.execute("PRAGMA user_version").fetchone()[0], 3)
+            self.assertEqual(bank.search("sling")["position"].tolist(), [0])
+            self.assertEqual(bank.query(chapter="Cranes")["question"].tolist(), ["hook"])
+            bank.store(self.dir / "b.docx", pd.DataFrame({"questions": ["sling tag"]}),
+                       sha256="bbb")
+            bank.remove_document("a.docx")
+            bank.conn.execute("VACUUM")
+            self.assertEqual(bank.search("sling")["question"].tolist(), ["sling tag"])
+
+    def test_fts_query_quotes_words(self):
+        """Free text becomes quoted FTS5 terms; syntax characters are dropped."""
+        self.assertEqual(fts_query('sling "AND" lift* -x'), '"sling" "AND" "lift"* "x"')
+        with self.assertRaises(ValueError):
+            fts_query("?!")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""Tests for the records module."""
+
+import unittest
+
+from src.records import CATEGORY_COLUMNS, COLUMNS, QuestionTable
+
+CHAPTER_ONE = ("Chapter 1", "heading 1", "", "", "", "")
+PROCESS_A = ("Chapter 1", "heading 1", "Process A", "heading 2", "", "")
+
+
+class TestQuestionTable(unittest.TestCase):
+    """Test case for the compact question accumulator."""
+
+    def test_to_frame_matches_appended_rows(self):
+        """Rows come back in order, with categorical hierarchy columns."""
+        table = QuestionTable()
+        table.append("Unknown", "q1", "a1", CHAPTER_ONE)
+        table.append("CONCEPT CHECK", "q2", "", PROCESS_A)
+        table.append("Unknown", "q3", "a3", CHAPTER_ONE)
+        df = table.to_frame()
+        self.assertEqual(list(df.columns), list(COLUMNS))
+        for column in CATEGORY_COLUMNS:
+            self.assertEqual(df[column].dtype, "category", column)
+        self.assertEqual(df["Process"].tolist(), ["", "Process A", ""])
+        self.assertEqual(df["QuestionType"].tolist(), ["Unknown", "CONCEPT CHECK", "Unknown"])
+        self.assertEqual(df["Marks"].tolist(), ["/1"] * 3)
+        self.assertEqual(df["Questions"].tolist(), ["q1", "q2", "q3"])
+        self.assertEqual(df["Chapter"].cat.categories.tolist(), ["Chapter 1"])
+
+    def test_empty_table_keeps_columns(self):
+        """A document without questions still yields the expected columns."""
+        df = QuestionTable().to_frame()
+        self.assertEqual(df.shape, (0, len(COLUMNS)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for the staged batch runner."""
+
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from src.pipeline import STAGES, PipelineOptions
+from src.question_bank import QuestionBank
+from src.staged import MemoryBudget, run_staged
+from tests.test_doc_parser import build_sample_document
+
+
+class TestRunStaged(unittest.TestCase):
+    """Test case for files flowing through concurrent stages."""
+
+    def test_every_file_is_reported(self):
+        """Good files are exported and a broken one fails without stopping the rest."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name in ("one", "two", "three"):
+                paths.append(Path(tmp) / f"{name}.docx")
+                build_sample_document(paths[-1])
+            broken = Path(tmp) / "broken.docx"
+            broken.write_bytes(b"not a zip file")
+            reported = []
+            with redirect_stdout(StringIO()), self.assertLogs("src.pipeline", level="ERROR"):
+                results = run_staged(
+                    paths[:2] + [broken] + paths[2:], PipelineOptions(Path(tmp)),
+                    workers=(2, 1, 2), queue_size=1, on_result=reported.append
+                )
+            self.assertEqual(reported, results)
+            by_name = {result.doc_path.name: result for result in results}
+            self.assertEqual(len(by_name), 4)
+            self.assertFalse(by_name["broken.docx"].ok)
+            self.assertEqual(by_name["broken.docx"].artifacts, [])
+            for path in paths:
+                result = by_name[path.name]
+                self.assertTrue(result.ok)
+                self.assertGreater(result.rows, 0)
+                self.assertTrue(all(artifact.exists() for artifact in result.artifacts))
+                self.assertEqual([stage.stage for stage in result.metrics.stages], STAGES)
+
+    def test_memory_cap_and_bank(self):
+        """A tiny cap still lets every file through; the bank is written from export threads."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"doc{idx}.docx" for idx in range(3)]
+            build_sample_document(paths[0])
+            # Copies, since a save in another second would change the content hash
+            for path in paths[1:]:
+                path.write_bytes(paths[0].read_bytes())
+            options = PipelineOptions(
+                Path(tmp), formats=("csv",), record_input=True,
+                question_bank=Path(tmp) / "bank.sqlite"
+            )
+            with redirect_stdout(StringIO()):
+                results = run_staged(paths, options, workers=(2, 1, 2), max_in_flight_bytes=1)
+            self.assertTrue(all(result.ok for result in results))
+            for result in results:
+                self.assertEqual(result.metrics.counters["bank_rows"], result.rows)
+            with QuestionBank(options.question_bank) as bank:
+                # The documents are identical, so the bank keeps them as one
+                self.assertEqual(bank.stats(), {"documents": 1, "questions": results[0].rows})
+
+    def test_failure_before_parsing_does_not_hang(self):
+        """A file that fails before it has a FileRun is still reported as failed."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / "one.docx", Path(tmp) / "two.docx"]
+            with mock.patch("src.staged.FileRun", side_effect=RuntimeError("boom")), \
+                    self.assertLogs("src.staged", level="ERROR"):
+                results = run_staged(paths, PipelineOptions(Path(tmp)), workers=(2, 1, 1))
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(result.error == "RuntimeError: boom" for result in results))
+
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """Test case for the parsed-frame memory cap."""
+
+    def test_admission_waits_for_release(self):
+        """Over the cap, the next file is admitted only once a frame is released."""
+        budget = MemoryBudget(max_bytes=100)
+        budget.admit()
+        budget.charge(150)
+        admitted = threading.Event()
+        waiter = threading.Thread(target=lambda: (budget.admit(), admitted.set()))
+        waiter.start()
+        self.assertFalse(admitted.wait(0.1))
+        budget.release(150)
+        self.assertTrue(admitted.wait(5))
+        waiter.join()
+        self.assertEqual((budget.in_flight, budget.bytes, budget.peak_bytes), (1, 0, 150))
+
+    def test_no_cap(self):
+        """Without a cap admission never blocks."""
+        budget = MemoryBudget()
+        for _ in range(3):
+            budget.admit()
+            budget.charge(10**9)
+        self.assertEqual(budget.in_flight, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
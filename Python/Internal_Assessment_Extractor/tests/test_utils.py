@@ -1,13 +1,77 @@
-"""Placeholder tests for utils module."""
+"""Tests for utils module."""
 
 import unittest
 
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+
+from src.style_index import StyleIndex
+from src.tables import iter_unique_cells
+from src.utils import extract_table_data, is_heading
+
+
+def build_merged_table():
+    """Return a 3x3 table with a spanned header and a vertically merged column."""
+    doc = Document()
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).text = "Question"
+    table.cell(0, 1).merge(table.cell(0, 2)).text = "Answer"
+    table.cell(1, 0).text = "Q1"
+    table.cell(1, 1).text = "A1"
+    table.cell(2, 0).text = "Q2"
+    table.cell(2, 1).text = "A2"
+    table.cell(1, 2).merge(table.cell(2, 2)).text = " shared  note "
+    return table
+
+
 class TestUtils(unittest.TestCase):
-    """Placeholder test case for utils."""
+    """Test case for utils."""
 
     def test_placeholder(self):
         """Placeholder test."""
         self.assertTrue(True)
 
+    def test_iter_unique_cells_reports_spans(self):
+        """Each physical cell is visited once with its row and column span."""
+        spans = [
+            (entry.row, entry.col, entry.row_span, entry.col_span, entry.cell.text)
+            for entry in iter_unique_cells(build_merged_table())
+        ]
+        self.assertEqual(spans, [
+            (0, 0, 1, 1, "Question"),
+            (0, 1, 1, 2, "Answer"),
+            (1, 0, 1, 1, "Q1"),
+            (1, 1, 1, 1, "A1"),
+            (1, 2, 2, 1, " shared  note "),
+            (2, 0, 1, 1, "Q2"),
+            (2, 1, 1, 1, "A2"),
+        ])
+
+    def test_extract_table_data_fans_out_merged_cells(self):
+        """Merged values are repeated for every row and header column they cover."""
+        self.assertEqual(extract_table_data(build_merged_table()), [
+            {"Question": "Q1", "Answer": "shared note"},
+            {"Question": "Q2", "Answer": "shared note"},
+        ])
+
+    def test_style_index_lookups(self):
+        """The style index classifies headings, body text and basedOn descendants."""
+        doc = Document()
+        custom = doc.styles.add_style("Chapter Title", WD_STYLE_TYPE.PARAGRAPH)
+        custom.base_style = doc.styles["Heading 1"]
+        heading = doc.add_heading("Intro", level=2)
+        chapter = doc.add_paragraph("Chapter", style="Chapter Title")
+        body = doc.add_paragraph("Body")
+
+        index = StyleIndex.from_document(doc)
+        self.assertEqual(index.lookup(heading.style.style_id).heading_level, 2)
+        self.assertEqual(index.lookup(chapter.style.style_id).heading_level, 0)
+        self.assertTrue(index.lookup(None).body_text)
+        self.assertTrue(is_heading(heading, "Heading 2", index))
+        self.assertFalse(is_heading(body, "Heading 2", index))
+
+        inherited = StyleIndex.from_document(doc, inherit_headings=True)
+        self.assertEqual(inherited.lookup(chapter.style.style_id).heading_level, 1)
+
 if __name__ == "__main__":
     unittest.main()
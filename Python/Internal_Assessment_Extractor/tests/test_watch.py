@@ -0,0 +1,166 @@
+"""Tests for the watch-folder mode."""
+
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from src import workers
+from src.manifest import BatchManifest
+from src.pipeline import PipelineOptions, process_file
+from src.watch import FolderWatcher, watch
+from tests.test_doc_parser import build_sample_document
+
+
+def crash_on_crash_docx(path, options):
+    """process_file, except that crash.docx kills its worker process."""
+    if Path(path).name == "crash.docx":
+        os._exit(1)  # pylint: disable=protected-access
+    return process_file(path, options)
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFolderWatcher(unittest.TestCase):
+    """Test case for settled-file detection."""
+
+    def test_files_are_returned_once_settled_and_complete(self):
+        """New and changed files are returned after settling; partial ones wait."""
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            watcher = FolderWatcher(folder, settle_seconds=2, clock=clock)
+            doc = folder / "manual.docx"
+            build_sample_document(doc)
+            (folder / "~$manual.docx").write_bytes(b"lock")
+            partial = folder / "partial.docx"
+            partial.write_bytes(doc.read_bytes()[:100])
+
+            self.assertEqual(watcher.poll(), [])
+            clock.now = 1
+            self.assertEqual(watcher.poll(), [])
+            clock.now = 2
+            with self.assertLogs("src.watch", level="WARNING"):
+                self.assertEqual(watcher.poll(), [doc])
+            clock.now = 10
+            self.assertEqual(watcher.poll(), [])
+
+            stat = doc.stat()
+            os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            partial.write_bytes(doc.read_bytes())
+            self.assertEqual(watcher.poll(), [])
+            clock.now = 12
+            self.assertEqual(watcher.poll(), [doc, partial])
+
+            watcher.forget(doc)
+            self.assertEqual(watcher.poll(), [doc])
+            doc.unlink()
+            self.assertEqual(watcher.poll(), [])
+
+
+class TestWatch(unittest.TestCase):
+    """Test case for the watch loop."""
+
+    def tearDown(self):
+        workers.shutdown()
+
+    def _watch_until(self, folder, options, manifest, expected):
+        """Run the watch loop until ``expected`` results arrived; return them."""
+        stop = threading.Event()
+        results = []
+
+        def collect(result):
+            results.append(result)
+            if len(results) == expected:
+                stop.set()
+
+        with redirect_stdout(StringIO()):
+            watch(folder, options, manifest, poll_seconds=0.05, settle_seconds=0,
+                  stop=stop, on_result=collect)
+        return results
+
+    def test_processes_new_files_in_warm_workers(self):
+        """A dropped file is exported and recorded; a restart skips it."""
+        with tempfile.TemporaryDirectory() as tmp:
+            folder, output = Path(tmp) / "input", Path(tmp) / "output"
+            folder.mkdir()
+            output.mkdir()
+            build_sample_document(folder / "manual.docx")
+            options = PipelineOptions(output, formats=("csv",), record_input=True)
+            manifest = BatchManifest(output, "test")
+            results = self._watch_until(folder, options, manifest, expected=1)
+            self.assertTrue(results[0].ok)
+            self.assertTrue((output / "manual_cleaned.csv").exists())
+            self.assertTrue(manifest.is_current(folder / "manual.docx"))
+
+            # Restarted, the up-to-date file is skipped and only the new one is processed
+            build_sample_document(folder / "second.docx")
+            results = self._watch_until(folder, options, manifest, expected=1)
+            self.assertEqual([result.doc_path.name for result in results], ["second.docx"])
+
+    def test_dead_worker_restarts_a_warm_pool(self):
+        """A crashed worker fails its file, and the next file runs in a restarted pool."""
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            build_sample_document(folder / "crash.docx")
+            stop = threading.Event()
+            results = []
+
+            def collect(result):
+                results.append(result)
+                if len(results) == 1:
+                    build_sample_document(folder / "good.docx")
+                else:
+                    stop.set()
+
+            with mock.patch("src.watch.process_file", crash_on_crash_docx), \
+                    mock.patch.object(workers.WorkerPool, "restart", autospec=True,
+                                      side_effect=workers.WorkerPool.restart) as restart, \
+                    self.assertLogs("src.watch", level="ERROR"), redirect_stdout(StringIO()):
+                watch(folder, PipelineOptions(folder, formats=("csv",)), poll_seconds=0.05,
+                      settle_seconds=0, stop=stop, on_result=collect)
+            self.assertEqual(restart.call_count, 1)
+        self.assertTrue(results[0].error.startswith("BrokenProcessPool"))
+        self.assertTrue(results[1].ok)
+
+    def test_submit_failure_is_reported(self):
+        """A file the pool cannot take fails on its own and watching goes on."""
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            build_sample_document(folder / "manual.docx")
+            with mock.patch.object(workers.WorkerPool, "submit",
+                                   side_effect=BrokenProcessPool("gone")), \
+                    mock.patch.object(workers.WorkerPool, "restart") as restart, \
+                    self.assertLogs("src.watch", level="ERROR"):
+                results = self._watch_until(folder, PipelineOptions(folder), None, expected=1)
+            restart.assert_called_once_with()
+        self.assertEqual(results[0].error, "BrokenProcessPool: gone")
+
+    def test_dedup_index_runs_in_process(self):
+        """With a dedup index files are processed here and the index is saved."""
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            build_sample_document(folder / "manual.docx")
+            options = PipelineOptions(
+                folder, formats=("csv",), dedup_index=folder / "dedup.npz"
+            )
+            results = self._watch_until(folder, options, None, expected=1)
+            self.assertTrue(results[0].ok)
+            self.assertTrue((folder / "dedup.npz").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
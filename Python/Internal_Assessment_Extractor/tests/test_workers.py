@@ -0,0 +1,36 @@
+"""Tests for the workers module."""
+
+import unittest
+
+import pandas as pd
+
+from src import workers
+from src.cleaner import parallel_clean_data
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Test case for the shared worker pool."""
+
+    def tearDown(self):
+        workers.shutdown()
+
+    def test_map_keeps_order_across_chunks(self):
+        """Chunked mapping returns results in input order."""
+        pool = workers.configure(max_workers=2)
+        pool.warm_up()
+        self.assertEqual(pool.map(abs, range(-10, 0)), list(range(10, 0, -1)))
+        self.assertIs(workers.get_pool(), pool)
+
+    def test_unpicklable_function_is_rejected(self):
+        """A lambda is rejected up front with a clear TypeError."""
+        with self.assertRaises(TypeError):
+            workers.get_pool().map(lambda value: value, [1])
+
+    def test_parallel_clean_data(self):
+        """Frames cleaned in the shared pool come back in order."""
+        frames = [pd.DataFrame({" Questions ": [f"  q{idx}  "]}) for idx in range(3)]
+        cleaned = parallel_clean_data(frames)
+        self.assertEqual([df["questions"][0] for df in cleaned], ["q0", "q1", "q2"])
+
+if __name__ == "__main__":
+    unittest.main()